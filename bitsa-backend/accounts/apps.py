@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'accounts'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from bitsa_project.cache import invalidate_on_change
+        # organizer/author/uploader names and emails are embedded in cached list responses;
+        # logins (last_login) and sign-ups change nothing those responses show
+        invalidate_on_change(get_user_model(), fields=('first_name', 'last_name', 'email'))
@@ -0,0 +1,46 @@
+"""
+Credential checks for the token and login endpoints.
+
+The user row is fetched with one indexed query: by username (unique), or by
+``lower(email)`` when the identifier contains '@' (see migration 0001). Time
+spent in the lookup and in password hashing is recorded separately in the
+metrics registry, so hashing cost is visible next to the database cost.
+"""
+import time
+
+from django.contrib.auth.models import User
+from django.db.models import Value
+from django.db.models.functions import Lower
+
+from metrics.registry import AUTH_HASH_DURATION, AUTH_LOOKUP_DURATION
+
+
+def find_login_user(identifier):
+    """The user for a username or (case-insensitive) email, or None. One query."""
+    if not identifier:
+        return None
+    if '@' in identifier:
+        # several accounts may share an address; the oldest wins, as before
+        queryset = User.objects.alias(email_lower=Lower('email')).filter(email_lower=Lower(Value(identifier)))
+        return queryset.order_by('id').first()
+    return User.objects.filter(username=identifier).first()
+
+
+def authenticate_credentials(identifier, password):
+    """
+    Return the user when ``password`` matches, else None. Outdated hashes
+    (another hasher or work factor) are upgraded by check_password on success.
+    """
+    start = time.perf_counter()
+    user = find_login_user(identifier)
+    AUTH_LOOKUP_DURATION.observe({'found': str(user is not None).lower()}, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    if user is None:
+        # hash anyway so unknown accounts take as long as wrong passwords
+        User().set_password(password)
+        valid = False
+    else:
+        valid = user.check_password(password)
+    AUTH_HASH_DURATION.observe({'valid': str(valid).lower()}, time.perf_counter() - start)
+    return user if valid else None
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count taken from PASSWORD_PBKDF2_ITERATIONS.
+
+    It keeps the 'pbkdf2_sha256' algorithm name, so existing hashes verify as
+    before; when the configured count differs from a stored hash's, Django's
+    check_password re-hashes the password on the user's next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_PBKDF2_ITERATIONS', None) or PBKDF2PasswordHasher.iterations
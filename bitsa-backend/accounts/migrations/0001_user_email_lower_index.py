@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Functional index for the login lookup by email, which filters on
+    lower(email) (see accounts/authentication.py). auth.User belongs to
+    django.contrib.auth, so the index is created with SQL from this app.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS auth_user_email_lower_idx ON auth_user (LOWER(email));',
+            'DROP INDEX IF EXISTS auth_user_email_lower_idx;',
+        ),
+    ]
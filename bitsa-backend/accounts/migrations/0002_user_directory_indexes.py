@@ -0,0 +1,52 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# (name, columns) for the admin user directory: its default sort, the role/active
+# filters with that sort, and the other ?sort= keys (username is already unique)
+SORT_INDEXES = [
+    ('auth_user_joined_id_idx', 'date_joined, id'),
+    ('auth_user_staff_active_joined_idx', 'is_staff, is_active, date_joined, id'),
+    ('auth_user_email_id_idx', 'email, id'),
+    ('auth_user_first_name_id_idx', 'first_name, id'),
+    ('auth_user_last_name_id_idx', 'last_name, id'),
+]
+SEARCH_COLUMNS = ['first_name', 'last_name', 'email', 'username']
+
+
+def create_search_indexes(apps, schema_editor):
+    # ?search= is an icontains OR over these columns, i.e. UPPER(col::text) LIKE UPPER('%...%'),
+    # which only trigram indexes on those expressions can serve (PostgreSQL only)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS auth_user_{column}_upper_trgm '
+            f'ON auth_user USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS auth_user_{column}_upper_trgm')
+
+
+class Migration(migrations.Migration):
+    """Indexes for accounts.views.UserListView; see 0001 for why they are plain SQL."""
+
+    dependencies = [
+        ('accounts', '0001_user_email_lower_index'),
+    ]
+
+    operations = [
+        *(
+            migrations.RunSQL(
+                f'CREATE INDEX IF NOT EXISTS {name} ON auth_user ({columns});',
+                f'DROP INDEX IF EXISTS {name};',
+            )
+            for name, columns in SORT_INDEXES
+        ),
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
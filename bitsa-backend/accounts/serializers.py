@@ -3,6 +3,9 @@ from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
+from bitsa_project.serializers import SparseFieldsetMixin
+from .authentication import authenticate_credentials
+
 class RegisterSerializer(serializers.Serializer):
     first_name = serializers.CharField(min_length=1)
     last_name = serializers.CharField(required=False, allow_blank=True)
@@ -30,7 +33,7 @@ class RegisterSerializer(serializers.Serializer):
         )
         return user
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
     role = serializers.SerializerMethodField()
 
@@ -47,28 +50,16 @@ class UserSerializer(serializers.ModelSerializer):
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Accept username or email in the 'username' field.
-    Lookup user by email or username and verify password with check_password()
-    to avoid backend-dependent authenticate() pitfalls and MultipleObjectsReturned.
+    The user is found with a single indexed query and the password verified with
+    check_password(), see accounts/authentication.py.
     """
 
     def validate(self, attrs):
         identifier = attrs.get(self.username_field)  # typically 'username'
         password = attrs.get('password')
 
-        user = None
-        if identifier:
-            if "@" in identifier:
-                # email provided — pick the first matching user to avoid MultipleObjectsReturned
-                users_qs = User.objects.filter(email__iexact=identifier).order_by('id')
-                if users_qs.exists():
-                    user = users_qs.first()
-            else:
-                try:
-                    user = User.objects.get(username=identifier)
-                except User.DoesNotExist:
-                    user = None
-
-        if user is None or not user.check_password(password):
+        user = authenticate_credentials(identifier, password)
+        if user is None:
             raise serializers.ValidationError('Invalid username/email or password', code='authorization')
 
         if not user.is_active:
@@ -1,3 +1,203 @@
-from django.test import TestCase
+from django.contrib.auth.hashers import check_password, identify_hasher
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from bitsa_project.cache import get_generations
+from bitsa_project.throttling import LocalMemoryCounterStore, SlidingWindowThrottle
+from metrics import registry
+
+PBKDF2_HASHERS = ['accounts.hashers.ConfigurablePBKDF2PasswordHasher']
+
+
+class TokenLoginTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='amina', email='Amina@Example.com', password='secret123')
+
+    def login(self, username, password='secret123'):
+        return self.client.post('/api/auth/login/', {'username': username, 'password': password}, format='json')
+
+    def test_login_by_email_is_case_insensitive_and_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.login('amina@example.COM')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data)
+        self.assertEqual(response.data['user']['username'], 'amina')
+
+    def test_login_by_username(self):
+        with self.assertNumQueries(1):
+            response = self.login('amina')
+        self.assertEqual(response.status_code, 200)
+
+    def test_wrong_password_and_unknown_user_are_rejected(self):
+        self.assertEqual(self.login('amina', 'nope').status_code, 400)
+        self.assertEqual(self.login('nobody@example.com').status_code, 400)
+
+    def test_inactive_user_is_rejected(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.login('amina').status_code, 400)
+
+    def test_auth_timings_are_recorded(self):
+        self.login('amina')
+        self.login('ghost')
+        samples = {(name, labels): value for name, labels, value in registry.AUTH_LOOKUP_DURATION.samples()}
+        self.assertEqual(samples[('bitsa_auth_user_lookup_seconds_count', (('found', 'true'),))], 1)
+        self.assertEqual(samples[('bitsa_auth_user_lookup_seconds_count', (('found', 'false'),))], 1)
+        samples = {(name, labels): value for name, labels, value in registry.AUTH_HASH_DURATION.samples()}
+        self.assertEqual(samples[('bitsa_auth_password_hash_seconds_count', (('valid', 'true'),))], 1)
+        self.assertEqual(samples[('bitsa_auth_password_hash_seconds_count', (('valid', 'false'),))], 1)
+
+    @override_settings(PASSWORD_HASHERS=PBKDF2_HASHERS, PASSWORD_PBKDF2_ITERATIONS=1000)
+    def test_password_is_rehashed_when_work_factor_changes(self):
+        self.user.set_password('secret123')
+        self.user.save()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+        with override_settings(PASSWORD_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login('amina').status_code, 200)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+            self.assertEqual(identify_hasher(self.user.password).iterations, 2000)
+            self.assertTrue(check_password('secret123', self.user.password))
+
+
+def throttle_rates(**rates):
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], **rates},
+    })
+
+
+class UserCacheInvalidationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def generation(self):
+        return get_generations(['auth.user'])[0]
+
+    def test_only_embedded_fields_invalidate_cached_lists(self):
+        start = self.generation()
+        user = User.objects.create_user(username='newbie', password='secret123')  # sign-up
+        user.last_login = timezone.now()
+        user.save(update_fields=['last_login'])  # what login records
+        user.is_staff = True
+        user.save()
+        self.assertEqual(self.generation(), start)
+
+        user.first_name = 'Ada'
+        user.save()
+        self.assertGreater(self.generation(), start)
+
+
+class AuthThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        LocalMemoryCounterStore.clear()
+        User.objects.create_user(username='amina', password='secret123')
+
+    def login(self, username, password='wrong', ip='10.0.0.1'):
+        return APIClient(REMOTE_ADDR=ip).post(
+            '/api/auth/login/', {'username': username, 'password': password}, format='json'
+        )
+
+    @throttle_rates(auth_identifier='3/min')
+    def test_attempts_are_limited_per_identifier_across_ips(self):
+        for n in range(3):
+            self.assertEqual(self.login('Amina', ip=f'10.0.0.{n}').status_code, 400)
+        response = self.login('amina', password='secret123', ip='10.0.0.9')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(self.login('someone-else').status_code, 400)
+
+    @throttle_rates(auth_ip='2/min')
+    def test_attempts_are_limited_per_ip(self):
+        self.assertEqual(self.login('a').status_code, 400)
+        self.assertEqual(self.login('b').status_code, 400)
+        self.assertEqual(self.login('c').status_code, 429)
+        self.assertEqual(self.login('c', ip='10.0.0.2').status_code, 400)
+
+    @throttle_rates(auth_ip='2/min')
+    def test_register_shares_the_ip_limit(self):
+        self.login('a')
+        self.login('b')
+        response = APIClient(REMOTE_ADDR='10.0.0.1').post('/api/auth/register/', {
+            'first_name': 'New', 'email': 'new@example.com', 'password': 'secret123', 'password_confirm': 'secret123',
+        }, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(User.objects.filter(email='new@example.com').exists())
+
+    @throttle_rates(auth_ip=None, auth_identifier=None)
+    def test_rate_of_none_disables_the_scope(self):
+        for _ in range(15):
+            self.assertEqual(self.login('amina').status_code, 400)
+
+    @override_settings(THROTTLE_COUNTER_STORE='bitsa_project.throttling.LocalMemoryCounterStore')
+    @throttle_rates(auth_identifier='2/min')
+    def test_local_memory_store(self):
+        self.login('amina')
+        self.login('amina')
+        self.assertEqual(self.login('amina').status_code, 429)
+        self.assertTrue(LocalMemoryCounterStore._counters)
+
+    def test_sliding_window_weighs_the_previous_window(self):
+        throttle = SlidingWindowThrottle()
+        throttle.num_requests, throttle.duration = 10, 60
+        throttle.previous, throttle.current, throttle.elapsed = 10, 2, 15
+        # three quarters of the previous window still count: 7.5 + 2
+        self.assertEqual(throttle.estimate(), 9.5)
+        throttle.current = 3
+        self.assertGreaterEqual(throttle.estimate(), throttle.num_requests)
+        # 10 * (1 - e / 60) + 3 < 10 once e > 18
+        self.assertEqual(throttle.wait(), 3)
+
+
+class UserDirectoryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', email='admin@bitsa.test', is_staff=True)
+        self.amina = User.objects.create_user(username='amina', email='amina@uni.test', first_name='Amina', last_name='Otieno')
+        self.brian = User.objects.create_user(username='brian', email='brian@uni.test', first_name='Brian', is_active=False)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def usernames(self, query=''):
+        response = self.client.get(f'/api/auth/users/{query}')
+        self.assertEqual(response.status_code, 200)
+        return [row['username'] for row in response.data['results']]
+
+    def test_requires_staff(self):
+        self.client.force_authenticate(self.amina)
+        self.assertEqual(self.client.get('/api/auth/users/').status_code, 403)
+        self.assertEqual(self.client.get('/api/auth/users/stats/').status_code, 403)
+
+    def test_filters_search_and_sort(self):
+        self.assertEqual(self.usernames(), ['brian', 'amina', 'admin'])
+        self.assertEqual(self.usernames('?role=admin'), ['admin'])
+        self.assertEqual(self.usernames('?role=student&active=false'), ['brian'])
+        self.assertEqual(self.usernames('?search=otie'), ['amina'])
+        self.assertEqual(self.usernames('?search=UNI.TEST&sort=username'), ['amina', 'brian'])
+        self.assertEqual(self.usernames('?sort=-email'), ['brian', 'amina', 'admin'])
+
+    def test_pages_follow_the_sort(self):
+        response = self.client.get('/api/auth/users/?sort=username&page_size=2')
+        self.assertEqual([row['username'] for row in response.data['results']], ['admin', 'amina'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['username'] for row in response.data['results']], ['brian'])
+        self.assertIsNone(response.data['next'])
+
+    def test_count_only(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/auth/users/?count_only=true&role=student')
+        self.assertEqual(response.data, {'count': 2})
+
+    def test_stats_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/auth/users/stats/')
+        self.assertEqual(response.data, {
+            'total': 3, 'active': 2, 'blocked': 1, 'admins': 1, 'students': 2, 'joined_last_30_days': 3,
+        })
@@ -1,16 +1,24 @@
-from rest_framework.decorators import api_view, permission_classes
+from datetime import timedelta
+
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
-from rest_framework import status
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework import generics, status
+from rest_framework.permissions import AllowAny, BasePermission, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
-from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.db.models import Count, Q
+from django.utils import timezone
+from bitsa_project.throttling import AuthIdentifierThrottle, AuthIPThrottle
+from .authentication import authenticate_credentials
 from .serializers import RegisterSerializer, UserSerializer, CustomTokenObtainPairSerializer
 from rest_framework_simplejwt.views import TokenObtainPairView
 
+# every attempt hashes a password, so limit them per client IP and per account name
+AUTH_THROTTLES = [AuthIPThrottle, AuthIdentifierThrottle]
+
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes(AUTH_THROTTLES)
 def register(request):
     serializer = RegisterSerializer(data=request.data)
 
@@ -39,6 +47,7 @@ def register(request):
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes(AUTH_THROTTLES)
 def login(request):
     username = request.data.get('username')
     password = request.data.get('password')
@@ -46,16 +55,9 @@ def login(request):
     if not username or not password:
         return Response({"error": "Username and password are required"}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Try to authenticate by username first
-    user = authenticate(username=username, password=password)
-
-    # If authentication fails, try to find user by email and authenticate
-    if user is None:
-        try:
-            user_obj = User.objects.get(Q(username=username) | Q(email=username))
-            user = authenticate(username=user_obj.username, password=password)
-        except User.DoesNotExist:
-            pass
+    user = authenticate_credentials(username, password)
+    if user is not None and not user.is_active:
+        user = None
 
     if user is not None:
         refresh = RefreshToken.for_user(user)
@@ -76,15 +78,79 @@ def login(request):
     else:
         return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def get_users(request):
-    if not request.user.is_staff:
-        return Response({"error": "Admin access required"}, status=status.HTTP_403_FORBIDDEN)
+class IsStaff(BasePermission):
+    message = "Admin access required"
+
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_staff)
+
+class UserListView(generics.ListAPIView):
+    """
+    Admin user directory, cursor-paginated like the other list endpoints.
 
-    users = User.objects.all().order_by('-date_joined')
-    serializer = UserSerializer(users, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    ?search= matches name, email or username; ?role=admin|student and
+    ?active=true|false filter; ?sort= is one of SORT_KEYS, '-' prefixed for
+    descending (default -joined). ?count_only=true returns just {"count": n}
+    for the same filters.
+    """
+    serializer_class = UserSerializer
+    permission_classes = [IsAuthenticated, IsStaff]
+    SORT_KEYS = {
+        'joined': 'date_joined',
+        'email': 'email',
+        'username': 'username',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }
+    ordering = '-date_joined'
+
+    def get_ordering(self):
+        sort = self.request.query_params.get('sort', '')
+        field = self.SORT_KEYS.get(sort.lstrip('-'))
+        if field is None:
+            return self.ordering
+        return f'-{field}' if sort.startswith('-') else field
+
+    def get_queryset(self):
+        queryset = User.objects.all()
+
+        role = self.request.query_params.get('role')
+        if role in ('admin', 'student'):
+            queryset = queryset.filter(is_staff=role == 'admin')
+
+        active = self.request.query_params.get('active', '').lower()
+        if active in ('true', '1', 'false', '0'):
+            queryset = queryset.filter(is_active=active in ('true', '1'))
+
+        # substring match, served by trigram indexes on PostgreSQL (accounts migration 0002)
+        search = self.request.query_params.get('search', '').strip()
+        if search:
+            condition = Q()
+            for field in ('first_name', 'last_name', 'email', 'username'):
+                condition |= Q(**{f'{field}__icontains': search})
+            queryset = queryset.filter(condition)
+
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('count_only', '').lower() in ('true', '1'):
+            return Response({'count': self.get_queryset().count()})
+        return super().list(request, *args, **kwargs)
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated, IsStaff])
+def user_stats(request):
+    """Headline numbers for the admin dashboard, computed in one aggregate query."""
+    since = timezone.now() - timedelta(days=30)
+    stats = User.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        blocked=Count('id', filter=Q(is_active=False)),
+        admins=Count('id', filter=Q(is_staff=True)),
+        students=Count('id', filter=Q(is_staff=False)),
+        joined_last_30_days=Count('id', filter=Q(date_joined__gte=since)),
+    )
+    return Response(stats, status=status.HTTP_200_OK)
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
@@ -116,3 +182,4 @@ def toggle_user_block(request, user_id):
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = AUTH_THROTTLES
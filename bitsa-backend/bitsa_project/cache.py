@@ -0,0 +1,150 @@
+"""
+Versioned response cache for the public list/retrieve endpoints.
+
+Every model an endpoint reads has a generation number in the cache. Cache keys
+embed the current generations, so invalidation is a single ``incr`` on write:
+entries written under an older generation are simply never looked up again and
+age out on their own. Generations are bumped by post_save/post_delete/m2m_changed
+receivers and explicitly by code paths that write through ``QuerySet.update()``.
+
+Only anonymous requests are cached; authenticated users can see different rows
+(e.g. unpublished posts for staff) and always hit the database.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def get_cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+def _generation_key(label):
+    return f'respcache:gen:{label}'
+
+
+def get_generations(labels):
+    cache = get_cache()
+    keys = [_generation_key(label) for label in labels]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            # seed from the clock so a counter lost to eviction can never come back
+            # at a value that still has entries cached under it
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def _incr(label):
+    cache = get_cache()
+    key = _generation_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_generation(*labels):
+    """
+    Invalidate every cached response depending on ``labels`` (model labels such as
+    'events.event'). Inside a transaction the bump is repeated on commit so a reader
+    cannot re-cache pre-commit rows under the new generation.
+    """
+    for label in labels:
+        _incr(label)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: [_incr(label) for label in labels])
+
+
+def invalidate_on_change(model, fields=None):
+    """
+    Connect save/delete (and m2m) receivers bumping ``model``'s generation. With
+    ``fields``, a save only bumps when one of those fields changed on an existing
+    row, for models other endpoints embed a few columns of.
+    """
+    label = model._meta.label_lower
+
+    def receiver(sender, **kwargs):
+        action = kwargs.get('action')
+        if action is None or action.startswith('post_'):
+            bump_generation(label)
+
+    uid = f'respcache:{label}'
+    if fields is None:
+        post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+    else:
+        _connect_field_watch(model, label, tuple(fields), uid)
+    post_delete.connect(receiver, sender=model, weak=False, dispatch_uid=f'{uid}:delete')
+    for field in model._meta.local_many_to_many:
+        m2m_changed.connect(receiver, sender=field.remote_field.through, weak=False, dispatch_uid=f'{uid}:{field.name}')
+
+
+def _connect_field_watch(model, label, fields, uid):
+    def remember(sender, instance, update_fields=None, **kwargs):
+        if instance.pk is None or (update_fields is not None and not set(fields) & set(update_fields)):
+            return
+        instance.__dict__[uid] = sender._base_manager.filter(pk=instance.pk).values_list(*fields).first()
+
+    def compare(sender, instance, created, **kwargs):
+        stored = instance.__dict__.pop(uid, None)
+        if not created and stored is not None and stored != tuple(getattr(instance, f) for f in fields):
+            bump_generation(label)
+
+    pre_save.connect(remember, sender=model, weak=False, dispatch_uid=f'{uid}:presave')
+    post_save.connect(compare, sender=model, weak=False, dispatch_uid=f'{uid}:save')
+
+
+class CachedResponseMixin:
+    """
+    Serve anonymous ``list``/``retrieve`` responses from the cache.
+
+    ``cache_models`` lists the model labels whose rows appear in the response.
+    """
+    cache_models = ()
+    cached_actions = ('list', 'retrieve')
+
+    def get_cache_key(self, request, generations):
+        params = sorted((k, v) for k in request.query_params for v in request.query_params.getlist(k))
+        # the host is part of the key because serializers emit absolute media URLs
+        raw = '|'.join([
+            type(self).__name__,
+            getattr(self, 'action', None) or request.method,
+            request.scheme,
+            request.get_host(),
+            repr(sorted(self.kwargs.items())),
+            repr(params),
+            repr(generations),
+            # set by ConditionalGetMixin; also covers changes no write announces (event status)
+            getattr(self, 'validator_etag', None) or '',
+        ])
+        return 'respcache:' + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        action = getattr(self, 'action', None) or ('retrieve' if 'pk' in self.kwargs else 'list')
+        if action not in self.cached_actions or request.user.is_authenticated:
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_cache_key(request, get_generations(self.cache_models))
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,93 @@
+"""
+ETag / Last-Modified validators for the public list/retrieve endpoints.
+
+Validators come from one aggregate over the filtered queryset (MAX(updated_at),
+COUNT(*)), so a matching If-None-Match / If-Modified-Since is answered with a
+304 before anything is paginated or serialized. The count catches deletions,
+the max catches inserts and edits; writes that go through ``QuerySet.update()``
+must set ``updated_at`` themselves. Rows joined from models without an
+``updated_at`` column (the user in organizer_name) are covered by their response
+cache generation, see bitsa_project/cache.py.
+"""
+import hashlib
+from datetime import datetime
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .cache import get_generations
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag/Last-Modified to ``list``/``retrieve`` and answer matching
+    conditional requests with 304. Put it before CachedResponseMixin so a
+    304 skips the cache lookup too.
+    """
+    last_modified_field = 'updated_at'
+    conditional_actions = ('list', 'retrieve')
+
+    def get_validator_aggregates(self):
+        """
+        Extra aggregates folded into the validators, for representations that
+        change without a write (e.g. a status derived from the current time).
+        Datetime results also advance Last-Modified.
+        """
+        return {}
+
+    def get_validators(self, action):
+        """``(etag, last_modified datetime)`` for the current request, or (None, None) when nothing matches."""
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if action == 'retrieve':
+            queryset = queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        state = queryset.order_by().aggregate(
+            validator_count=Count('pk'),
+            validator_modified=Max(self.last_modified_field),
+            **self.get_validator_aggregates(),
+        )
+        if not state['validator_count']:
+            return None, None
+
+        own = self.queryset.model._meta.label_lower
+        related = [label for label in getattr(self, 'cache_models', ()) if label != own]
+        raw = '|'.join([
+            type(self).__name__,
+            action,
+            repr(sorted(state.items())),
+            repr(get_generations(related) if related else []),
+        ])
+        etag = 'W/' + quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+        last_modified = max(value for value in state.values() if isinstance(value, datetime))
+        return etag, last_modified
+
+    def _conditional_response(self, handler, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        action = getattr(self, 'action', None) or ('retrieve' if lookup_url_kwarg in self.kwargs else 'list')
+        if action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = self.get_validators(action)
+        # CachedResponseMixin keys on it, so a cached body always matches its ETag
+        self.validator_etag = etag
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(timestamp)
+        # staff and anonymous users see different rows under the same URL
+        patch_vary_headers(response, ('Authorization',))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,168 @@
+"""
+Read-only fast path for the list endpoints.
+
+For every row, a ModelSerializer builds a model instance (and its
+select_related user), then dispatches field by field: dotted sources,
+SerializerMethodFields for the image URLs, and ``build_absolute_uri`` per URL.
+Views with FastListMixin serve ``list`` from ``.values()`` rows instead. Each
+output dict is built by one compiled getter per field, and media URLs are
+appended to a prefix computed once per request.
+
+The plan is compiled from the view's own serializer, after sparse fieldsets
+have trimmed it, so names and order always match. Plain model fields reuse
+the DRF field's ``to_representation``. Anything else needs an entry in the
+serializer's ``fast_fields``: name -> FastField(columns, fn(row, context)),
+written to mirror the serializer method it replaces. A field with neither
+sends the request through the serializer as before. The tests render both
+paths and compare the bytes.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .renditions import rendition_flag, srcset_for
+
+
+class FastField:
+    """A representation computed from ``.values()`` columns by ``fn(row, context)``."""
+
+    def __init__(self, columns, fn):
+        self.columns = tuple(columns)
+        self.fn = fn
+
+
+def column(name):
+    """The column's value unchanged, e.g. a CharField with a dotted source."""
+    return FastField((name,), lambda row, context: row[name])
+
+
+def full_name(relation):
+    """User.get_full_name() of a related user."""
+    first, last = f'{relation}__first_name', f'{relation}__last_name'
+    return FastField((first, last), lambda row, context: f'{row[first]} {row[last]}'.strip())
+
+
+def media_url(name):
+    """Absolute URL of a file field, None when it is empty."""
+    return FastField((name,), lambda row, context: context.media_url(name, row[name]))
+
+
+def media_srcset(name):
+    """rendition_srcset() of an image field."""
+    flag = rendition_flag(name)
+    return FastField((name, flag), lambda row, context: context.media_srcset(name, row[name], row[flag]))
+
+
+class RowContext:
+    """Per-request state shared by the getters: the request, a single ``now`` and URL prefixes."""
+
+    def __init__(self, request, model):
+        self.request = request
+        self.model = model
+        self.now = timezone.now()
+        self._prefixes = {}
+
+    def storage(self, field_name):
+        return self.model._meta.get_field(field_name).storage
+
+    def absolute_url(self, storage, name):
+        """Same result as ``request.build_absolute_uri(storage.url(name))``."""
+        key = id(storage)
+        if key not in self._prefixes:
+            base_url = getattr(storage, 'base_url', None) or ''
+            # FileSystemStorage.url() is urljoin(base_url, filepath_to_uri(name)): one prefix fits every name
+            simple = isinstance(storage, FileSystemStorage) and base_url.startswith('/') and base_url.endswith('/')
+            self._prefixes[key] = self.request.build_absolute_uri(base_url) if simple and not base_url.startswith('//') else None
+        prefix = self._prefixes[key]
+        if prefix is None:
+            return self.request.build_absolute_uri(storage.url(name))
+        return prefix + filepath_to_uri(name).lstrip('/')
+
+    def media_url(self, field_name, name):
+        if not name:
+            return None
+        return self.absolute_url(self.storage(field_name), name)
+
+    def media_srcset(self, field_name, name, version):
+        storage = self.storage(field_name)
+        return srcset_for(name, version, lambda rendition: self.absolute_url(storage, rendition))
+
+
+def _model_field(model, field):
+    """FastField for a serializer field reading one concrete model column, or None."""
+    source = field.source
+    if '.' in source or source == '*':
+        return None
+    if isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer, serializers.ManyRelatedField)):
+        return None
+    try:
+        model_field = model._meta.get_field(source)
+    except FieldDoesNotExist:
+        return None
+    if not model_field.concrete or model_field.many_to_many:
+        return None
+
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        # .values() returns the foreign key's id, which is what the field renders
+        return column(source) if field.pk_field is None else None
+    if isinstance(field, serializers.RelatedField):
+        return None
+    if isinstance(field, serializers.FileField):
+        return media_url(source) if getattr(field, 'use_url', True) else None
+
+    to_representation = field.to_representation
+
+    def get(row, context):
+        value = row[source]
+        return None if value is None else to_representation(value)
+
+    return FastField((source,), get)
+
+
+def compile_plan(serializer):
+    """[(name, FastField), ...] for ``serializer``'s readable fields, or None if one has no fast equivalent."""
+    model = serializer.Meta.model
+    fast_fields = getattr(serializer, 'fast_fields', {})
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        fast = fast_fields.get(name) or _model_field(model, field)
+        if fast is None:
+            return None
+        plan.append((name, fast))
+    return plan
+
+
+class FastListMixin:
+    """
+    Serve ``list`` from ``.values()`` rows. Place it after ConditionalGetMixin and
+    CachedResponseMixin so validators and the response cache still wrap it.
+    """
+
+    fast_list_enabled = True
+
+    def list(self, request, *args, **kwargs):
+        child = self.get_serializer(many=True).child
+        plan = compile_plan(child) if self.fast_list_enabled else None
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        columns = {'id': None}
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            # the keyset paginator reads the cursor values off the rows
+            columns[self.paginator.get_ordering(self)[0]] = None
+        for _, fast in plan:
+            columns.update(dict.fromkeys(fast.columns))
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*columns)
+        page = self.paginate_queryset(queryset)
+        context = RowContext(request, child.Meta.model)
+        getters = [(name, fast.fn) for name, fast in plan]
+        data = [{name: fn(row, context) for name, fn in getters} for row in (queryset if page is None else page)]
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
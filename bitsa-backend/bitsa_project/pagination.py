@@ -0,0 +1,165 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+Pages are selected with ``WHERE (field, id) < (last_field, last_id)`` instead of
+OFFSET, so deep pages cost the same as the first one. The ordering comes from
+the view (``view.get_ordering()`` or ``view.ordering``) and ``id`` is always
+appended as a tiebreaker so rows sharing a timestamp are never skipped or repeated.
+"""
+import base64
+import json
+from collections.abc import Mapping
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+    # fallback when the view does not declare an ordering
+    ordering = '-id'
+
+    def __init__(self):
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 20
+        self.max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 100)
+
+    def get_ordering(self, view):
+        if view is not None and hasattr(view, 'get_ordering'):
+            ordering = view.get_ordering()
+        else:
+            ordering = getattr(view, 'ordering', None) or self.ordering
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        field = ordering[0]
+        return field.lstrip('-'), field.startswith('-')
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(view)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor['r'])
+
+        # walking backwards flips the comparison and the ordering, then the page is re-reversed
+        descending = self.descending != self.reverse
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.field}', f'{prefix}id')
+        if cursor:
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}': cursor['v']})
+                | Q(**{self.field: cursor['v'], f'id__{lookup}': cursor['id']})
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        self.page = rows
+        if self.reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def _value(self, row, field):
+        if isinstance(row, Mapping):
+            return row[field]
+        return getattr(row, field)
+
+    def encode_cursor(self, row, reverse):
+        value = self._value(row, self.field)
+        cursor = {'v': value, 'id': self._value(row, 'id'), 'r': int(reverse)}
+        if isinstance(value, datetime):
+            cursor['v'], cursor['t'] = value.isoformat(), 'dt'
+        payload = json.dumps(cursor, separators=(',', ':'))
+        token = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            cursor['id'] = int(cursor['id'])
+            cursor['r'] = bool(cursor.get('r'))
+            if isinstance(cursor['v'], (dict, list)):
+                raise ValueError
+            if cursor.get('t') == 'dt':
+                cursor['v'] = parse_datetime(cursor['v'])
+                if cursor['v'] is None:
+                    raise ValueError
+        except (TypeError, ValueError, KeyError, UnicodeError, AttributeError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Opaque pagination cursor taken from a previous next/previous link.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Number of results per page (max {self.max_page_size}).',
+                'schema': {'type': 'integer'},
+            },
+        ]
@@ -0,0 +1,67 @@
+"""
+JSON renderer and parser backed by orjson when it is installed.
+
+orjson encodes and decodes in C, several times faster than the stdlib ``json``
+module DRF uses, which shows on large list responses. Output decodes to the
+same JSON as DRF's JSONRenderer for the default COMPACT_JSON/UNICODE_JSON
+settings: datetimes, decimals, lazy strings etc. still go through DRF's
+encoder, and U+2028/U+2029 are escaped the same way. The bytes are not
+always identical, though: orjson spells some floats differently (``1e16`` vs
+``1e+16``) and stringifies non-string keys by its own rules. Anything orjson
+cannot take (indented output for the browsable API, integers beyond 64 bits,
+other encodings) falls back to the stdlib implementation, as does everything
+when orjson is not installed (``pip install orjson`` to enable it).
+
+Unlike the stdlib renderer, orjson writes NaN/Infinity floats as null
+instead of raising under STRICT_JSON; the parser only uses orjson under
+STRICT_JSON, as orjson always rejects NaN literals. Compare the two with
+``python manage.py bench_renderers``.
+"""
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+_encoder = encoders.JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=_encoder.default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # keep the output a strict javascript subset, as JSONRenderer does
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding') or settings.DEFAULT_CHARSET
+        if orjson is None or not self.strict or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,186 @@
+"""
+Responsive image renditions for uploaded photos and event/blog images.
+
+Each original gets fixed-width WebP and JPEG variants stored next to it, named
+``<stem>.<width>w.v<version>.<ext>`` (``gallery/team.jpg`` -> ``gallery/team.320w.v1.webp``).
+Every configured width is always written (clamped to the original size, never
+upscaled), so the presence of the smallest JPEG tells whether a set exists.
+A variant is never rewritten: renditions of content-addressed blobs are served
+as immutable, so new bytes (other FORMATS options, another resampling) need a
+new RENDITION_VERSION and with it new names.
+Rendering happens on the task queue (``renditions.generate``), not in the request.
+When it finishes, every row showing the image records the version in its
+``<field>_renditions`` column, so serializers build srcsets without asking storage.
+"""
+import os
+import re
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_save
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from tasks.registry import task
+from .cache import bump_generation
+
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+# bump when the bytes written for a given original and width change
+RENDITION_VERSION = 1
+# (model, field name) pairs registered by generate_on_save()
+RENDERED = []
+# what rendition_name() appends to an original's stem; names from before versioning have none
+RENDITION_SUFFIX = re.compile(r'\.(?P<width>\d+)w(?:\.v(?P<version>\d+))?\.(?P<ext>webp|jpg)$')
+
+
+def rendition_widths():
+    return tuple(getattr(settings, 'IMAGE_RENDITION_WIDTHS', (320, 640, 1280)))
+
+
+def rendition_name(name, width, fmt, version=None):
+    stem, _ = os.path.splitext(name)
+    return f'{stem}.{width}w.v{version or RENDITION_VERSION}.{FORMATS[fmt][1]}'
+
+
+def stored_renditions(name, storage=None):
+    """The stored renditions of ``name``, of any width and version."""
+    storage = storage or default_storage
+    directory, base = os.path.split(name)
+    stem = os.path.splitext(base)[0]
+    try:
+        _, files = storage.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(
+        os.path.join(directory, file) for file in files
+        if file.startswith(f'{stem}.') and RENDITION_SUFFIX.fullmatch(file[len(stem):])
+    )
+
+
+def has_renditions(name, storage=None):
+    storage = storage or default_storage
+    return storage.exists(rendition_name(name, rendition_widths()[0], 'jpeg'))
+
+
+def generate_renditions(name, storage=None, force=False):
+    """
+    Write the missing width/format variants of ``name``; returns the names written.
+    Without ``force`` a set whose smallest JPEG exists is taken as complete.
+    """
+    storage = storage or default_storage
+    if not force and has_renditions(name, storage):
+        return []
+    missing = [
+        (width, fmt) for width in rendition_widths() for fmt in FORMATS
+        if not storage.exists(rendition_name(name, width, fmt))
+    ]
+    if not missing:
+        return []
+
+    with storage.open(name, 'rb') as fh:
+        original = ImageOps.exif_transpose(Image.open(fh))
+        original.load()
+
+    written = []
+    for width in rendition_widths():
+        formats = [fmt for missing_width, fmt in missing if missing_width == width]
+        if not formats:
+            continue
+        img = original.copy()
+        if img.width > width:
+            img.thumbnail((width, round(img.height * width / img.width)), Image.LANCZOS)
+        for fmt in formats:
+            pil_format, _, options = FORMATS[fmt]
+            frame = img
+            if pil_format == 'JPEG' and frame.mode != 'RGB':
+                # flatten transparency onto white; JPEG has no alpha channel
+                background = Image.new('RGB', frame.size, (255, 255, 255))
+                rgba = frame.convert('RGBA')
+                background.paste(rgba, mask=rgba.getchannel('A'))
+                frame = background
+            buffer = BytesIO()
+            frame.save(buffer, pil_format, **options)
+            written.append(storage.save(rendition_name(name, width, fmt), ContentFile(buffer.getvalue())))
+    return written
+
+
+@task('renditions.generate', max_attempts=3)
+def generate_renditions_task(name):
+    generate_renditions(name)
+    mark_rendered(name)
+
+
+def mark_rendered(name):
+    """Record the current RENDITION_VERSION on every row showing ``name``; returns how many changed."""
+    changed, touched = 0, []
+    for model, field in RENDERED:
+        flag = rendition_flag(field)
+        # image_srcset just appeared: move the rows' validators and cached responses on
+        updated = (
+            model._base_manager.filter(**{field: name}).exclude(**{flag: RENDITION_VERSION})
+            .update(**{flag: RENDITION_VERSION, 'updated_at': timezone.now()})
+        )
+        if updated:
+            changed += updated
+            touched.append(model._meta.label_lower)
+    if touched:
+        bump_generation(*touched)
+    return changed
+
+
+def rendition_flag(field):
+    """The column recording which RENDITION_VERSION exists for ``field``'s image, 0 for none."""
+    return f'{field}_renditions'
+
+
+def rendition_srcset(field_file, request=None):
+    """
+    ``{'webp': {'320': url, ...}, 'jpeg': {...}}`` for an ImageField value, or None
+    when there is no image or its renditions have not been generated yet.
+    """
+    if not field_file:
+        return None
+    storage = field_file.storage
+    version = getattr(field_file.instance, rendition_flag(field_file.field.name))
+    build = request.build_absolute_uri if request is not None else (lambda url: url)
+    return srcset_for(field_file.name, version, lambda name: build(storage.url(name)))
+
+
+def srcset_for(name, version, url):
+    """rendition_srcset() for a stored file name and its row's recorded version; ``url(name)`` makes each URL."""
+    if not name or version != RENDITION_VERSION:
+        return None
+    return {
+        fmt: {str(width): url(rendition_name(name, width, fmt)) for width in rendition_widths()}
+        for fmt in FORMATS
+    }
+
+
+def generate_on_save(model, field='image'):
+    """
+    Connect a post_save receiver that records whether a saved image already has
+    renditions (equal content is stored once, so another row may have rendered
+    it) and queues them for new or replaced images that don't.
+    """
+    RENDERED.append((model, field))
+    flag = rendition_flag(field)
+
+    def receiver(sender, instance, update_fields=None, **kwargs):
+        if update_fields is not None and field not in update_fields:
+            return
+        image = getattr(instance, field)
+        version = RENDITION_VERSION if image and has_renditions(image.name, image.storage) else 0
+        if getattr(instance, flag) != version:
+            sender._base_manager.filter(pk=instance.pk).update(**{flag: version})
+            setattr(instance, flag, version)
+        if image and not version:
+            generate_renditions_task.enqueue(name=image.name, idempotency_key=f'renditions:{image.name}')
+
+    post_save.connect(receiver, sender=model, weak=False, dispatch_uid=f'renditions:{model._meta.label_lower}')
@@ -0,0 +1,63 @@
+"""
+Full-text search shared by the event and blog post endpoints.
+
+On PostgreSQL each searchable model keeps a weighted ``search_vector`` column
+(GIN indexed), filled by a trigger on every insert and update of the searched
+columns (the search_vector_trigger migrations), so every write path keeps it
+current; ``?search=`` matches it with a websearch query and ranks the results.
+Word fragments the english stemmer cannot match ("hack" for "hackathon") are caught by trigram similarity on the title, backed by
+a ``gin_trgm_ops`` index, and terms shorter than SEARCH_MIN_FTS_LENGTH use a
+substring match ranked by title similarity. Other databases (the SQLite dev
+database) keep the original ``icontains`` OR filter.
+"""
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, FloatField, IntegerField, Q, Value
+from django.db.models.functions import Cast, Coalesce
+
+
+# the text search configuration the triggers build search_vector with; queries must match
+SEARCH_CONFIG = 'english'
+
+
+def is_postgres(queryset_or_model):
+    db = getattr(queryset_or_model, 'db', None) or 'default'
+    return connections[db].vendor == 'postgresql'
+
+
+def icontains_condition(model, term):
+    condition = Q()
+    for field, _ in model.SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': term})
+    return condition
+
+
+def search_queryset(queryset, term, trigram_field='title'):
+    """
+    Filter ``queryset`` by ``term``. Returns ``(queryset, ranked)``; when ranked is
+    True the rows carry an integer ``search_rank`` annotation the caller should
+    order (and paginate) by.
+    """
+    term = term.strip()
+    if not term:
+        return queryset, False
+
+    if not is_postgres(queryset):
+        return queryset.filter(icontains_condition(queryset.model, term)), False
+
+    similarity = TrigramWordSimilarity(term, trigram_field)
+    if len(term) < getattr(settings, 'SEARCH_MIN_FTS_LENGTH', 3):
+        # too short for useful lexemes: plain substring match, ranked by title similarity
+        queryset = queryset.filter(icontains_condition(queryset.model, term))
+        rank = similarity
+    else:
+        query = SearchQuery(term, search_type='websearch', config=SEARCH_CONFIG)
+        queryset = queryset.filter(
+            Q(search_vector=query) | Q(**{f'{trigram_field}__trigram_word_similar': term})
+        )
+        rank = Coalesce(SearchRank(F('search_vector'), query), Value(0.0)) + similarity
+
+    # integer buckets keep the rank exactly comparable inside keyset cursors
+    search_rank = Cast(Cast(rank, FloatField()) * Value(10000.0), IntegerField())
+    return queryset.annotate(search_rank=search_rank), True
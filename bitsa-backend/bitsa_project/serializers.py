@@ -0,0 +1,45 @@
+"""
+Sparse fieldsets for the API serializers.
+
+GET requests may pass ``?fields=a,b`` (only these fields) or ``?omit=a,b``
+(everything but these). Without ``fields``, list responses also drop the
+serializer's ``list_omit`` fields (large bodies such as a post's content),
+which stay available on retrieve or with ``?fields=`` on the list. Unknown
+names are ignored. Writes always use, and respond with, every field.
+
+The response cache keys on the full query string, so each fieldset is cached
+separately.
+"""
+from rest_framework import serializers
+
+
+def _requested(request, param):
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """Mix into a ModelSerializer, before it in the bases."""
+
+    list_omit = ()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return fields
+
+        in_list = isinstance(self.parent, serializers.ListSerializer)
+        # only the top-level representation is trimmed, never nested serializers
+        if (self.parent.parent if in_list else self.parent) is not None:
+            return fields
+
+        only = _requested(request, 'fields')
+        if only is not None:
+            fields = {name: field for name, field in fields.items() if name in only}
+        elif in_list:
+            fields = {name: field for name, field in fields.items() if name not in self.list_omit}
+        omit = _requested(request, 'omit') or ()
+        return {name: field for name, field in fields.items() if name not in omit}
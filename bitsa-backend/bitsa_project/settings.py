@@ -8,6 +8,10 @@ from pathlib import Path
 import os
 from datetime import timedelta
 
+from corsheaders.defaults import default_headers
+
+from bitsa_project.database import databases_from_env
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -35,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third-party apps
     'rest_framework',
@@ -42,6 +47,9 @@ INSTALLED_APPS = [
     'corsheaders',
 
     #  apps
+    'tasks',
+    'metrics',
+    'mediastore',
     'accounts',
     'gallery',
     'blogs',
@@ -54,6 +62,8 @@ INSTALLED_APPS = [
 # ===========================
 
 MIDDLEWARE = [
+    # first, so its timings cover every other middleware
+    'metrics.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -96,16 +106,34 @@ WSGI_APPLICATION = 'bitsa_project.wsgi.application'
 # DATABASE
 # ===========================
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'bitsa_db',
-        'USER': 'postgres',
-        'PASSWORD': '12345678',
-        'HOST': 'localhost',
-        'PORT': '5432',
-    }
+# Configured from the environment (DATABASE_URL or DB_NAME/DB_USER/DB_PASSWORD/DB_HOST/DB_PORT,
+# DB_CONN_MAX_AGE, DB_POOL, DATABASE_REPLICA_URLS ...); see bitsa_project/database.py.
+DATABASES = databases_from_env()
+
+if len(DATABASES) > 1:
+    DATABASE_ROUTERS = ['bitsa_project.database.ReplicaRouter']
+
+
+# ===========================
+# PASSWORD HASHING
+# ===========================
+
+# The first hasher hashes new passwords; the others still verify older hashes, which
+# are upgraded on the user's next successful login. PASSWORD_HASHER=argon2|scrypt|bcrypt
+# switches the algorithm (argon2 and bcrypt need argon2-cffi / bcrypt installed).
+_PASSWORD_HASHER_CHOICES = {
+    'pbkdf2': 'accounts.hashers.ConfigurablePBKDF2PasswordHasher',
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'bcrypt': 'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
 }
+_preferred_hasher = _PASSWORD_HASHER_CHOICES[os.environ.get('PASSWORD_HASHER', 'pbkdf2')]
+PASSWORD_HASHERS = [_preferred_hasher] + [
+    hasher for hasher in _PASSWORD_HASHER_CHOICES.values() if hasher != _preferred_hasher
+] + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+
+# PBKDF2 work factor (unset: Django's default). Changing it re-hashes passwords on login.
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 0)) or None
 
 
 # ===========================
@@ -148,10 +176,84 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# uploads are stored once per distinct content under cas/<sha256>, see mediastore/storage.py
+STORAGES = {
+    'default': {'BACKEND': 'mediastore.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 
+# ===========================
+# GALLERY UPLOADS
+# ===========================
+
+# Chunked uploads (gallery/uploads.py) are assembled here, outside MEDIA_ROOT so
+# partial files are never served, then moved into storage on completion
+GALLERY_UPLOAD_STAGING_ROOT = Path(os.environ.get('GALLERY_UPLOAD_STAGING_ROOT', BASE_DIR / 'upload_staging'))
+GALLERY_UPLOAD_MAX_BYTES = int(os.environ.get('GALLERY_UPLOAD_MAX_BYTES', 25 * 1024 * 1024))
+# Largest body accepted by one chunk PUT
+GALLERY_UPLOAD_CHUNK_BYTES = int(os.environ.get('GALLERY_UPLOAD_CHUNK_BYTES', 5 * 1024 * 1024))
+# Limits checked as soon as the image header has arrived
+GALLERY_UPLOAD_MAX_DIMENSION = int(os.environ.get('GALLERY_UPLOAD_MAX_DIMENSION', 8000))
+GALLERY_UPLOAD_MAX_PIXELS = int(os.environ.get('GALLERY_UPLOAD_MAX_PIXELS', 40_000_000))
+GALLERY_UPLOAD_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+# Unfinished uploads older than this are removed by `manage.py expire_uploads`
+GALLERY_UPLOAD_EXPIRY_HOURS = int(os.environ.get('GALLERY_UPLOAD_EXPIRY_HOURS', 24))
+
+
+# ===========================
+# CACHE
+# ===========================
+
+# Local memory by default (dev/tests). Point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend in production, e.g. django.core.cache.backends.redis.RedisCache and
+# redis://127.0.0.1:6379/1, so every worker sees the same generation counters.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', 'bitsa-default'),
+    }
+}
+
+# Anonymous list/retrieve responses, see bitsa_project/cache.py
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+
+
+# ===========================
+# METRICS
+# ===========================
+
+# Per-view latency/query histograms served at /api/metrics/, see metrics/middleware.py
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+# Queries slower than this are logged to `metrics.slow_query` (None disables)
+METRICS_SLOW_QUERY_MS = int(os.environ.get('METRICS_SLOW_QUERY_MS', 200))
+
+
+# ===========================
+# BACKGROUND TASKS
+# ===========================
+
+# Queue table drained by `manage.py run_worker`, see tasks/registry.py.
+# Eager mode runs tasks right after the enqueueing transaction commits (no worker needed)
+TASKS_EAGER = os.environ.get('TASKS_EAGER', '').lower() in ('1', 'true', 'yes')
+# Seconds a running task may hold its lock before a worker reclaims it
+TASKS_LOCK_TIMEOUT = 600
+# Upper bound for the exponential retry delay, in seconds
+TASKS_MAX_BACKOFF = 3600
+
+
+# ===========================
+# SEARCH
+# ===========================
+
+# Terms shorter than this skip full-text matching and use a substring/trigram match
+SEARCH_MIN_FTS_LENGTH = 3
+
+
 # ===========================
 # REST FRAMEWORK
 # ===========================
@@ -163,8 +265,39 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed when installed, the stdlib DRF implementation otherwise, see bitsa_project/renderers.py
+    'DEFAULT_RENDERER_CLASSES': (
+        'bitsa_project.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'bitsa_project.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # keyset pagination on each view's `ordering`, see bitsa_project/pagination.py
+    'DEFAULT_PAGINATION_CLASS': 'bitsa_project.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.environ.get('API_PAGE_SIZE', 20)),
+    # sliding-window limits, see bitsa_project/throttling.py; the auth views add
+    # the auth_ip/auth_identifier throttles on top of these defaults
+    'DEFAULT_THROTTLE_CLASSES': (
+        'bitsa_project.throttling.UserWriteThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': os.environ.get('THROTTLE_AUTH_IP_RATE', '30/min'),
+        'auth_identifier': os.environ.get('THROTTLE_AUTH_IDENTIFIER_RATE', '10/min'),
+        'write': os.environ.get('THROTTLE_WRITE_RATE', '120/min'),
+    },
 }
 
+# Where throttle counters live: CacheCounterStore uses THROTTLE_CACHE_ALIAS (shared
+# across workers when CACHES points at Redis/Memcached); LocalMemoryCounterStore is per process
+THROTTLE_COUNTER_STORE = os.environ.get('THROTTLE_COUNTER_STORE', 'bitsa_project.throttling.CacheCounterStore')
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Upper bound for the ?page_size= query parameter
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', 100))
+
 
 # ===========================
 # SIMPLE JWT CONFIG
@@ -205,3 +338,6 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+
+# chunked gallery uploads send Content-Range with each PUT
+CORS_ALLOW_HEADERS = (*default_headers, 'content-range')
@@ -0,0 +1,49 @@
+"""
+Test helpers shared by the app test suites.
+"""
+from unittest import mock
+
+from django.core.cache import cache
+
+
+class QueryBudgetMixin:
+    """
+    Mixin for django.test.TestCase asserting that an endpoint runs a fixed number
+    of queries no matter how many rows it returns (i.e. no N+1 on related objects).
+    """
+
+    def assertQueryBudget(self, url, budget, make_row, row_counts=(1, 5), client=None):
+        """
+        Grow the table to each size in ``row_counts`` by calling ``make_row(i)``
+        and assert that GET ``url`` costs exactly ``budget`` queries every time.
+        """
+        client = client or self.client
+        created = 0
+        for target in row_counts:
+            while created < target:
+                make_row(created)
+                created += 1
+            with self.assertNumQueries(budget):
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, msg=f"GET {url} with {target} row(s)")
+
+
+class FastListParityMixin:
+    """Mixin for django.test.TestCase checking FastListMixin against the serializer it replaces."""
+
+    def assertFastListMatches(self, view_class, url, client=None):
+        """
+        GET ``url`` through the fast path (the serializer must not run) and again
+        through the serializer; the response bodies must be byte-identical.
+        """
+        client = client or self.client
+        serializer_class = view_class.serializer_class
+        cache.clear()
+        with mock.patch.object(serializer_class, 'to_representation', side_effect=AssertionError('serializer used')):
+            fast = client.get(url)
+        cache.clear()
+        with mock.patch.object(view_class, 'fast_list_enabled', False):
+            slow = client.get(url)
+        self.assertEqual(fast.status_code, 200, msg=f"GET {url}")
+        self.assertEqual(fast.content, slow.content, msg=f"GET {url}")
+        return fast
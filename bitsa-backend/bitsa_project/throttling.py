@@ -0,0 +1,187 @@
+"""
+Sliding-window rate limits for the API.
+
+Each throttle keeps two fixed-window counters per client (the current and
+the previous window) and estimates the requests made in the last ``duration``
+seconds as ``previous * (1 - elapsed / duration) + current``. That smooths the
+burst a fixed window allows at its boundary, at two counters per client
+instead of the per-request timestamp log DRF's SimpleRateThrottle stores.
+
+Rates come from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] keyed by ``scope``
+(a rate of None disables the scope). Counters live in THROTTLE_COUNTER_STORE:
+the Django cache by default (local memory in dev/tests, a shared backend such
+as Redis in production so every worker counts together), or the per-process
+LocalMemoryCounterStore. Rejections carry a Retry-After header, added by DRF's
+exception handler from ``wait()``.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class CacheCounterStore:
+    """Counters in the THROTTLE_CACHE_ALIAS cache; atomic where the backend's incr() is."""
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'default')]
+
+    def get_many(self, keys):
+        return self.cache.get_many(keys)
+
+    def incr(self, key, timeout):
+        if self.cache.add(key, 1, timeout):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:  # expired between add() and incr()
+            self.cache.set(key, 1, timeout)
+            return 1
+
+
+class LocalMemoryCounterStore:
+    """Counters in a dict shared by the threads of one process."""
+
+    _counters = {}
+    _lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            found = {key: self._counters.get(key) for key in keys}
+        return {key: entry[0] for key, entry in found.items() if entry and entry[1] > now}
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            count, expires = self._counters.get(key, (0, 0))
+            if expires <= now:
+                count = 0
+                # drop expired counters now and then so the dict stays small
+                if len(self._counters) > 10000:
+                    for stale in [k for k, (_, e) in self._counters.items() if e <= now]:
+                        del self._counters[stale]
+            self._counters[key] = (count + 1, now + timeout)
+            return count + 1
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._counters.clear()
+
+
+def get_counter_store():
+    return import_string(getattr(settings, 'THROTTLE_COUNTER_STORE', 'bitsa_project.throttling.CacheCounterStore'))()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Base class: subclasses set ``scope`` and implement ``get_ident_key()``
+    (return None to leave a request unthrottled).
+    """
+
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    def get_rate(self):
+        # read the rates on every request (not once at import) so override_settings applies
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_key(self, request, view):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_key(request, view)
+        if ident is None:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def allow_request(self, request, view):
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+        current_key, previous_key = f'{self.key}:{window}', f'{self.key}:{window - 1}'
+        store = get_counter_store()
+        counts = store.get_many([current_key, previous_key])
+        self.current, self.previous = counts.get(current_key, 0), counts.get(previous_key, 0)
+
+        if self.estimate() >= self.num_requests:
+            return self.throttle_failure()
+        # the counter must outlive the next window, where it is the "previous" one
+        self.current = store.incr(current_key, self.duration * 2)
+        return self.throttle_success()
+
+    def estimate(self):
+        return self.previous * (1 - self.elapsed / self.duration) + self.current
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until the estimate drops below the limit, assuming no further requests."""
+        if self.current >= self.num_requests:
+            # this window is spent: wait for it to end, then for it to decay as the previous one
+            decay = self.duration * (1 - self.num_requests / self.current)
+            remaining = self.duration - self.elapsed + max(decay, 0)
+        else:
+            needed = self.duration * (1 - (self.num_requests - self.current) / self.previous)
+            remaining = needed - self.elapsed
+        return max(1, math.ceil(round(remaining, 6)))
+
+
+def _hashed(value):
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+class AuthIPThrottle(SlidingWindowThrottle):
+    """Login and registration attempts per client IP."""
+
+    scope = 'auth_ip'
+
+    def get_ident_key(self, request, view):
+        if request.method != 'POST':
+            return None
+        return self.get_ident(request)
+
+
+class AuthIdentifierThrottle(SlidingWindowThrottle):
+    """Login and registration attempts per account name, whichever IP they come from."""
+
+    scope = 'auth_identifier'
+    identifier_fields = ('username', 'email')
+
+    def get_ident_key(self, request, view):
+        if request.method != 'POST':
+            return None
+        for field in self.identifier_fields:
+            value = request.data.get(field)
+            if isinstance(value, str) and value.strip():
+                return _hashed(value.strip().lower())
+        return None
+
+
+class UserWriteThrottle(SlidingWindowThrottle):
+    """Unsafe requests per user (per IP for anonymous clients); reads are not counted."""
+
+    scope = 'write'
+
+    def get_ident_key(self, request, view):
+        if request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return None
+        if request.user and request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        return self.get_ident(request)
@@ -17,10 +17,12 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 
+from mediastore.views import serve_blob
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('accounts.urls')),
@@ -30,8 +32,19 @@ urlpatterns = [
     path('api/blogs/', include('blogs.urls')),
     path('events/', include('events.urls')),
     path('api/events/', include('events.urls')),
+    path('api/metrics/', include('metrics.urls')),
 ]
 
+if settings.DEBUG:
+    # content-addressed media (mediastore.storage), served with an immutable Cache-Control;
+    # in production the web server does this, see mediastore.views.serve_blob
+    urlpatterns += [
+        re_path(
+            rf'^{settings.MEDIA_URL.strip("/")}/(?P<path>cas/[0-9a-f]{{2}}/[0-9a-f]{{2}}/[^/]+)$', serve_blob,
+            name='media-blob',
+        ),
+    ]
+
 # Serve media files from MEDIA_URL -> MEDIA_ROOT for testing environments.
 # NOTE: serving media via Django in production is not recommended; use a proper static/media server (nginx, S3, etc.)
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
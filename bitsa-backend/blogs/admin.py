@@ -1,12 +1,28 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
-from .models import BlogPost
+from django.db.models import Count
+from bitsa_project.cache import bump_generation
+from .models import BlogPost, Tag
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'post_count')
+    search_fields = ('name',)
+    ordering = ('name',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(post_count=Count('posts'))
+
+    def post_count(self, obj):
+        return obj.post_count
+    post_count.admin_order_field = 'post_count'
 
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
     list_display = ('title', 'author', 'category', 'is_published', 'read_time', 'created_at', 'published_at')
     list_filter = ('is_published', 'category', 'created_at', 'author')
+    autocomplete_fields = ('tags',)
     search_fields = ('title', 'content', 'excerpt', 'author__username', 'author__email')
     readonly_fields = ('created_at', 'updated_at', 'published_at',)
     list_per_page = 25
@@ -21,11 +37,15 @@ class BlogPostAdmin(admin.ModelAdmin):
     actions = ['make_published', 'make_unpublished']
 
     def make_published(self, request, queryset):
-        updated = queryset.filter(is_published=False).update(is_published=True, published_at=admin.utils.timezone.now())
+        updated = queryset.filter(is_published=False).update(
+            is_published=True, published_at=admin.utils.timezone.now(), updated_at=admin.utils.timezone.now()
+        )
+        bump_generation('blogs.blogpost')
         self.message_user(request, f"{updated} post(s) marked as published.")
     make_published.short_description = "Mark selected posts as published"
 
     def make_unpublished(self, request, queryset):
-        updated = queryset.filter(is_published=True).update(is_published=False)
+        updated = queryset.filter(is_published=True).update(is_published=False, updated_at=admin.utils.timezone.now())
+        bump_generation('blogs.blogpost')
         self.message_user(request, f"{updated} post(s) marked as unpublished.")
     make_unpublished.short_description = "Mark selected posts as unpublished"
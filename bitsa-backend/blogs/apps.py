@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class BlogsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blogs'
+
+    def ready(self):
+        from bitsa_project.cache import invalidate_on_change
+        from bitsa_project.renditions import generate_on_save
+        from mediastore.references import track_references
+        invalidate_on_change(self.get_model('BlogPost'))
+        invalidate_on_change(self.get_model('Tag'))
+        generate_on_save(self.get_model('BlogPost'))
+        track_references(self.get_model('BlogPost'))
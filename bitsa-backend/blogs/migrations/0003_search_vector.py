@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:26
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN indexes only exist on PostgreSQL; they are kept out of Meta.indexes so
+    # SQLite table rebuilds never try to recreate them.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS blogs_blogpost_search_vector_gin ON blogs_blogpost USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS blogs_blogpost_title_trgm ON blogs_blogpost USING gin (title gin_trgm_ops)'
+    )
+    BlogPost = apps.get_model('blogs', 'BlogPost')
+    BlogPost.objects.update(
+        search_vector=SearchVector('title', weight='A', config='english')
+        + SearchVector('excerpt', weight='B', config='english')
+        + SearchVector('content', weight='C', config='english')
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS blogs_blogpost_search_vector_gin')
+    schema_editor.execute('DROP INDEX IF EXISTS blogs_blogpost_title_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0002_blogpost_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
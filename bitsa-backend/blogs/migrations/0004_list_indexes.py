@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_category_index(apps, schema_editor):
+    # ?category= filters with icontains, i.e. UPPER(category::text) LIKE UPPER('%...%'),
+    # which only a trigram index on that expression can serve (PostgreSQL only)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS blogs_blogpost_category_trgm '
+        'ON blogs_blogpost USING gin ((UPPER(category::text)) gin_trgm_ops)'
+    )
+
+
+def drop_category_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS blogs_blogpost_category_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0003_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-created_at', '-id'], name='blog_published_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['-created_at', '-id'], name='blog_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['author', '-created_at'], name='blog_author_created_idx'),
+        ),
+        migrations.RunPython(create_category_index, drop_category_index),
+    ]
@@ -0,0 +1,87 @@
+from django.db import migrations, models
+
+# frozen copies of blogs.models.TAG_MAX_LENGTH and normalize_tags() as of this migration
+TAG_MAX_LENGTH = 50
+
+
+def normalize_tags(names):
+    """Stripped, whitespace-collapsed, lower-cased, de-duplicated in order, blanks dropped."""
+    normalized = []
+    for name in names:
+        name = ' '.join(name.split()).lower()
+        if name and name not in normalized:
+            normalized.append(name)
+    return normalized
+
+
+def split_tags(apps, schema_editor):
+    """Create a Tag per distinct name in the old comma-separated column and link the posts."""
+    BlogPost = apps.get_model('blogs', 'BlogPost')
+    Tag = apps.get_model('blogs', 'Tag')
+    Through = BlogPost.tags.through
+    db = schema_editor.connection.alias
+
+    posts = [
+        (pk, normalize_tags([name.strip()[:TAG_MAX_LENGTH] for name in text.split(',')]))
+        for pk, text in BlogPost.objects.using(db).exclude(tags_text='').values_list('pk', 'tags_text').iterator()
+    ]
+    names = {name for _, post_names in posts for name in post_names}
+    Tag.objects.using(db).bulk_create([Tag(name=name) for name in sorted(names)], ignore_conflicts=True, batch_size=500)
+    tag_ids = dict(Tag.objects.using(db).values_list('name', 'pk'))
+    Through.objects.using(db).bulk_create(
+        [Through(blogpost_id=pk, tag_id=tag_ids[name]) for pk, post_names in posts for name in post_names],
+        batch_size=500,
+    )
+
+
+def join_tags(apps, schema_editor):
+    BlogPost = apps.get_model('blogs', 'BlogPost')
+    Through = BlogPost.tags.through
+    db = schema_editor.connection.alias
+
+    names = {}
+    for pk, name in Through.objects.using(db).order_by('pk').values_list('blogpost_id', 'tag__name').iterator():
+        names.setdefault(pk, []).append(name)
+    posts = BlogPost.objects.using(db).filter(pk__in=names).only('pk')
+    for post in posts:
+        post.tags_text = ', '.join(names[post.pk])
+    BlogPost.objects.using(db).bulk_update(posts, ['tags_text'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    """
+    Replace the comma-separated BlogPost.tags column with a many-to-many to Tag:
+    the old column is renamed, its values split into Tag rows and links, then dropped.
+    """
+
+    dependencies = [
+        ('blogs', '0004_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.RenameField(
+            model_name='blogpost',
+            old_name='tags',
+            new_name='tags_text',
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='posts', to='blogs.tag'),
+        ),
+        migrations.RunPython(split_tags, join_tags),
+        migrations.RemoveField(
+            model_name='blogpost',
+            name='tags_text',
+        ),
+    ]
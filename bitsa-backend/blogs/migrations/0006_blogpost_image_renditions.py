@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0005_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='image_renditions',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+from django.db import migrations
+
+# frozen here: changing the searched columns or the text search configuration
+# means a new migration that replaces the function
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION blogs_blogpost_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A')
+        || setweight(to_tsvector('english', COALESCE(NEW.excerpt, '')), 'B')
+        || setweight(to_tsvector('english', COALESCE(NEW.content, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER blogs_blogpost_search_vector
+    BEFORE INSERT OR UPDATE OF title, excerpt, content ON blogs_blogpost
+    FOR EACH ROW EXECUTE FUNCTION blogs_blogpost_search_vector_update();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    # the vector is maintained by PostgreSQL on every write: save(), QuerySet.update(),
+    # bulk_create() and admin bulk edits alike. Other databases have no search_vector use.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_TRIGGER)
+    # fires the trigger once for every existing row
+    schema_editor.execute('UPDATE blogs_blogpost SET title = title')
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP TRIGGER IF EXISTS blogs_blogpost_search_vector ON blogs_blogpost')
+    schema_editor.execute('DROP FUNCTION IF EXISTS blogs_blogpost_search_vector_update()')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0006_blogpost_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -1,5 +1,36 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
+
+
+TAG_MAX_LENGTH = 50
+
+
+def normalize_tags(value):
+    """
+    Tag names from a comma-separated string (the old ``tags`` column format) or a
+    list: stripped, lower-cased, de-duplicated in order, blanks dropped.
+    """
+    if isinstance(value, str):
+        value = value.split(',')
+    names = []
+    for name in value:
+        name = ' '.join(str(name).split()).lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+class Tag(models.Model):
+    # stored normalized (see normalize_tags), so lookups are exact matches on the unique index
+    name = models.CharField(max_length=TAG_MAX_LENGTH, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
 
 class BlogPost(models.Model):
     title = models.CharField(max_length=200)
@@ -7,16 +38,32 @@ class BlogPost(models.Model):
     excerpt = models.TextField(blank=True, help_text="Optional short summary")
     author = models.ForeignKey(User, on_delete=models.CASCADE)
     category = models.CharField(max_length=100, default="General")
-    tags = models.CharField(max_length=500, blank=True, help_text="Comma-separated tags")
+    tags = models.ManyToManyField(Tag, blank=True, related_name='posts')
     read_time = models.PositiveIntegerField(default=5, help_text="Estimated read time in minutes")
     is_published = models.BooleanField(default=False)
     image = models.ImageField(upload_to='blogs/', null=True, blank=True)
+    # the RENDITION_VERSION whose renditions exist, maintained by bitsa_project.renditions
+    image_renditions = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(null=True, blank=True)
+    # maintained by a database trigger (PostgreSQL only); GIN indexed in migration 0003
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # (field, weight) pairs searched by bitsa_project/search.py; the trigger from migration 0007 mirrors them
+    SEARCH_FIELDS = (('title', 'A'), ('excerpt', 'B'), ('content', 'C'))
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # public list: published posts only, newest first (plus the keyset tiebreaker)
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(is_published=True), name='blog_published_created_idx'
+            ),
+            models.Index(fields=['-created_at', '-id'], name='blog_created_id_idx'),
+            # ?author= filtered lists
+            models.Index(fields=['author', '-created_at'], name='blog_author_created_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -26,3 +73,13 @@ class BlogPost(models.Model):
             from django.utils import timezone
             self.published_at = timezone.now()
         super().save(*args, **kwargs)
+
+    def set_tags(self, value):
+        """Replace the post's tags with ``value`` (see normalize_tags), creating missing Tag rows."""
+        from django.utils import timezone
+        names = normalize_tags(value)
+        Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+        self.tags.set(Tag.objects.filter(name__in=names))
+        # tags are part of the representation, so they advance the ETag validators like any edit
+        self.updated_at = timezone.now()
+        BlogPost.objects.filter(pk=self.pk).update(updated_at=self.updated_at)
@@ -1,10 +1,43 @@
 from rest_framework import serializers
-from .models import BlogPost
+from bitsa_project.renditions import rendition_srcset
+from bitsa_project.serializers import SparseFieldsetMixin
+from .models import TAG_MAX_LENGTH, BlogPost, normalize_tags
 
-class BlogPostSerializer(serializers.ModelSerializer):
+
+class TagListField(serializers.Field):
+    """
+    The post's tags as one comma-separated string ("ai, web"), the format of the
+    old tags column and of the dashboard's tag inputs; lists are accepted on input
+    too. Tags are stored normalized (see normalize_tags), so the string is not echoed
+    as written: names come back lower-cased and sorted ("Web, AI" reads "ai, web").
+    Read from prefetched tags.
+    """
+
+    default_error_messages = {
+        'invalid': 'Expected a comma-separated string or a list of tags.',
+        'max_length': f'Tags can be at most {TAG_MAX_LENGTH} characters long.',
+    }
+
+    def to_representation(self, value):
+        return ', '.join(sorted(tag.name for tag in value.all()))
+
+    def to_internal_value(self, data):
+        if not isinstance(data, (str, list)):
+            self.fail('invalid')
+        names = normalize_tags(data)
+        if any(len(name) > TAG_MAX_LENGTH for name in names):
+            self.fail('max_length')
+        return names
+
+
+class BlogPostSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    # list pages show title/excerpt; the body is only sent on retrieve or with ?fields=content
+    list_omit = ('content', 'author_email')
     author_name = serializers.CharField(source='author.get_full_name', read_only=True)
     author_email = serializers.CharField(source='author.email', read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
+    tags = TagListField(required=False)
 
     def get_image_url(self, obj):
         if obj.image:
@@ -13,15 +46,29 @@ class BlogPostSerializer(serializers.ModelSerializer):
                 return request.build_absolute_uri(obj.image.url)
         return None
 
+    def get_image_srcset(self, obj):
+        return rendition_srcset(obj.image, self.context.get('request'))
+
     class Meta:
         model = BlogPost
         fields = [
             'id', 'title', 'content', 'excerpt', 'author', 'author_name', 'author_email',
-            'category', 'read_time', 'is_published', 'image_url', 'created_at',
+            'category', 'tags', 'read_time', 'is_published', 'image_url', 'image_srcset', 'created_at',
             'updated_at', 'published_at'
         ]
         read_only_fields = ['id', 'author', 'created_at', 'updated_at', 'published_at']
 
     def create(self, validated_data):
         validated_data['author'] = self.context['request'].user
-        return super().create(validated_data)
+        tags = validated_data.pop('tags', None)
+        post = super().create(validated_data)
+        if tags is not None:
+            post.set_tags(tags)
+        return post
+
+    def update(self, instance, validated_data):
+        tags = validated_data.pop('tags', None)
+        post = super().update(instance, validated_data)
+        if tags is not None:
+            post.set_tags(tags)
+        return post
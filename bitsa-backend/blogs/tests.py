@@ -1,3 +1,108 @@
 from django.test import TestCase
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from bitsa_project.testing import QueryBudgetMixin
+from .models import BlogPost, Tag, normalize_tags
+
+
+class BlogPostQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def test_published_list_does_not_grow_with_rows(self):
+        def make_post(i):
+            author = User.objects.create_user(username=f'author{i}', password='pass', first_name='A')
+            post = BlogPost.objects.create(title=f'P{i}', content='c', author=author, is_published=True)
+            post.set_tags(['news', f'tag{i}'])
+
+        # the page, plus one prefetch for the tags
+        self.assertQueryBudget('/api/blogs/posts/', 3, make_post)
+
+
+class BlogPostFieldsetTests(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(username='writer', password='pass', email='w@example.com')
+        self.post = BlogPost.objects.create(
+            title='Recap', excerpt='Short', content='Long body ' * 200, author=author, is_published=True
+        )
+
+    def test_list_omits_content_and_retrieve_includes_it(self):
+        row = self.client.get('/api/blogs/posts/').json()['results'][0]
+        self.assertEqual(row['excerpt'], 'Short')
+        self.assertNotIn('content', row)
+        self.assertNotIn('author_email', row)
+        detail = self.client.get(f'/api/blogs/posts/{self.post.pk}/').json()
+        self.assertEqual(detail['content'], self.post.content)
+
+    def test_fields_and_omit_params(self):
+        row = self.client.get('/api/blogs/posts/', {'fields': 'id,title,content,bogus'}).json()['results'][0]
+        self.assertEqual(set(row), {'id', 'title', 'content'})
+        row = self.client.get('/api/blogs/posts/', {'omit': 'image_url,image_srcset'}).json()['results'][0]
+        self.assertNotIn('image_url', row)
+        self.assertNotIn('content', row)
+        detail = self.client.get(f'/api/blogs/posts/{self.post.pk}/', {'fields': 'title'}).json()
+        self.assertEqual(detail, {'title': 'Recap'})
+
+    def test_writes_return_every_field(self):
+        staff = User.objects.create_user(username='editor', password='pass', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(staff)
+        response = client.patch(f'/api/blogs/posts/{self.post.pk}/unpublish/?fields=title')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('content', response.data)
+
+
+class BlogPostTagTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username='writer', password='pass', is_staff=True)
+        self.client = APIClient()
+        specs = [
+            ('ai-intro', 'Tutorial', 'AI, Beginner', True),
+            ('web-ai', 'Tutorial', 'ai, web', True),
+            ('web-only', 'News', 'web', True),
+            ('draft', 'News', 'ai, web, beginner', False),
+        ]
+        for title, category, tags, published in specs:
+            post = BlogPost.objects.create(
+                title=title, content='c', author=self.author, category=category, is_published=published
+            )
+            post.set_tags(tags)
+
+    def titles(self, query):
+        return sorted(row['title'] for row in self.client.get(f'/api/blogs/posts/?{query}').json()['results'])
+
+    def test_normalize_tags(self):
+        self.assertEqual(normalize_tags(' AI,  machine   learning ,ai,, '), ['ai', 'machine learning'])
+        self.assertEqual(normalize_tags(['Web', 'web']), ['web'])
+
+    def test_tags_are_shared_rows_and_serialized_as_a_string(self):
+        self.assertEqual(list(Tag.objects.values_list('name', flat=True)), ['ai', 'beginner', 'web'])
+        row = self.client.get('/api/blogs/posts/?search=web-ai').json()['results'][0]
+        self.assertEqual(row['tags'], 'ai, web')
+
+    def test_or_within_a_parameter_and_across_repeats(self):
+        self.assertEqual(self.titles('tag=beginner,web'), ['ai-intro', 'web-ai', 'web-only'])
+        self.assertEqual(self.titles('tag=ai&tag=web'), ['web-ai'])
+        self.assertEqual(self.titles('tag=AI&tag=beginner,web'), ['ai-intro', 'web-ai'])
+        self.assertEqual(self.titles('tag=missing'), [])
+
+    def test_write_tags_as_string_or_list(self):
+        self.client.force_authenticate(self.author)
+        response = self.client.post(
+            '/api/blogs/posts/', {'title': 'New', 'content': 'c', 'tags': 'Django, AI'}, format='multipart'
+        )
+        self.assertEqual(response.status_code, 201)
+        # stored normalized: read back lower-cased and sorted, not as written
+        self.assertEqual(response.data['tags'], 'ai, django')
+        response = self.client.patch(f"/api/blogs/posts/{response.data['id']}/", {'tags': ['web']}, format='json')
+        self.assertEqual(response.data['tags'], 'web')
+        response = self.client.patch(f"/api/blogs/posts/{response.data['id']}/", {'tags': 'x' * 51}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_facets_count_published_posts_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/blogs/posts/facets/')
+        self.assertEqual(response.json(), {
+            'tags': [{'name': 'ai', 'count': 2}, {'name': 'web', 'count': 2}, {'name': 'beginner', 'count': 1}],
+            'categories': [{'name': 'Tutorial', 'count': 2}, {'name': 'News', 'count': 1}],
+        })
+        facets = self.client.get('/api/blogs/posts/facets/?tag=web').json()
+        self.assertEqual(facets['categories'], [{'name': 'News', 'count': 1}, {'name': 'Tutorial', 'count': 1}])
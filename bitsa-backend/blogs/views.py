@@ -1,9 +1,12 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from django.db.models import Count, Exists, F, OuterRef, Value
 from django.utils import timezone
-from django.db import models
-from .models import BlogPost
+from bitsa_project.cache import CachedResponseMixin
+from bitsa_project.conditional import ConditionalGetMixin
+from bitsa_project.search import search_queryset
+from .models import BlogPost, normalize_tags
 from .serializers import BlogPostSerializer
 
 class IsAuthorOrAdmin(permissions.BasePermission):
@@ -19,20 +22,30 @@ class IsAuthorOrAdmin(permissions.BasePermission):
         # Write permissions are only allowed to the author or admin
         return obj.author == request.user or request.user.is_staff
 
-class BlogPostViewSet(viewsets.ModelViewSet):
+class BlogPostViewSet(ConditionalGetMixin, CachedResponseMixin, viewsets.ModelViewSet):
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
+    ordering = '-created_at'
+    cache_models = ('blogs.blogpost', 'blogs.tag', 'auth.user')
+    cached_actions = ('list', 'retrieve', 'facets')
 
     def get_permissions(self):
         """
         Allow anyone to read published posts, but require authentication for write operations.
         """
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'facets']:
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated(), IsAuthorOrAdmin()]
 
+    def get_ordering(self):
+        # ranked search results are ordered (and cursor-paginated) by relevance
+        if getattr(self, 'search_ranked', False):
+            return '-search_rank'
+        return self.ordering
+
     def get_queryset(self):
-        queryset = BlogPost.objects.all()
+        # author_name/author_email are read from the joined user row, tags from one prefetch query
+        queryset = BlogPost.objects.select_related('author').prefetch_related('tags')
 
         # For list/retrieve actions, only show published posts to non-authenticated users
         if self.action in ['list', 'retrieve'] and not self.request.user.is_authenticated:
@@ -51,17 +64,52 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         if category is not None:
             queryset = queryset.filter(category__icontains=category)
 
-        # Search by title or content
+        # ?tag=ai,web matches posts with either tag; repeat the parameter to require all
+        # groups, e.g. ?tag=ai,web&tag=beginner is (ai OR web) AND beginner
+        for group in self.request.query_params.getlist('tag'):
+            names = normalize_tags(group)
+            if names:
+                queryset = queryset.filter(Exists(
+                    BlogPost.tags.through.objects.filter(blogpost_id=OuterRef('pk'), tag__name__in=names)
+                ))
+
+        # Full-text search over title, excerpt and content (ranked on PostgreSQL)
         search = self.request.query_params.get('search', None)
-        if search is not None:
-            queryset = queryset.filter(
-                models.Q(title__icontains=search) |
-                models.Q(content__icontains=search) |
-                models.Q(excerpt__icontains=search)
-            )
+        self.search_ranked = False
+        if search:
+            queryset, self.search_ranked = search_queryset(queryset, search)
 
+        if self.search_ranked:
+            return queryset.order_by('-search_rank', '-created_at')
         return queryset.order_by('-created_at')
 
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Tag and category counts over the published posts matching the list filters
+        (?author=, ?category=, ?tag=, ?search=), most used first, in one UNION ALL query.
+        """
+        return self._cached_response(self.facet_counts, request)
+
+    def facet_counts(self, request):
+        posts = self.get_queryset().filter(is_published=True).order_by().values('pk')
+        tags = (
+            BlogPost.tags.through.objects.filter(blogpost_id__in=posts)
+            .values(facet=Value('tag'), value=F('tag__name'))
+            .annotate(count=Count('*'))
+            .order_by()
+        )
+        categories = (
+            BlogPost.objects.filter(pk__in=posts)
+            .values(facet=Value('category'), value=F('category'))
+            .annotate(count=Count('*'))
+            .order_by()
+        )
+        facets = {'tags': [], 'categories': []}
+        for row in sorted(tags.union(categories, all=True), key=lambda row: (-row['count'], row['value'])):
+            facets['tags' if row['facet'] == 'tag' else 'categories'].append({'name': row['value'], 'count': row['count']})
+        return Response(facets)
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
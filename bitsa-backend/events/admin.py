@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
+from bitsa_project.cache import bump_generation
+from .export import attendee_export_response
 from .models import Event
 
 @admin.register(Event)
@@ -11,8 +14,9 @@ class EventAdmin(admin.ModelAdmin):
     ordering = ('-start_time',)
     list_per_page = 25
 
-    # make attendees manageable with a nicer widget
-    filter_horizontal = ('attendees',)
+    # ID/search widgets instead of rendering the whole user table into the form
+    raw_id_fields = ('attendees',)
+    autocomplete_fields = ('organizer',)
 
     fieldsets = (
         ('Basic', {'fields': ('title', 'description', 'organizer')}),
@@ -30,23 +34,21 @@ class EventAdmin(admin.ModelAdmin):
     image_preview.short_description = 'Image'
 
     def make_public(self, request, queryset):
-        updated = queryset.update(is_public=True)
+        updated = queryset.update(is_public=True, updated_at=timezone.now())
+        bump_generation('events.event')
         self.message_user(request, f"{updated} event(s) made public.")
     make_public.short_description = "Make selected events public"
 
     def make_private(self, request, queryset):
-        updated = queryset.update(is_public=False)
+        updated = queryset.update(is_public=False, updated_at=timezone.now())
+        bump_generation('events.event')
         self.message_user(request, f"{updated} event(s) made private.")
     make_private.short_description = "Make selected events private"
 
     def export_attendees(self, request, queryset):
-        """
-        Minimal action: tell admin how many attendees selected events have.
-        For full CSV export, implement streaming response in a custom admin view.
-        """
-        total = sum(e.attendees.count() for e in queryset)
-        self.message_user(request, f"Selected events have a total of {total} attendee(s).")
-    export_attendees.short_description = "Show total attendees for selected events"
+        """Stream the attendees of the selected events as CSV."""
+        return attendee_export_response(queryset.values('pk'), 'csv', filename='event-attendees')
+    export_attendees.short_description = "Export attendees of selected events (CSV)"
 
     def save_model(self, request, obj, form, change):
         if not change:
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.db.models.functions import Coalesce
+
+from events.models import Event, attendee_count_subquery, sync_attendee_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Event.attendees_count from the attendees through table and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report events whose stored counter disagrees with the through table'
+        )
+
+    def handle(self, *args, **options):
+        drifted = (
+            Event.objects.annotate(actual=Coalesce(attendee_count_subquery(), 0))
+            .exclude(attendees_count=F('actual'))
+            .values_list('id', 'title', 'attendees_count', 'actual')
+        )
+        rows = list(drifted)
+        for event_id, title, stored, actual in rows:
+            self.stdout.write(f"Event {event_id} ({title}): stored={stored} actual={actual}")
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Dry run: {len(rows)} event(s) out of sync."))
+            return
+
+        fixed = sync_attendee_counts()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled attendee counters: {fixed} event(s) corrected."))
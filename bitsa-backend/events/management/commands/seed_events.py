@@ -1,88 +1,252 @@
-from django.core.management.base import BaseCommand
-from django.contrib.auth.models import User
-from django.conf import settings
-from django.utils import timezone
-from django.core.files import File
 from datetime import timedelta
-import os
+from io import BytesIO
 import random
-import urllib.request
+import time
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageDraw
 
+from bitsa_project.cache import bump_generation
+from bitsa_project.renditions import RENDITION_VERSION, generate_renditions
+from blogs.models import BlogPost, Tag
 from events.models import Event
+from gallery.models import Photo
+from mediastore.references import recount as recount_references
+
+TOPICS = ['Hackathon', 'Workshop', 'Tech Talk', 'Meetup', 'Bootcamp', 'Career Fair']
+CATEGORIES = ['hackathon', 'workshop', 'talk', 'social']
+FIRST_NAMES = ['Amina', 'Brian', 'Cynthia', 'David', 'Esther', 'Felix', 'Grace', 'Hassan', 'Irene', 'James']
+LAST_NAMES = ['Otieno', 'Wanjiru', 'Kamau', 'Achieng', 'Mwangi', 'Njeri', 'Odhiambo', 'Chebet', 'Kiprop', 'Mutua']
+WORDS = (
+    'cloud security python react django data machine learning mobile design startup api '
+    'database testing devops community open source career mentor project demo prize team'
+).split()
+PLACEHOLDER_COLORS = [(37, 99, 235), (16, 185, 129), (234, 88, 12), (147, 51, 234), (220, 38, 38), (8, 145, 178)]
+DEMO_USERS = ['organizer1', 'organizer2', 'attendee1', 'attendee2']
+
 
 class Command(BaseCommand):
-    help = "Seed the database with dummy events, users and placeholder images."
+    help = (
+        "Seed the database with synthetic users, events, attendee links, blog posts and photos. "
+        "Rows are written with bulk_create in batches and images are generated locally, "
+        "so large volumes (e.g. --users 100000 --events 200000) finish quickly and offline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='Member accounts (default: 20)')
+        parser.add_argument('--events', type=int, default=5, help='Number of events (default: 5)')
+        parser.add_argument(
+            '--attendees',
+            type=int,
+            default=10,
+            help='Maximum attendees per event; each event gets a random number up to this (default: 10)'
+        )
+        parser.add_argument('--posts', type=int, default=0, help='Number of blog posts (default: 0)')
+        parser.add_argument('--photos', type=int, default=0, help='Number of gallery photos (default: 0)')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed yields the same data (default: 0)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Rows per INSERT (default: 2000)')
+        parser.add_argument(
+            '--no-images',
+            action='store_true',
+            help='Leave events and blog posts without images (photos always get a placeholder)'
+        )
 
     def handle(self, *args, **options):
-        media_events_dir = os.path.join(settings.MEDIA_ROOT, 'events')
-        os.makedirs(media_events_dir, exist_ok=True)
-
-        # Create users (organizers and attendees)
-        users_info = [
-            ('organizer1', 'organizer1@example.com', 'password123'),
-            ('organizer2', 'organizer2@example.com', 'password123'),
-            ('attendee1', 'attendee1@example.com', 'password123'),
-            ('attendee2', 'attendee2@example.com', 'password123'),
-        ]
-
-        created_users = {}
-        for username, email, pwd in users_info:
-            user, created = User.objects.get_or_create(username=username, defaults={'email': email})
-            if created:
-                user.set_password(pwd)
-                user.save()
-            created_users[username] = user
-
-        organizer1 = created_users['organizer1']
-        organizer2 = created_users['organizer2']
-        attendee1 = created_users['attendee1']
-        attendee2 = created_users['attendee2']
-
-        # Create sample events
-        created = 0
-        skipped = 0
-        for i in range(1, 6):
-            title = f"Sample Event {i}"
-            if Event.objects.filter(title=title).exists():
-                skipped += 1
-                continue
-
-            start = timezone.now() + timedelta(days=i)
-            end = start + timedelta(hours=2)
-            organizer = organizer1 if i % 2 else organizer2
-            capacity = random.choice([None, 10, 25, 50])
-            is_public = True if i % 3 else False
-
-            event = Event.objects.create(
-                title=title,
-                description=f"This is a description for {title}. Use this to verify UI rendering.",
-                organizer=organizer,
-                location=f"Venue {i}",
-                start_time=start,
-                end_time=end,
-                capacity=capacity,
-                is_public=is_public
+        started = time.perf_counter()
+        self.rng = random.Random(options['seed'])
+        self.batch_size = max(1, options['batch_size'])
+        # hashing is deliberately slow; every seeded account shares one precomputed hash
+        self.password = make_password('password123')
+        self.now = timezone.now().replace(minute=0, second=0, microsecond=0)
+
+        organizers, members = self.create_users(options['users'])
+        self.images = self.placeholder_images()
+        people = members or organizers
+
+        events, links = self.create_events(options['events'], organizers + people, people, options)
+        posts = self.create_posts(options['posts'], organizers, options)
+        photos = self.create_photos(options['photos'], people)
+
+        # bulk_create skips post_save: count image references, record the placeholders'
+        # renditions and invalidate caches here (search vectors are kept by the database)
+        recount_references()
+        for model in (Event, BlogPost, Photo):
+            model.objects.filter(image__in=self.images).update(image_renditions=RENDITION_VERSION)
+        bump_generation('auth.user', 'events.event', 'blogs.blogpost', 'blogs.tag', 'gallery.photo')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seed complete in {time.perf_counter() - started:.1f}s: {len(members)} members, {events} events, "
+            f"{links} attendee links, {posts} blog posts and {photos} photos."
+        ))
+        self.stdout.write(self.style.SUCCESS(
+            "Users available: organizer1/organizer2/attendee1/attendee2 and member<N> (password: password123)"
+        ))
+
+    def batches(self, rows):
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def create_users(self, count):
+        demo = {}
+        for username in DEMO_USERS:
+            user, created = User.objects.get_or_create(
+                username=username, defaults={'email': f'{username}@example.com', 'password': self.password}
             )
+            demo[username] = user.pk
+
+        def rows():
+            for n in range(1, count + 1):
+                yield User(
+                    username=f'member{n}',
+                    email=f'member{n}@example.com',
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                    password=self.password,
+                )
+
+        for batch in self.batches(rows()):
+            # usernames are unique, so re-running only adds the missing members
+            User.objects.bulk_create(batch, ignore_conflicts=True)
+
+        members = [demo['attendee1'], demo['attendee2']]
+        for batch in self.batches([f'member{n}' for n in range(1, count + 1)]):
+            members.extend(User.objects.filter(username__in=batch).values_list('pk', flat=True))
+        return [demo['organizer1'], demo['organizer2']], members
+
+    def placeholder_images(self):
+        """
+        A small pool of locally drawn JPEGs (plus renditions) shared by all seeded rows.
+        Storage is content-addressed, so re-running stores nothing new.
+        """
+        names = []
+        for index, color in enumerate(PLACEHOLDER_COLORS):
+            image = Image.new('RGB', (1280, 720), color)
+            draw = ImageDraw.Draw(image)
+            light = tuple(min(255, channel + 60) for channel in color)
+            draw.rectangle((160, 120, 1120, 600), fill=light)
+            draw.ellipse((520, 240, 760, 480), fill=color)
+            buffer = BytesIO()
+            image.save(buffer, 'JPEG', quality=85)
+            name = default_storage.save(f'seed/placeholder-{index}.jpg', ContentFile(buffer.getvalue()))
+            generate_renditions(name)
+            names.append(name)
+        return names
+
+    def create_events(self, count, organizers, attendees, options):
+        offset = Event.objects.count()
+        total_links = 0
+
+        def rows():
+            for n in range(offset + 1, offset + count + 1):
+                topic = self.rng.choice(TOPICS)
+                start = self.now + timedelta(hours=self.rng.randint(-24 * 90, 24 * 365))
+                capacity = self.rng.choice([None, 10, 25, 50, 100, 250])
+                yield Event(
+                    title=f"{topic} {n}",
+                    description=f"{topic} on {' and '.join(self.rng.sample(WORDS, 3))}. Bring a laptop and your ideas.",
+                    organizer_id=self.rng.choice(organizers),
+                    location=f"Venue {self.rng.randint(1, 40)}",
+                    category=self.rng.choice(CATEGORIES),
+                    start_time=start,
+                    end_time=start + timedelta(hours=self.rng.randint(1, 8)),
+                    capacity=capacity,
+                    is_public=self.rng.random() < 0.8,
+                    image=None if options['no_images'] else self.rng.choice(self.images),
+                )
+
+        for batch in self.batches(rows()):
+            chosen = []
+            for event in batch:
+                limit = min(options['attendees'], len(attendees), event.capacity or len(attendees))
+                users = self.rng.sample(attendees, self.rng.randint(0, limit)) if limit > 0 else []
+                event.attendees_count = len(users)
+                chosen.append(users)
+            with transaction.atomic():
+                Event.objects.bulk_create(batch)
+                links = [(event.pk, user_id) for event, users in zip(batch, chosen) for user_id in users]
+                self.insert_links(links)
+            total_links += len(links)
+        return count, total_links
+
+    def insert_links(self, links):
+        """Write (event_id, user_id) rows straight to the through table; model instances would dominate the run time."""
+        if not links:
+            return
+        table = connection.ops.quote_name(Event.attendees.through._meta.db_table)
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                with cursor.copy(f'COPY {table} (event_id, user_id) FROM STDIN') as copy:
+                    for row in links:
+                        copy.write_row(row)
+            else:
+                cursor.executemany(f'INSERT INTO {table} (event_id, user_id) VALUES (%s, %s)', links)
+
+    def create_posts(self, count, authors, options):
+        Tag.objects.bulk_create([Tag(name=word) for word in WORDS], ignore_conflicts=True)
+        tag_ids = dict(Tag.objects.filter(name__in=WORDS).values_list('name', 'pk'))
+
+        def rows():
+            """(post, tag names, created_at) triples."""
+            for n in range(1, count + 1):
+                topic = self.rng.choice(TOPICS)
+                published = self.rng.random() < 0.75
+                created = self.now - timedelta(hours=self.rng.randint(0, 24 * 365))
+                paragraphs = [' '.join(self.rng.choices(WORDS, k=60)).capitalize() + '.' for _ in range(4)]
+                post = BlogPost(
+                    title=f"{topic} recap: {' '.join(self.rng.sample(WORDS, 2))}",
+                    excerpt=f"What happened at our latest {topic.lower()}.",
+                    content='\n\n'.join(paragraphs),
+                    author_id=self.rng.choice(authors),
+                    category=self.rng.choice(CATEGORIES),
+                    read_time=self.rng.randint(2, 12),
+                    is_published=published,
+                    published_at=created if published else None,
+                    image=None if options['no_images'] else self.rng.choice(self.images),
+                )
+                yield post, self.rng.sample(WORDS, 3), created
+
+        through = BlogPost.tags.through
+        for batch in self.batches(rows()):
+            with transaction.atomic():
+                posts = BlogPost.objects.bulk_create([post for post, _, _ in batch])
+                through.objects.bulk_create([
+                    through(blogpost_id=post.pk, tag_id=tag_ids[word]) for post, words, _ in batch for word in words
+                ])
+                # created_at is auto_now_add, which the insert overrides with the current time
+                for post, _, created in batch:
+                    post.created_at = created
+                BlogPost.objects.bulk_update(posts, ['created_at'])
+        return count
+
+    def create_photos(self, count, uploaders):
+        def rows():
+            """(photo, uploaded_at) pairs."""
+            for n in range(1, count + 1):
+                photo = Photo(
+                    title=f"Photo {n}",
+                    description=f"{self.rng.choice(TOPICS)} moments",
+                    image=self.rng.choice(self.images),
+                    uploaded_by_id=self.rng.choice(uploaders),
+                )
+                yield photo, self.now - timedelta(minutes=self.rng.randint(0, 60 * 24 * 365))
 
-            # Download placeholder image and attach to event.image
-            try:
-                img_url = f"https://picsum.photos/seed/event{i}/800/600"
-                filename = f"event_{i}.jpg"
-                temp_path = os.path.join(media_events_dir, filename)
-                urllib.request.urlretrieve(img_url, temp_path)
-                with open(temp_path, 'rb') as f:
-                    django_file = File(f)
-                    event.image.save(filename, django_file, save=True)
-            except Exception:
-                pass
-
-            # Add some attendees
-            if i % 2:
-                event.attendees.add(attendee1)
-            if i % 3:
-                event.attendees.add(attendee2)
-
-            created += 1
-
-        self.stdout.write(self.style.SUCCESS(f"Seed complete: created {created} events, skipped {skipped} existing events."))
-        self.stdout.write(self.style.SUCCESS("Users available: organizer1/organizer2/attendee1/attendee2 (password: password123)"))
+        for batch in self.batches(rows()):
+            with transaction.atomic():
+                photos = Photo.objects.bulk_create([photo for photo, _ in batch])
+                # uploaded_at is auto_now_add, as for blog posts above
+                for photo, uploaded in batch:
+                    photo.uploaded_at = uploaded
+                Photo.objects.bulk_update(photos, ['uploaded_at'])
+        return count
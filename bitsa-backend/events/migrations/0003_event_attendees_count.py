@@ -0,0 +1,27 @@
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_attendees_count(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    through = Event.attendees.through
+    counts = through.objects.filter(event_id=models.OuterRef('pk')).order_by().values('event_id').annotate(
+        n=models.Count('*')
+    ).values('n')
+    Event.objects.update(attendees_count=Coalesce(models.Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_event_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='attendees_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Denormalized number of attendees, kept in sync with the attendees table'),
+        ),
+        migrations.RunPython(backfill_attendees_count, migrations.RunPython.noop),
+    ]
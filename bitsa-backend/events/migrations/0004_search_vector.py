@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:26
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def create_search_indexes(apps, schema_editor):
+    # GIN indexes only exist on PostgreSQL; they are kept out of Meta.indexes so
+    # SQLite table rebuilds never try to recreate them.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS events_event_search_vector_gin ON events_event USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS events_event_title_trgm ON events_event USING gin (title gin_trgm_ops)'
+    )
+    Event = apps.get_model('events', 'Event')
+    Event.objects.update(
+        search_vector=SearchVector('title', weight='A', config='english')
+        + SearchVector('location', weight='B', config='english')
+        + SearchVector('description', weight='C', config='english')
+    )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS events_event_search_vector_gin')
+    schema_editor.execute('DROP INDEX IF EXISTS events_event_title_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_attendees_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        TrigramExtension(),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
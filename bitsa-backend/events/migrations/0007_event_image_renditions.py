@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_status_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_renditions',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:05
+
+from django.db import migrations
+
+# frozen here: changing the searched columns or the text search configuration
+# means a new migration that replaces the function
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION events_event_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.title, '')), 'A')
+        || setweight(to_tsvector('english', COALESCE(NEW.location, '')), 'B')
+        || setweight(to_tsvector('english', COALESCE(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER events_event_search_vector
+    BEFORE INSERT OR UPDATE OF title, location, description ON events_event
+    FOR EACH ROW EXECUTE FUNCTION events_event_search_vector_update();
+"""
+
+
+def create_trigger(apps, schema_editor):
+    # the vector is maintained by PostgreSQL on every write: save(), QuerySet.update(),
+    # bulk_create() and admin bulk edits alike. Other databases have no search_vector use.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_TRIGGER)
+    # fires the trigger once for every existing row
+    schema_editor.execute('UPDATE events_event SET title = title')
+
+
+def drop_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP TRIGGER IF EXISTS events_event_search_vector ON events_event')
+    schema_editor.execute('DROP FUNCTION IF EXISTS events_event_search_vector_update()')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_image_renditions'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigger, drop_trigger),
+    ]
@@ -1,8 +1,50 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 
+from bitsa_project.cache import bump_generation
+
+def event_status(start_time, end_time, now):
+    """'upcoming', 'ongoing' or 'completed' at ``now``, for instances not loaded through with_status()."""
+    if timezone.is_naive(start_time):
+        start_time = timezone.make_aware(start_time)
+    if end_time:
+        if timezone.is_naive(end_time):
+            end_time = timezone.make_aware(end_time)
+        if now > end_time:
+            return 'completed'
+    if now >= start_time:
+        return 'ongoing'
+    else:
+        return 'upcoming'
+
+
+EVENT_STATUSES = ('upcoming', 'ongoing', 'completed')
+
+
+def status_condition(status, now):
+    """Q matching the events whose event_status() at ``now`` is ``status``."""
+    not_ended = models.Q(end_time__isnull=True) | models.Q(end_time__gte=now)
+    if status == 'completed':
+        return models.Q(end_time__lt=now)
+    if status == 'ongoing':
+        return models.Q(start_time__lte=now) & not_ended
+    return models.Q(start_time__gt=now) & not_ended
+
+
+def with_status(queryset, now):
+    """Annotate ``current_status``, the same value as event_status(), computed by the database."""
+    return queryset.annotate(current_status=models.Case(
+        models.When(status_condition('completed', now), then=models.Value('completed')),
+        models.When(start_time__lte=now, then=models.Value('ongoing')),
+        default=models.Value('upcoming'),
+        output_field=models.CharField(),
+    ))
+
+
 class Event(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField()
@@ -14,45 +56,186 @@ class Event(models.Model):
     is_public = models.BooleanField(default=True)
     capacity = models.PositiveIntegerField(null=True, blank=True, help_text="Maximum number of attendees (optional)")
     attendees = models.ManyToManyField(User, blank=True, related_name='events_attending')
+    attendees_count = models.PositiveIntegerField(default=0, editable=False, help_text="Denormalized number of attendees, kept in sync with the attendees table")
     image = models.ImageField(upload_to='events/', null=True, blank=True)
+    # the RENDITION_VERSION whose renditions exist, maintained by bitsa_project.renditions
+    image_renditions = models.PositiveSmallIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # maintained by a database trigger (PostgreSQL only); GIN indexed in migration 0004
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    # (field, weight) pairs searched by bitsa_project/search.py; the trigger from migration 0008 mirrors them
+    SEARCH_FIELDS = (('title', 'A'), ('location', 'B'), ('description', 'C'))
 
     class Meta:
         ordering = ['-start_time']
+        indexes = [
+            # list/keyset pagination order, also serves ?upcoming= (start_time >= now)
+            models.Index(fields=['-start_time', '-id'], name='event_start_id_idx'),
+            # ?organizer= filtered lists in the same order
+            models.Index(fields=['organizer', '-start_time'], name='event_organizer_start_idx'),
+            # ?status=completed (end_time < now) and the ETag's latest-ended aggregate
+            models.Index(fields=['end_time'], name='event_end_idx'),
+            # ?category= filtered lists in list order
+            models.Index(fields=['category', '-start_time', '-id'], name='event_category_start_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
-    @property
-    def attendees_count(self):
-        return self.attendees.count()
-
     @property
     def status(self):
-        now = timezone.now()
-        start_time = self.start_time
-        if timezone.is_naive(start_time):
-            start_time = timezone.make_aware(start_time)
-        if self.end_time:
-            end_time = self.end_time
-            if timezone.is_naive(end_time):
-                end_time = timezone.make_aware(end_time)
-            if now > end_time:
-                return 'completed'
-        if now >= start_time:
-            return 'ongoing'
-        else:
-            return 'upcoming'
+        if 'current_status' in self.__dict__:
+            return self.current_status
+        return event_status(self.start_time, self.end_time, timezone.now())
 
     def clean(self):
         # Ensure capacity is not less than current attendees when saving
         if self.capacity is not None and self.pk is not None:
-            current_attendees = self.attendees.count()
-            if self.capacity < current_attendees:
+            if self.capacity < self.attendees_count:
                 raise ValidationError("Capacity cannot be less than current number of attendees.")
 
     def save(self, *args, **kwargs):
         # run clean to enforce capacity constraint
         self.clean()
+        # attendees_count is owned by add_attendee/remove_attendee (image_renditions by the
+        # renditions task); never write back a possibly stale in-memory value when updating
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in ('attendees_count', 'image_renditions', 'search_vector')
+            ]
         super().save(*args, **kwargs)
+        # a with_status() annotation may predate new start/end times
+        self.__dict__.pop('current_status', None)
+
+    def add_attendee(self, user):
+        """
+        Add ``user`` to the attendees in one transaction.
+        The event row is locked and the counter is bumped with a conditional UPDATE,
+        so concurrent RSVPs can never push attendees_count past capacity.
+        Returns 'added', 'exists' or 'full'.
+        """
+        through = Event.attendees.through
+        with transaction.atomic():
+            Event.objects.select_for_update().filter(pk=self.pk).values_list('pk').get()
+            if through.objects.filter(event_id=self.pk, user_id=user.pk).exists():
+                return 'exists'
+            updated = Event.objects.filter(
+                models.Q(capacity__isnull=True) | models.Q(attendees_count__lt=models.F('capacity')),
+                pk=self.pk,
+            ).update(attendees_count=models.F('attendees_count') + 1, updated_at=timezone.now())
+            if not updated:
+                return 'full'
+            through.objects.create(event_id=self.pk, user_id=user.pk)
+            bump_generation('events.event')
+            # read inside the transaction, so from the primary rather than a lagging replica
+            self.refresh_from_db(fields=['attendees_count'])
+        return 'added'
+
+    def remove_attendee(self, user):
+        """Remove ``user`` from the attendees. Returns True if they were attending."""
+        through = Event.attendees.through
+        with transaction.atomic():
+            Event.objects.select_for_update().filter(pk=self.pk).values_list('pk').get()
+            deleted, _ = through.objects.filter(event_id=self.pk, user_id=user.pk).delete()
+            if deleted:
+                Event.objects.filter(pk=self.pk).update(
+                    attendees_count=models.F('attendees_count') - deleted, updated_at=timezone.now()
+                )
+                bump_generation('events.event')
+            self.refresh_from_db(fields=['attendees_count'])
+        return bool(deleted)
+
+    def bulk_update_attendees(self, add=(), remove=()):
+        """
+        Add and remove many users in one transaction; returns ``{user_id: outcome}``.
+        Outcomes are 'removed' / 'not_attending' for ``remove`` and 'added', 'exists',
+        'full' or 'unknown_user' for ``add``. Removals run first so they free seats,
+        and adds fill the remaining capacity in request order.
+        """
+        through = Event.attendees.through
+        add = list(dict.fromkeys(add))
+        remove = list(dict.fromkeys(remove))
+        outcomes = {}
+        with transaction.atomic():
+            event = Event.objects.select_for_update().filter(pk=self.pk).values('capacity').get()
+
+            attending = set()
+            for chunk in _chunks(add + remove):
+                attending.update(
+                    through.objects.filter(event_id=self.pk, user_id__in=chunk).values_list('user_id', flat=True)
+                )
+
+            removed = [user_id for user_id in remove if user_id in attending]
+            for chunk in _chunks(removed):
+                through.objects.filter(event_id=self.pk, user_id__in=chunk).delete()
+            outcomes.update((user_id, 'removed' if user_id in attending else 'not_attending') for user_id in remove)
+            attending.difference_update(removed)
+
+            known = set()
+            for chunk in _chunks([user_id for user_id in add if user_id not in attending]):
+                known.update(User.objects.filter(pk__in=chunk).values_list('pk', flat=True))
+            seats = None
+            if event['capacity'] is not None:
+                taken = through.objects.filter(event_id=self.pk).count()
+                seats = max(event['capacity'] - taken, 0)
+
+            rows = []
+            for user_id in add:
+                if user_id in attending:
+                    outcomes[user_id] = 'exists'
+                elif user_id not in known:
+                    outcomes[user_id] = 'unknown_user'
+                elif seats is not None and len(rows) >= seats:
+                    outcomes[user_id] = 'full'
+                else:
+                    rows.append(through(event_id=self.pk, user_id=user_id))
+                    outcomes[user_id] = 'added'
+            # conflicts can only come from writers that skip the row lock (admin, shell)
+            through.objects.bulk_create(rows, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+
+            if rows or removed:
+                Event.objects.filter(pk=self.pk).update(
+                    attendees_count=Coalesce(attendee_count_subquery(), 0), updated_at=timezone.now()
+                )
+                bump_generation('events.event')
+            self.refresh_from_db(fields=['attendees_count'])
+        return outcomes
+
+
+# keeps IN (...) lists and multi-row INSERTs under SQLite's bound-parameter limit
+BULK_BATCH_SIZE = 500
+
+
+def _chunks(items, size=BULK_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def attendee_count_subquery():
+    """Correlated COUNT(*) over the attendees through table, for reconciling the counter."""
+    through = Event.attendees.through
+    return models.Subquery(
+        through.objects.filter(event_id=models.OuterRef('pk'))
+        .order_by()
+        .values('event_id')
+        .annotate(n=models.Count('*'))
+        .values('n'),
+        output_field=models.PositiveIntegerField(),
+    )
+
+
+def sync_attendee_counts(event_ids=None):
+    """Recompute attendees_count from the through table; returns the number of rows corrected."""
+    qs = Event.objects.all()
+    if event_ids is not None:
+        qs = qs.filter(pk__in=event_ids)
+    actual = Coalesce(attendee_count_subquery(), 0)
+    fixed = qs.annotate(actual=actual).exclude(attendees_count=models.F('actual')).update(
+        attendees_count=actual, updated_at=timezone.now()
+    )
+    if fixed:
+        bump_generation('events.event')
+    return fixed
@@ -1,12 +1,28 @@
 from rest_framework import serializers
+from bitsa_project.fastpath import FastField, column, full_name, media_srcset, media_url
+from bitsa_project.renditions import rendition_srcset
+from bitsa_project.serializers import SparseFieldsetMixin
 from .models import Event
 from datetime import datetime
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    list_omit = ('organizer_email', 'created_at', 'updated_at')
+    # the same values from .values() columns, for FastListMixin (see bitsa_project/fastpath.py)
+    fast_fields = {
+        'organizer_name': full_name('organizer'),
+        'organizer_email': column('organizer__email'),
+        'image': media_url('image'),
+        'image_srcset': media_srcset('image'),
+        'date': FastField(('start_time',), lambda row, context: row['start_time'].date().isoformat()),
+        'time': FastField(('start_time',), lambda row, context: row['start_time'].time().isoformat()),
+        # annotated by EventViewSet.get_queryset (events.models.with_status)
+        'status': column('current_status'),
+    }
     organizer_name = serializers.CharField(source='organizer.get_full_name', read_only=True)
     organizer_email = serializers.CharField(source='organizer.email', read_only=True)
     attendees_count = serializers.IntegerField(read_only=True)
     image = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
 
     def get_image(self, obj):
         if obj.image:
@@ -14,6 +30,9 @@ class EventSerializer(serializers.ModelSerializer):
             if request:
                 return request.build_absolute_uri(obj.image.url)
         return None
+
+    def get_image_srcset(self, obj):
+        return rendition_srcset(obj.image, self.context.get('request'))
     date = serializers.SerializerMethodField()
     time = serializers.SerializerMethodField()
 
@@ -22,7 +41,7 @@ class EventSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'title', 'description', 'organizer', 'organizer_name', 'organizer_email',
             'location', 'category', 'end_time', 'is_public', 'capacity',
-            'attendees_count', 'status', 'image', 'date', 'time', 'created_at', 'updated_at'
+            'attendees_count', 'status', 'image', 'image_srcset', 'date', 'time', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'organizer', 'attendees_count', 'created_at', 'updated_at']
 
@@ -58,3 +77,21 @@ class EventSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("Invalid date or time format")
 
         return super().update(instance, validated_data)
+
+
+class AttendeeBulkSerializer(serializers.Serializer):
+    """Payload for POST /events/{id}/attendees/: user IDs to add and/or remove."""
+    MAX_IDS = 10000
+
+    add = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list)
+    remove = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list)
+
+    def validate(self, attrs):
+        if not attrs['add'] and not attrs['remove']:
+            raise serializers.ValidationError("Provide user IDs in 'add' and/or 'remove'.")
+        if len(attrs['add']) + len(attrs['remove']) > self.MAX_IDS:
+            raise serializers.ValidationError(f"At most {self.MAX_IDS} user IDs per request.")
+        both = set(attrs['add']) & set(attrs['remove'])
+        if both:
+            raise serializers.ValidationError(f"User IDs in both 'add' and 'remove': {sorted(both)[:20]}")
+        return attrs
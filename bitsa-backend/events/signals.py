@@ -0,0 +1,35 @@
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
+
+from bitsa_project.cache import invalidate_on_change
+from bitsa_project.renditions import generate_on_save
+from mediastore.references import track_references
+from .models import Event, sync_attendee_counts
+
+invalidate_on_change(Event)
+generate_on_save(Event)
+track_references(Event)
+
+
+@receiver(m2m_changed, sender=Event.attendees.through)
+def keep_attendees_count_in_sync(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Attendee changes made through the related managers (admin form, shell, seeding)
+    bypass Event.add_attendee/remove_attendee, so recompute the counter for the
+    affected events from the through table.
+    """
+    if action == 'pre_clear' and reverse:
+        # remember which events lose this user before the rows disappear
+        instance._cleared_event_ids = list(
+            sender.objects.filter(user_id=instance.pk).values_list('event_id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        sync_attendee_counts([instance.pk])
+    elif action == 'post_clear':
+        sync_attendee_counts(getattr(instance, '_cleared_event_ids', []))
+    elif pk_set:
+        sync_attendee_counts(pk_set)
@@ -1,9 +1,30 @@
-from django.test import TestCase
+import json
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.db.models import Max, Min
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
 from django.contrib.auth.models import User
-from .models import Event
+from rest_framework.test import APIClient
+from PIL import Image
+from .models import Event, event_status, sync_attendee_counts, with_status
+from .serializers import EventSerializer
+from .views import EventViewSet
 from django.utils import timezone
 from datetime import timedelta
 
+from bitsa_project.renditions import generate_renditions, has_renditions
+from bitsa_project.testing import FastListParityMixin, QueryBudgetMixin
+from blogs.models import BlogPost
+from gallery.models import Photo
+
 class EventModelTests(TestCase):
     def setUp(self):
         self.user = User.objects.create_user(username='u1', password='pass')
@@ -20,3 +41,495 @@ class EventModelTests(TestCase):
 
     def test_str(self):
         self.assertEqual(str(self.event), 'Test Event')
+
+
+class EventAttendeeCounterTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='org', password='pass')
+        self.event = Event.objects.create(
+            title='Capped Event',
+            description='Desc',
+            organizer=self.organizer,
+            start_time=timezone.now() + timedelta(days=1),
+            capacity=1,
+        )
+        self.u1 = User.objects.create_user(username='a1', password='pass')
+        self.u2 = User.objects.create_user(username='a2', password='pass')
+
+    def test_add_and_remove_attendee_update_counter(self):
+        self.assertEqual(self.event.add_attendee(self.u1), 'added')
+        self.assertEqual(self.event.attendees_count, 1)
+        self.assertEqual(self.event.add_attendee(self.u1), 'exists')
+        self.assertTrue(self.event.remove_attendee(self.u1))
+        self.assertFalse(self.event.remove_attendee(self.u1))
+        self.assertEqual(self.event.attendees_count, 0)
+
+    def test_add_attendee_respects_capacity(self):
+        self.event.add_attendee(self.u1)
+        self.assertEqual(self.event.add_attendee(self.u2), 'full')
+        self.assertEqual(self.event.attendees.count(), 1)
+
+    def test_rsvp_endpoint_toggles(self):
+        client = APIClient()
+        client.force_authenticate(self.u1)
+        url = f'/api/events/{self.event.pk}/rsvp/'
+        self.assertEqual(client.post(url).data, {'status': 'added'})
+        self.assertEqual(client.post(url).data, {'status': 'removed'})
+        self.event.add_attendee(self.u2)
+        self.assertEqual(client.post(url).status_code, 400)
+
+    def test_rsvp_is_throttled_per_user(self):
+        cache.clear()
+        client = APIClient()
+        client.force_authenticate(self.u1)
+        url = f'/api/events/{self.event.pk}/rsvp/'
+        rates = {**settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], 'write': '2/min'}
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+            self.assertEqual(client.post(url).status_code, 200)
+            self.assertEqual(client.post(url).status_code, 200)
+            self.assertEqual(client.get(f'/api/events/{self.event.pk}/').status_code, 200)
+            throttled = client.post(url)
+            self.assertEqual(throttled.status_code, 429)
+            self.assertGreaterEqual(int(throttled['Retry-After']), 1)
+            # the limit is per user
+            client.force_authenticate(self.u2)
+            self.assertEqual(client.post(url).status_code, 200)
+
+    def test_related_manager_changes_resync_counter(self):
+        self.event.capacity = None
+        self.event.save()
+        self.event.attendees.add(self.u1, self.u2)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 2)
+        self.u1.events_attending.clear()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 1)
+
+    def test_save_does_not_overwrite_counter(self):
+        stale = Event.objects.get(pk=self.event.pk)
+        self.event.add_attendee(self.u1)
+        stale.title = 'Renamed'
+        stale.save()
+        stale.refresh_from_db()
+        self.assertEqual(stale.attendees_count, 1)
+
+    def test_reconcile_command_fixes_drift(self):
+        from django.core.management import call_command
+        from io import StringIO
+        self.event.add_attendee(self.u1)
+        Event.objects.filter(pk=self.event.pk).update(attendees_count=7)
+        call_command('reconcile_attendee_counts', stdout=StringIO())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 1)
+
+
+class EventPaginationTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user(username='pager', password='pass')
+        start = timezone.now() + timedelta(days=1)
+        # several events share a start_time so the id tiebreaker matters
+        for i in range(7):
+            Event.objects.create(
+                title=f'E{i}', description='d', organizer=organizer,
+                start_time=start + timedelta(hours=i // 3),
+            )
+
+    def test_cursor_walks_every_row_once_in_order(self):
+        expected = list(Event.objects.order_by('-start_time', '-id').values_list('id', flat=True))
+        seen = []
+        url = '/api/events/?page_size=3'
+        pages = []
+        while url:
+            data = self.client.get(url).json()
+            pages.append(data)
+            seen += [row['id'] for row in data['results']]
+            url = data['next']
+        self.assertEqual(seen, expected)
+        self.assertIsNone(pages[0]['previous'])
+
+        back = self.client.get(pages[-1]['previous']).json()
+        self.assertEqual([row['id'] for row in back['results']], [row['id'] for row in pages[-2]['results']])
+
+    def test_page_size_is_capped_and_bad_cursor_is_404(self):
+        with self.settings(API_MAX_PAGE_SIZE=2):
+            self.assertEqual(len(self.client.get('/api/events/?page_size=50').json()['results']), 2)
+        self.assertEqual(self.client.get('/api/events/?cursor=garbage').status_code, 404)
+
+
+class EventQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def test_list_and_retrieve_do_not_grow_with_rows(self):
+        users = [User.objects.create_user(username=f'org{i}', password='pass') for i in range(5)]
+
+        def make_event(i):
+            event = Event.objects.create(
+                title=f'E{i}', description='d', organizer=users[i],
+                start_time=timezone.now() + timedelta(days=i),
+            )
+            event.attendees.add(users[0])
+
+        self.assertQueryBudget('/api/events/', 2, make_event)
+        event_id = Event.objects.values_list('id', flat=True).first()
+        with self.assertNumQueries(2):
+            self.client.get(f'/api/events/{event_id}/')
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix='bitsa-media-'), IMAGE_RENDITION_WIDTHS=(32,))
+class EventFastListTests(FastListParityMixin, TestCase):
+    def setUp(self):
+        now = timezone.now()
+        ada = User.objects.create_user(username='ada', password='pass', first_name='Ada', last_name='Lovelace', email='ada@example.com')
+        anon = User.objects.create_user(username='nameless', password='pass')
+        images = []
+        for name, color in (('events/café night.png', (0, 128, 255)), ('events/plain.png', (255, 128, 0))):
+            buffer = BytesIO()
+            Image.new('RGB', (64, 32), color).save(buffer, 'PNG')
+            images.append(default_storage.save(name, ContentFile(buffer.getvalue())))
+        generate_renditions(images[0])
+        specs = [
+            (ada, now - timedelta(days=3), now - timedelta(days=2), images[0]),  # completed, with renditions
+            (anon, now - timedelta(hours=1), None, images[1]),  # ongoing, no renditions yet
+            (ada, now + timedelta(days=1), now + timedelta(days=1, hours=2), None),  # upcoming
+            (anon, now + timedelta(days=1), None, ''),  # same start: id tiebreaker
+            (ada, now + timedelta(days=9), None, None),
+        ]
+        for i, (organizer, start, end, image) in enumerate(specs):
+            Event.objects.create(
+                title=f'Hack night {i}', description='Ünïcode \u2028 text', organizer=organizer,
+                location='Hall', start_time=start, end_time=end, image=image, capacity=i or None,
+            )
+
+    def test_list_matches_the_serializer(self):
+        response = self.assertFastListMatches(EventViewSet, '/api/events/')
+        rows = response.json()['results']
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(
+            [row['status'] for row in rows], ['upcoming', 'upcoming', 'upcoming', 'ongoing', 'completed']
+        )
+        self.assertTrue(rows[-1]['image'].startswith('http://testserver/media/cas/'))
+        self.assertEqual(set(rows[-1]['image_srcset']), {'webp', 'jpeg'})
+
+    def test_pages_fieldsets_and_filters_match(self):
+        first = self.assertFastListMatches(EventViewSet, '/api/events/?page_size=2').json()
+        self.assertFastListMatches(EventViewSet, first['next'])
+        queries = (
+            'fields=id,title,status,image', 'omit=description,image_srcset', 'upcoming=1', 'search=hack',
+            'status=ongoing,completed',
+        )
+        for query in queries:
+            self.assertFastListMatches(EventViewSet, f'/api/events/?{query}')
+
+    def test_unknown_fast_field_falls_back_to_the_serializer(self):
+        with mock.patch.dict(EventSerializer.fast_fields, clear=True):
+            self.assertEqual(self.client.get('/api/events/').status_code, 200)
+
+
+class EventStatusFilterTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        organizer = User.objects.create_user(username='org', password='pass')
+        specs = [
+            ('past', 'workshop', self.now - timedelta(days=3), self.now - timedelta(days=2)),
+            ('running', 'hackathon', self.now - timedelta(hours=1), self.now + timedelta(hours=1)),
+            ('open-ended', 'workshop', self.now - timedelta(days=1), None),
+            ('soon', 'hackathon', self.now + timedelta(days=1), None),
+            ('later', 'meetup', self.now + timedelta(days=10), self.now + timedelta(days=11)),
+        ]
+        for title, category, start, end in specs:
+            Event.objects.create(
+                title=title, description='d', organizer=organizer, category=category, start_time=start, end_time=end,
+            )
+
+    def titles(self, query):
+        response = self.client.get(f'/api/events/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return [row['title'] for row in response.json()['results']]
+
+    def test_annotation_matches_the_python_status(self):
+        for event in with_status(Event.objects.all(), self.now):
+            self.assertEqual(event.current_status, event_status(event.start_time, event.end_time, self.now))
+
+    def test_status_filter(self):
+        self.assertEqual(self.titles('status=upcoming'), ['later', 'soon'])
+        self.assertEqual(self.titles('status=ongoing'), ['running', 'open-ended'])
+        self.assertEqual(self.titles('status=completed'), ['past'])
+        self.assertEqual(self.titles('status=completed,upcoming'), ['later', 'soon', 'past'])
+        response = self.client.get('/api/events/?status=cancelled')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json())
+
+    def test_date_range_and_category(self):
+        def iso(value):
+            return value.isoformat().replace('+', '%2B')
+
+        self.assertEqual(self.titles(f'start_before={iso(self.now)}&category=workshop'), ['open-ended', 'past'])
+        self.assertEqual(
+            self.titles(f'start_after={iso(self.now - timedelta(hours=2))}&category=hackathon,meetup'),
+            ['later', 'soon', 'running'],
+        )
+        # a bare date is midnight at the start of that day
+        week = (self.now + timedelta(days=7)).date().isoformat()
+        self.assertEqual(self.titles(f'start_after={week}'), ['later'])
+        self.assertEqual(self.client.get('/api/events/?start_after=yesterday').status_code, 400)
+
+    def test_updated_instance_reports_its_new_status(self):
+        event = Event.objects.get(title='soon')
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='admin', password='pass', is_staff=True))
+        response = client.patch(
+            f'/api/events/{event.pk}/', {'end_time': (self.now - timedelta(hours=1)).isoformat()}, format='json'
+        )
+        self.assertEqual(response.json()['status'], 'completed')
+
+
+class EventSearchTests(TestCase):
+    def setUp(self):
+        organizer = User.objects.create_user(username='searcher', password='pass')
+        start = timezone.now() + timedelta(days=1)
+        Event.objects.create(title='Hackathon Night', description='Build things', organizer=organizer, start_time=start)
+        Event.objects.create(title='Career Fair', description='Meet hackers hiring', organizer=organizer, start_time=start)
+        Event.objects.create(title='Picnic', description='Food', location='Nairobi Arboretum', organizer=organizer, start_time=start)
+
+    def titles(self, term):
+        return {row['title'] for row in self.client.get('/api/events/', {'search': term}).json()['results']}
+
+    def test_search_matches_title_description_and_location(self):
+        self.assertEqual(self.titles('hackathon'), {'Hackathon Night'})
+        self.assertEqual(self.titles('nairobi'), {'Picnic'})
+        self.assertEqual(self.titles('zzz'), set())
+
+    @skipUnless(connection.vendor == 'postgresql', 'ranked full-text search is PostgreSQL only')
+    def test_partial_term_matches_title_via_trigram_and_ranks_first(self):
+        results = self.client.get('/api/events/', {'search': 'hack'}).json()['results']
+        self.assertEqual(results[0]['title'], 'Hackathon Night')
+
+    @skipUnless(connection.vendor == 'postgresql', 'the search vector trigger is PostgreSQL only')
+    def test_every_write_path_keeps_the_vector_current(self):
+        organizer = User.objects.get(username='searcher')
+        Event.objects.bulk_create([
+            Event(title='Quantum Meetup', description='Qubits', organizer=organizer, start_time=timezone.now()),
+        ])
+        self.assertEqual(self.titles('quantum'), {'Quantum Meetup'})
+        Event.objects.filter(title='Quantum Meetup').update(title='Robotics Meetup')
+        self.assertEqual(self.titles('robotics'), {'Robotics Meetup'})
+        self.assertEqual(Event.objects.filter(search_vector__isnull=True).count(), 0)
+
+
+class EventResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(username='cached', password='pass')
+        self.event = Event.objects.create(
+            title='Cached', description='d', organizer=self.organizer,
+            start_time=timezone.now() + timedelta(days=1),
+        )
+
+    def test_anonymous_list_is_served_from_cache_until_a_write(self):
+        self.client.get('/api/events/')
+        # only the ETag aggregate reaches the database
+        with self.assertNumQueries(1):
+            cached = self.client.get('/api/events/').json()
+        self.assertEqual(cached['results'][0]['attendees_count'], 0)
+
+        self.event.add_attendee(self.organizer)
+        fresh = self.client.get('/api/events/').json()
+        self.assertEqual(fresh['results'][0]['attendees_count'], 1)
+
+        self.event.title = 'Renamed'
+        self.event.save()
+        self.assertEqual(self.client.get(f'/api/events/{self.event.pk}/').json()['title'], 'Renamed')
+
+    def test_query_params_are_part_of_the_key(self):
+        self.client.get('/api/events/')
+        self.assertEqual(self.client.get('/api/events/', {'search': 'nomatch'}).json()['results'], [])
+
+
+class EventConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.organizer = User.objects.create_user(username='etag', password='pass')
+        self.event = Event.objects.create(
+            title='Tagged', description='d', organizer=self.organizer,
+            start_time=timezone.now() + timedelta(days=1),
+        )
+
+    def test_list_returns_304_for_matching_etag(self):
+        response = self.client.get('/api/events/')
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+        with self.assertNumQueries(1):
+            not_modified = self.client.get('/api/events/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], etag)
+
+    def test_rsvp_and_delete_change_the_etag(self):
+        etag = self.client.get('/api/events/')['ETag']
+        self.event.add_attendee(self.organizer)
+        after_rsvp = self.client.get('/api/events/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(after_rsvp.status_code, 200)
+
+        other = Event.objects.create(
+            title='Other', description='d', organizer=self.organizer,
+            start_time=timezone.now() + timedelta(days=2),
+        )
+        etag = self.client.get('/api/events/')['ETag']
+        other.delete()
+        self.assertEqual(self.client.get('/api/events/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_filters_scope_the_validators(self):
+        stranger = User.objects.create_user(username='stranger', password='pass')
+        etag = self.client.get('/api/events/', {'organizer': self.organizer.pk})['ETag']
+        Event.objects.create(
+            title='Elsewhere', description='d', organizer=stranger,
+            start_time=timezone.now() + timedelta(days=3),
+        )
+        response = self.client.get('/api/events/', {'organizer': self.organizer.pk}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_status_transition_changes_the_etag(self):
+        etag = self.client.get(f'/api/events/{self.event.pk}/')['ETag']
+        Event.objects.filter(pk=self.event.pk).update(start_time=timezone.now() - timedelta(minutes=1))
+        # same updated_at, but the event is now ongoing
+        response = self.client.get(f'/api/events/{self.event.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ongoing')
+
+    def test_retrieve_honours_if_modified_since(self):
+        response = self.client.get(f'/api/events/{self.event.pk}/')
+        not_modified = self.client.get(
+            f'/api/events/{self.event.pk}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(self.client.get('/api/events/999999/').status_code, 404)
+
+
+class EventBulkAttendeeTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='bulkorg', password='pass')
+        self.users = [User.objects.create_user(username=f'reg{i}', password='pass') for i in range(5)]
+        self.event = Event.objects.create(
+            title='Bulk', description='d', organizer=self.organizer,
+            start_time=timezone.now() + timedelta(days=1), capacity=3,
+        )
+        self.url = f'/api/events/{self.event.pk}/attendees/'
+
+    def post(self, payload, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.organizer)
+        return client.post(self.url, payload, format='json')
+
+    def test_adds_up_to_capacity_with_per_id_outcomes(self):
+        self.event.add_attendee(self.users[0])
+        ids = [user.pk for user in self.users]
+        response = self.post({'add': ids + [999999]})
+        self.assertEqual(response.status_code, 200)
+        results = {row['user']: row['result'] for row in response.json()['results']}
+        self.assertEqual(results, {
+            ids[0]: 'exists', ids[1]: 'added', ids[2]: 'added', ids[3]: 'full', ids[4]: 'full',
+            999999: 'unknown_user',
+        })
+        self.assertEqual(response.json()['attendees_count'], 3)
+        self.assertEqual(self.event.attendees.count(), 3)
+
+    def test_removals_free_seats_for_adds_in_the_same_request(self):
+        for user in self.users[:3]:
+            self.event.add_attendee(user)
+        response = self.post({'remove': [self.users[0].pk, self.users[4].pk], 'add': [self.users[3].pk]})
+        results = {row['user']: row['result'] for row in response.json()['results']}
+        self.assertEqual(results[self.users[0].pk], 'removed')
+        self.assertEqual(results[self.users[4].pk], 'not_attending')
+        self.assertEqual(results[self.users[3].pk], 'added')
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.attendees_count, 3)
+
+    def test_only_organizer_or_staff_may_manage_attendees(self):
+        response = self.post({'add': [self.users[1].pk]}, user=self.users[0])
+        self.assertEqual(response.status_code, 403)
+
+    def test_rejects_ids_in_both_lists(self):
+        response = self.post({'add': [self.users[1].pk], 'remove': [self.users[1].pk]})
+        self.assertEqual(response.status_code, 400)
+
+
+class EventAttendeeExportTests(TestCase):
+    def setUp(self):
+        self.organizer = User.objects.create_user(username='exporter', password='pass')
+        self.event = Event.objects.create(
+            title='Export, "quoted"', description='d', organizer=self.organizer,
+            start_time=timezone.now() + timedelta(days=1),
+        )
+        self.attendees = [
+            User.objects.create_user(username=f'guest{i}', email=f'guest{i}@example.com', password='pass')
+            for i in range(3)
+        ]
+        self.event.bulk_update_attendees(add=[user.pk for user in self.attendees])
+        self.client = APIClient()
+        self.client.force_authenticate(self.organizer)
+
+    def export(self, **params):
+        params.setdefault('ids', str(self.event.pk))
+        return self.client.get('/api/events/attendees-export/', params)
+
+    def test_csv_export_streams_one_row_per_attendee(self):
+        response = self.export()
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'event_id,event_title,user_id,username,first_name,last_name,email')
+        self.assertEqual(len(lines), 4)
+        self.assertIn('"Export, ""quoted"""', lines[1])
+
+    def test_ndjson_export_uses_a_single_query(self):
+        with self.assertNumQueries(1):  # the permitted event ids are a subquery
+            response = self.export(export_format='ndjson')
+            rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['username'] for row in rows], ['guest0', 'guest1', 'guest2'])
+
+    def test_other_organizers_events_are_not_exported(self):
+        self.client.force_authenticate(self.attendees[0])
+        lines = b''.join(self.export().streaming_content).splitlines()
+        self.assertEqual(len(lines), 1)  # header only
+
+    def test_rejects_unknown_format(self):
+        self.assertEqual(self.export(export_format='xml').status_code, 400)
+
+    def test_admin_action_streams_csv(self):
+        admin_user = User.objects.create_superuser(username='boss', email='boss@example.com', password='pass')
+        client = Client()
+        client.force_login(admin_user)
+        response = client.post('/admin/events/event/', {
+            'action': 'export_attendees', '_selected_action': [self.event.pk],
+        })
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 4)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix='bitsa-seed-'), IMAGE_RENDITION_WIDTHS=(32,))
+class SeedEventsCommandTests(TestCase):
+    def seed(self, **options):
+        call_command('seed_events', users=30, events=40, attendees=12, posts=10, photos=5, stdout=StringIO(), **options)
+
+    def test_bulk_seed_keeps_counters_consistent(self):
+        self.seed()
+        self.assertEqual(Event.objects.count(), 40)
+        self.assertEqual(BlogPost.objects.count(), 10)
+        self.assertEqual(Photo.objects.count(), 5)
+        self.assertEqual(User.objects.filter(username__startswith='member').count(), 30)
+        self.assertEqual(sync_attendee_counts(), 0)
+        for event in Event.objects.exclude(capacity=None):
+            self.assertLessEqual(event.attendees_count, event.capacity)
+        # one shared hash, and it is a real one
+        self.assertEqual(User.objects.values('password').distinct().count(), 1)
+        self.assertTrue(User.objects.get(username='member1').check_password('password123'))
+        self.assertTrue(has_renditions(Photo.objects.first().image.name))
+        # dates are spread out, so date-ordered lists and their cursors have something to page over
+        for model, field in ((BlogPost, 'created_at'), (Photo, 'uploaded_at')):
+            span = model.objects.aggregate(first=Min(field), last=Max(field))
+            self.assertGreater(span['last'] - span['first'], timedelta(days=1))
+
+    def test_same_seed_yields_same_data(self):
+        self.seed(seed=7)
+        first = list(Event.objects.order_by('id').values_list('title', 'location', 'capacity', 'attendees_count'))
+        Event.objects.all().delete()
+        self.seed(seed=7)
+        second = list(Event.objects.order_by('id').values_list('title', 'location', 'capacity', 'attendees_count'))
+        self.assertEqual([row[1:] for row in first], [row[1:] for row in second])
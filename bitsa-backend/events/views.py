@@ -1,11 +1,19 @@
 from django.shortcuts import render
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db import models
+from datetime import datetime, time
+from django.db.models import Max, Q
 from django.utils import timezone
-from .models import Event
-from .serializers import EventSerializer
+from django.utils.dateparse import parse_date, parse_datetime
+from bitsa_project.cache import CachedResponseMixin
+from bitsa_project.conditional import ConditionalGetMixin
+from bitsa_project.fastpath import FastListMixin
+from bitsa_project.search import search_queryset
+from .export import EXPORT_FORMATS, attendee_export_response
+from .models import EVENT_STATUSES, Event, status_condition, with_status
+from .serializers import AttendeeBulkSerializer, EventSerializer
 
 class IsOrganizerOrAdmin(permissions.BasePermission):
     """
@@ -17,36 +25,99 @@ class IsOrganizerOrAdmin(permissions.BasePermission):
             return True
         return obj.organizer == request.user or request.user.is_staff
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ConditionalGetMixin, CachedResponseMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    ordering = '-start_time'
+    cache_models = ('events.event', 'auth.user')
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [permissions.AllowAny()]
+        if self.action == 'rsvp':
+            # any authenticated user may RSVP, not only the organizer
+            return [permissions.IsAuthenticated()]
         return [permissions.IsAuthenticated(), IsOrganizerOrAdmin()]
 
+    def get_ordering(self):
+        # ranked search results are ordered (and cursor-paginated) by relevance
+        if getattr(self, 'search_ranked', False):
+            return '-search_rank'
+        return self.ordering
+
+    def get_validator_aggregates(self):
+        # `status` moves from upcoming to ongoing to completed without a write; the
+        # latest start/end already passed changes exactly when some event's status does
+        now = timezone.now()
+        return {
+            'last_started': Max('start_time', filter=Q(start_time__lte=now)),
+            'last_ended': Max('end_time', filter=Q(end_time__lt=now)),
+        }
+
     def get_queryset(self):
-        qs = Event.objects.all()
+        # organizer_name/organizer_email come from the joined user row; attendees_count is a column
+        qs = Event.objects.select_related('organizer')
         # Visibility: all events for everyone (for viewing purposes)
 
+        # status is computed by the database, against one `now` for the whole request
+        now = timezone.now()
+        qs = with_status(qs, now)
+
         # Filters
-        organizer = self.request.query_params.get('organizer')
+        params = self.request.query_params
+        organizer = params.get('organizer')
         if organizer:
             qs = qs.filter(organizer__id=organizer)
-        search = self.request.query_params.get('search')
+        statuses = self.list_param('status')
+        if statuses:
+            unknown = [value for value in statuses if value not in EVENT_STATUSES]
+            if unknown:
+                raise ValidationError({'status': f"Must be one of: {', '.join(EVENT_STATUSES)}"})
+            condition = Q()
+            for value in statuses:
+                condition |= status_condition(value, now)
+            qs = qs.filter(condition)
+        start_after = self.datetime_param('start_after')
+        if start_after:
+            qs = qs.filter(start_time__gte=start_after)
+        start_before = self.datetime_param('start_before')
+        if start_before:
+            qs = qs.filter(start_time__lt=start_before)
+        categories = self.list_param('category')
+        if categories:
+            qs = qs.filter(category__in=categories)
+        search = params.get('search')
+        self.search_ranked = False
         if search:
-            qs = qs.filter(
-                models.Q(title__icontains=search) |
-                models.Q(description__icontains=search) |
-                models.Q(location__icontains=search)
-            )
-        upcoming = self.request.query_params.get('upcoming')
+            qs, self.search_ranked = search_queryset(qs, search)
+        upcoming = params.get('upcoming')
         if upcoming and upcoming.lower() in ['1', 'true', 'yes']:
-            qs = qs.filter(start_time__gte=timezone.now())
+            qs = qs.filter(start_time__gte=now)
 
+        if self.search_ranked:
+            return qs.order_by('-search_rank', '-start_time')
         return qs.order_by('-start_time')
 
+    def list_param(self, name):
+        """Comma-separated values of ``?name=``, e.g. ?status=upcoming,ongoing."""
+        return [value.strip() for value in self.request.query_params.get(name, '').split(',') if value.strip()]
+
+    def datetime_param(self, name):
+        """``?name=`` as an aware datetime; a bare date means its midnight in TIME_ZONE."""
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                day = parse_date(value)
+                parsed = day and datetime.combine(day, time.min)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Expected an ISO 8601 date or datetime.'})
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
     def perform_create(self, serializer):
         serializer.save(organizer=self.request.user)
 
@@ -57,17 +128,54 @@ class EventViewSet(viewsets.ModelViewSet):
         If capacity is set and full, return 400 when trying to join.
         """
         event = self.get_object()
-        user = request.user
-        if user in event.attendees.all():
-            event.attendees.remove(user)
+        if event.remove_attendee(request.user):
             return Response({'status': 'removed'}, status=status.HTTP_200_OK)
 
-        if event.capacity is not None and event.attendees_count >= event.capacity:
+        if event.add_attendee(request.user) == 'full':
             return Response({'error': 'Event is full'}, status=status.HTTP_400_BAD_REQUEST)
 
-        event.attendees.add(user)
         return Response({'status': 'added'}, status=status.HTTP_200_OK)
 
+    @action(detail=True, methods=['post'])
+    def attendees(self, request, pk=None):
+        """
+        Organizer/admin only: add and remove many attendees in one transaction.
+        Body: {"add": [user ids], "remove": [user ids]}. Capacity is enforced;
+        the response lists an outcome per user ID.
+        """
+        event = self.get_object()
+        serializer = AttendeeBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        outcomes = event.bulk_update_attendees(**serializer.validated_data)
+        return Response({
+            'attendees_count': event.attendees_count,
+            'results': [{'user': user_id, 'result': result} for user_id, result in outcomes.items()],
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='attendees-export')
+    def export_attendees(self, request):
+        """
+        Stream attendees of ``?ids=1,2,...`` as CSV or NDJSON (``?export_format=``).
+        Staff can export any event, organizers only their own.
+        """
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            ids = [int(pk) for pk in request.query_params.get('ids', '').split(',') if pk.strip()]
+        except ValueError:
+            return Response({'error': 'ids must be a comma-separated list of event IDs'}, status=status.HTTP_400_BAD_REQUEST)
+        if not ids:
+            return Response({'error': 'ids is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        events = Event.objects.filter(pk__in=ids)
+        if not request.user.is_staff:
+            events = events.filter(organizer=request.user)
+        return attendee_export_response(events.values('pk'), export_format)
+
     @action(detail=True, methods=['patch'])
     def publish(self, request, pk=None):
         """Admin-only: make an event public"""
@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class GalleryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'gallery'
+
+    def ready(self):
+        from bitsa_project.cache import invalidate_on_change
+        from bitsa_project.renditions import generate_on_save
+        from mediastore.references import track_references
+        invalidate_on_change(self.get_model('Photo'))
+        generate_on_save(self.get_model('Photo'))
+        track_references(self.get_model('Photo'))
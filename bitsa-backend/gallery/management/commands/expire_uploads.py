@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from gallery.uploads import expire_uploads
+
+
+class Command(BaseCommand):
+    help = "Discard chunked photo uploads that were never completed, along with their staged bytes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=float,
+            default=settings.GALLERY_UPLOAD_EXPIRY_HOURS,
+            help='Discard uploads untouched for this many hours (default: GALLERY_UPLOAD_EXPIRY_HOURS)'
+        )
+
+    def handle(self, *args, **options):
+        count = expire_uploads(timezone.now() - timedelta(hours=options['hours']))
+        self.stdout.write(self.style.SUCCESS(f"Discarded {count} unfinished uploads."))
@@ -0,0 +1,71 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from bitsa_project.renditions import mark_rendered
+from blogs.models import BlogPost
+from events.models import Event
+from gallery.models import Photo
+
+
+def _render(name, force):
+    # runs in a worker process; storage is the forked default_storage
+    from bitsa_project.renditions import generate_renditions
+    try:
+        return name, len(generate_renditions(name, force=force)), None
+    except Exception as exc:  # report and keep going with the rest of the media
+        return name, 0, f"{type(exc).__name__}: {exc}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate responsive image renditions for existing gallery, event and blog images, and record "
+        "them on the rows (run it after a RENDITION_VERSION change, or on media that predates renditions)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Number of worker processes (default: CPU count)'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Check every width and format for a missing file, not just the smallest JPEG'
+        )
+
+    def handle(self, *args, **options):
+        names = set()
+        for model in (Photo, Event, BlogPost):
+            names.update(model.objects.exclude(image='').exclude(image__isnull=True).values_list('image', flat=True))
+        names = sorted(names)
+        self.stdout.write(f"Rendering variants for {len(names)} image(s) with {options['workers']} worker(s)...")
+
+        workers = max(1, options['workers'])
+        if workers == 1:
+            results = (_render(name, options['force']) for name in names)
+        else:
+            # don't let forked workers inherit open database connections
+            connections.close_all()
+            pool = ProcessPoolExecutor(max_workers=workers)
+            futures = [pool.submit(_render, name, options['force']) for name in names]
+            results = (future.result() for future in as_completed(futures))
+
+        written = failed = marked = 0
+        for name, count, error in results:
+            if error:
+                failed += 1
+                self.stdout.write(self.style.WARNING(f"{name}: {error}"))
+            else:
+                written += count
+                marked += mark_rendered(name)
+        if workers > 1:
+            pool.shutdown()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Renditions complete: {written} file(s) written, {marked} row(s) updated, {failed} image(s) failed."
+        ))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0002_photo_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='photo',
+            index=models.Index(fields=['-uploaded_at', '-id'], name='photo_uploaded_id_idx'),
+        ),
+    ]
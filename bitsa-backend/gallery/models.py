@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
 
@@ -5,11 +7,54 @@ class Photo(models.Model):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True)
     image = models.ImageField(upload_to='gallery/')
+    # the RENDITION_VERSION whose renditions exist, maintained by bitsa_project.renditions
+    image_renditions = models.PositiveSmallIntegerField(default=0, editable=False)
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            # list order plus the keyset tiebreaker
+            models.Index(fields=['-uploaded_at', '-id'], name='photo_uploaded_id_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class PhotoUpload(models.Model):
+    """
+    A chunked upload in progress (see gallery/uploads.py). The bytes live in the
+    staging directory until ``complete`` moves them into storage and creates the Photo.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='photo_uploads')
+    # Photo fields, applied on completion
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    filename = models.CharField(max_length=255)
+    total_size = models.PositiveBigIntegerField(help_text="Declared size in bytes")
+    received = models.PositiveBigIntegerField(default=0, help_text="Bytes staged so far, the next chunk's offset")
+    # known once the image header has arrived
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    expected_sha256 = models.CharField(max_length=64, blank=True, help_text="Optional client-supplied checksum")
+    sha256 = models.CharField(max_length=64, blank=True)
+    photo = models.OneToOneField(Photo, null=True, blank=True, on_delete=models.CASCADE, related_name='upload')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # expire_uploads: unfinished uploads by age
+            models.Index(fields=['updated_at'], condition=models.Q(photo__isnull=True), name='photoupload_pending_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.filename} ({self.received}/{self.total_size})'
+
+    @property
+    def is_complete(self):
+        return self.photo_id is not None
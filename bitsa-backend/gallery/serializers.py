@@ -1,13 +1,24 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Photo
+from bitsa_project.fastpath import full_name, media_srcset, media_url
+from bitsa_project.renditions import rendition_srcset
+from bitsa_project.serializers import SparseFieldsetMixin
+from .models import Photo, PhotoUpload
 
-class PhotoSerializer(serializers.ModelSerializer):
+class PhotoSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_srcset = serializers.SerializerMethodField()
+    # the same values from .values() columns, for FastListMixin (see bitsa_project/fastpath.py)
+    fast_fields = {
+        'uploaded_by_name': full_name('uploaded_by'),
+        'image_url': media_url('image'),
+        'image_srcset': media_srcset('image'),
+    }
 
     class Meta:
         model = Photo
-        fields = ['id', 'title', 'description', 'image', 'image_url', 'uploaded_by', 'uploaded_by_name', 'uploaded_at']
+        fields = ['id', 'title', 'description', 'image', 'image_url', 'image_srcset', 'uploaded_by', 'uploaded_by_name', 'uploaded_at']
         read_only_fields = ['uploaded_by', 'uploaded_at']
 
     def get_image_url(self, obj):
@@ -18,3 +29,30 @@ class PhotoSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
+    def get_image_srcset(self, obj):
+        return rendition_srcset(obj.image, self.context.get('request'))
+
+
+class PhotoUploadSerializer(serializers.ModelSerializer):
+    """A chunked upload: created with the photo's fields and the file's size, then filled by PUTs."""
+    size = serializers.IntegerField(source='total_size', min_value=1)
+    sha256 = serializers.RegexField(
+        r'^[0-9a-fA-F]{64}$', source='expected_sha256', required=False, allow_blank=True, write_only=True
+    )
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PhotoUpload
+        fields = [
+            'id', 'title', 'description', 'filename', 'size', 'sha256', 'received', 'chunk_size',
+            'width', 'height', 'photo', 'created_at', 'updated_at',
+        ]
+        read_only_fields = ['id', 'received', 'width', 'height', 'photo', 'created_at', 'updated_at']
+
+    def get_chunk_size(self, obj):
+        return settings.GALLERY_UPLOAD_CHUNK_BYTES
+
+    def validate_size(self, value):
+        if value > settings.GALLERY_UPLOAD_MAX_BYTES:
+            raise serializers.ValidationError(f'Photos can be at most {settings.GALLERY_UPLOAD_MAX_BYTES} bytes.')
+        return value
@@ -1,3 +1,247 @@
-from django.test import TestCase
+import hashlib
+import os
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from PIL import Image
+from rest_framework.test import APIClient
+
+from bitsa_project.renditions import RENDITION_VERSION, has_renditions, rendition_name
+from bitsa_project.testing import FastListParityMixin, QueryBudgetMixin
+from tasks.models import Task
+from tasks.worker import run_pending
+from . import uploads
+from .models import Photo, PhotoUpload
+from .views import PhotoListCreateView
+
+
+class PhotoQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def test_list_does_not_grow_with_rows(self):
+        def make_photo(i):
+            uploader = User.objects.create_user(username=f'uploader{i}', password='pass')
+            photo = Photo.objects.create(title=f'P{i}', image=f'gallery/p{i}.jpg', uploaded_by=uploader)
+            if i % 2:
+                # image_srcset is built too, from the recorded renditions
+                Photo.objects.filter(pk=photo.pk).update(image_renditions=RENDITION_VERSION)
+
+        self.assertQueryBudget('/api/gallery/photos/', 2, make_photo)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(prefix='bitsa-media-'), IMAGE_RENDITION_WIDTHS=(32, 64))
+class PhotoRenditionTests(FastListParityMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='uploader', password='pass')
+
+    def _png(self, color=(255, 0, 0, 128)):
+        # storage is content-addressed: tests that need their own file use their own color
+        buffer = BytesIO()
+        Image.new('RGBA', (100, 50), color).save(buffer, 'PNG')
+        return SimpleUploadedFile('red.png', buffer.getvalue(), content_type='image/png')
+
+    def test_upload_queues_renditions_and_exposes_srcset(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        image = self._png((0, 0, 255, 128))
+        response = client.post('/api/gallery/photos/', {'title': 'Blue', 'image': image}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        # rendering is left to the task worker, the upload response doesn't wait for it
+        self.assertIsNone(response.json()['image_srcset'])
+        photo = Photo.objects.get()
+        self.assertEqual(Task.objects.get().idempotency_key, f'renditions:{photo.image.name}')
+
+        etag = client.get(f'/api/gallery/photos/{photo.pk}/')['ETag']
+        self.assertEqual(run_pending(), 1)
+        response = client.get(f'/api/gallery/photos/{photo.pk}/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)  # the task touched updated_at
+        srcset = response.json()['image_srcset']
+        self.assertEqual(set(srcset), {'webp', 'jpeg'})
+        self.assertTrue(srcset['webp']['32'].startswith('http://testserver/media/cas/'))
+        with Image.open(photo.image.storage.path(rendition_name(photo.image.name, 32, 'jpeg'))) as img:
+            self.assertEqual(img.size, (32, 16))
+
+    def test_backfill_command_renders_existing_images(self):
+        photo = Photo(title='Old', uploaded_by=self.user)
+        photo.image.save('old.png', self._png((0, 255, 0, 128)), save=False)
+        Photo.objects.bulk_create([photo])  # bulk_create skips post_save, like pre-existing media
+        self.assertFalse(has_renditions(photo.image.name))
+        call_command('generate_renditions', workers=1, stdout=StringIO())
+        self.assertTrue(has_renditions(photo.image.name))
+        self.assertEqual(Photo.objects.get().image_renditions, RENDITION_VERSION)
+
+    def test_lists_read_renditions_from_the_rows(self):
+        photo = Photo(title='Rendered', uploaded_by=self.user)
+        photo.image.save('a.png', self._png((9, 9, 9, 128)))
+        run_pending()
+        # the same content again: already rendered, so it is recorded without a task
+        copy = Photo(title='Copy', uploaded_by=self.user)
+        copy.image.save('b.png', self._png((9, 9, 9, 128)))
+        self.assertEqual(copy.image_renditions, RENDITION_VERSION)
+        self.assertEqual(Task.objects.count(), 1)
+
+        with mock.patch('django.core.files.storage.FileSystemStorage.exists', side_effect=AssertionError('stat')):
+            rows = self.assertFastListMatches(PhotoListCreateView, '/api/gallery/photos/').json()['results']
+            detail = self.client.get(f'/api/gallery/photos/{photo.pk}/').json()
+        self.assertEqual([bool(row['image_srcset']) for row in rows], [True, True])
+        self.assertEqual(detail['image_srcset'], rows[1]['image_srcset'])
+
+    def test_list_fast_path_matches_the_serializer(self):
+        photo = Photo(title='Old', description='d', uploaded_by=self.user)
+        photo.image.save('with space.png', self._png(), save=False)
+        Photo.objects.bulk_create([photo, Photo(title='Empty', image='', uploaded_by=self.user)])
+        call_command('generate_renditions', workers=1, stdout=StringIO())
+        # a name from before content-addressed storage, which needs quoting
+        Photo.objects.create(title='Legacy', image='gallery/with space.png', uploaded_by=self.user)
+        rows = self.assertFastListMatches(PhotoListCreateView, '/api/gallery/photos/').json()['results']
+        self.assertEqual(rows[0]['uploaded_by_name'], '')
+        self.assertEqual(rows[0]['image_url'], 'http://testserver/media/gallery/with%20space.png')
+        self.assertTrue(rows[-1]['image_url'].startswith('http://testserver/media/cas/'))
+        self.assertFastListMatches(PhotoListCreateView, '/api/gallery/photos/?fields=image,image_srcset&page_size=1')
+
+
+@override_settings(
+    MEDIA_ROOT=tempfile.mkdtemp(prefix='bitsa-media-'),
+    GALLERY_UPLOAD_STAGING_ROOT=tempfile.mkdtemp(prefix='bitsa-staging-'),
+    GALLERY_UPLOAD_CHUNK_BYTES=1024,
+    GALLERY_UPLOAD_MAX_BYTES=64 * 1024,
+    GALLERY_UPLOAD_MAX_DIMENSION=500,
+)
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='uploader', password='pass')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def _png(self, size=(100, 60)):
+        # noise, so the file spans several chunks
+        buffer = BytesIO()
+        Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3)).save(buffer, 'PNG')
+        return buffer.getvalue()
+
+    def _start(self, data, **extra):
+        response = self.client.post(
+            '/api/gallery/photos/uploads/', {'title': 'Noise', 'filename': 'noise.png', 'size': len(data), **extra}
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def _put(self, upload_id, data, start, chunk):
+        return self.client.put(
+            f'/api/gallery/photos/uploads/{upload_id}/', chunk, content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f'bytes {start}-{start + len(chunk) - 1}/{len(data)}',
+        )
+
+    def _staged(self, upload_id):
+        return [name for name in os.listdir(settings.GALLERY_UPLOAD_STAGING_ROOT) if name.startswith(upload_id)]
+
+    def _send(self, upload_id, data, offset=0):
+        response = None
+        while offset < len(data):
+            response = self._put(upload_id, data, offset, data[offset:offset + 1024])
+            if response.status_code != 200:
+                return response
+            offset = response.json()['received']
+        return response
+
+    def test_chunked_upload_creates_photo(self):
+        data = self._png()
+        upload = self._start(data, sha256=hashlib.sha256(data).hexdigest())
+        self.assertEqual(upload['chunk_size'], 1024)
+        response = self._send(upload['id'], data)
+        self.assertEqual(response.json()['received'], len(data))
+        self.assertEqual((response.json()['width'], response.json()['height']), (100, 60))
+
+        response = self.client.post(f'/api/gallery/photos/uploads/{upload["id"]}/complete/')
+        self.assertEqual(response.status_code, 201, response.content)
+        photo = Photo.objects.get()
+        self.assertEqual(response.json()['id'], photo.pk)
+        self.assertTrue(photo.image.name.startswith('cas/') and photo.image.name.endswith('.png'))
+        with photo.image.open('rb') as fh:
+            self.assertEqual(fh.read(), data)
+        self.assertEqual(PhotoUpload.objects.get().sha256, hashlib.sha256(data).hexdigest())
+        self.assertFalse(self._staged(upload['id']))
+        # renditions are queued through the usual post_save hook
+        self.assertEqual(Task.objects.get().idempotency_key, f'renditions:{photo.image.name}')
+
+        # retrying completion returns the same photo
+        again = self.client.post(f'/api/gallery/photos/uploads/{upload["id"]}/complete/')
+        self.assertEqual(again.json()['id'], photo.pk)
+        self.assertEqual(Photo.objects.count(), 1)
+
+    def test_resume_after_an_interrupted_chunk(self):
+        data = self._png()
+        upload = self._start(data)
+        self._put(upload['id'], data, 0, data[:1024])
+        # a replayed or skipped chunk is refused and told where to continue
+        for start in (0, 2048):
+            response = self._put(upload['id'], data, start, data[start:start + 1024])
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response.json()['received'], 1024)
+        # the hash is rebuilt from the staged bytes when this process has not seen the upload
+        uploads._forget(PhotoUpload.objects.get().pk)
+
+        self.assertEqual(self.client.get(f'/api/gallery/photos/uploads/{upload["id"]}/').json()['received'], 1024)
+        self._send(upload['id'], data, offset=1024)
+        self.assertEqual(self.client.post(f'/api/gallery/photos/uploads/{upload["id"]}/complete/').status_code, 201)
+        self.assertEqual(PhotoUpload.objects.get().sha256, hashlib.sha256(data).hexdigest())
+
+    def test_incomplete_upload_cannot_be_completed(self):
+        data = self._png()
+        upload = self._start(data)
+        self._put(upload['id'], data, 0, data[:1024])
+        response = self.client.post(f'/api/gallery/photos/uploads/{upload["id"]}/complete/')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['received'], 1024)
+
+    def test_declared_size_and_chunk_size_are_limited(self):
+        response = self.client.post(
+            '/api/gallery/photos/uploads/', {'title': 'Big', 'filename': 'big.png', 'size': 64 * 1024 + 1}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('size', response.json())
+
+        data = self._png()
+        upload = self._start(data)
+        response = self._put(upload['id'], data, 0, data[:2048])
+        self.assertEqual(response.status_code, 413)
+
+    def test_oversized_dimensions_rejected_after_first_chunk(self):
+        data = self._png((600, 10))
+        upload = self._start(data)
+        response = self._put(upload['id'], data, 0, data[:1024])
+        self.assertEqual(response.status_code, 422)
+        self.assertIn('600x10', response.json()['error'])
+        self.assertFalse(PhotoUpload.objects.exists())
+        self.assertFalse(self._staged(upload['id']))
+
+    def test_non_image_rejected(self):
+        data = os.urandom(3000)
+        upload = self._start(data)
+        response = self._send(upload['id'], data)
+        self.assertEqual(response.status_code, 415)
+        self.assertFalse(PhotoUpload.objects.exists())
+
+    def test_checksum_mismatch_rejected(self):
+        data = self._png()
+        upload = self._start(data, sha256='0' * 64)
+        self._send(upload['id'], data)
+        response = self.client.post(f'/api/gallery/photos/uploads/{upload["id"]}/complete/')
+        self.assertEqual(response.status_code, 422)
+        self.assertFalse(Photo.objects.exists())
+
+    def test_uploads_are_private_and_expire(self):
+        data = self._png()
+        upload = self._start(data)
+        self._put(upload['id'], data, 0, data[:1024])
+        other = APIClient()
+        other.force_authenticate(User.objects.create_user(username='other', password='pass'))
+        self.assertEqual(other.get(f'/api/gallery/photos/uploads/{upload["id"]}/').status_code, 404)
+
+        call_command('expire_uploads', hours=0, stdout=StringIO())
+        self.assertFalse(PhotoUpload.objects.exists())
+        self.assertFalse(self._staged(upload['id']))
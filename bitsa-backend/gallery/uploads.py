@@ -0,0 +1,297 @@
+"""
+Chunked, resumable photo uploads.
+
+A multipart POST buffers the whole image before anything is validated, and a
+slow client holds a worker for the entire transfer. Here the client creates a
+PhotoUpload (declaring the size up front), then PUTs the bytes in chunks of at
+most GALLERY_UPLOAD_CHUNK_BYTES with a ``Content-Range: bytes start-end/total``
+header, and finally asks for completion:
+
+* each chunk is streamed from the socket to a part file, then copied into the
+  staged file at its offset while the row's ``received`` counter is advanced by a
+  conditional UPDATE, so concurrent or replayed chunks can never interleave;
+* a dropped connection keeps the bytes that did arrive: the client reads
+  ``received`` back (GET) and continues from there;
+* the SHA-256 is carried forward chunk by chunk in this process, and rebuilt
+  from the staged bytes only when a chunk lands on another worker;
+* the image header is inspected as soon as it has arrived, so an oversized or
+  non-image file is rejected after its first chunk, not after the last;
+* completion moves the staged file into storage (a rename on FileSystemStorage,
+  or nothing at all when the content is already stored) and creates the Photo;
+  it is idempotent.
+"""
+import hashlib
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import get_valid_filename
+from PIL import Image
+from rest_framework import status
+
+from bitsa_project.database import use_primary
+from .models import Photo, PhotoUpload
+
+READ_SIZE = 64 * 1024
+# a file whose first bytes (up to this many) do not parse as an image header never will
+HEADER_PROBE_BYTES = 1024 * 1024
+EXTENSIONS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp', 'GIF': 'gif'}
+# hashers of recently written uploads, keyed by id: (offset, sha256 object)
+HASHER_CACHE_SIZE = 256
+
+
+class UploadRejected(Exception):
+    def __init__(self, message, status_code=status.HTTP_400_BAD_REQUEST, **extra):
+        super().__init__(message)
+        self.status_code = status_code
+        self.extra = extra
+
+
+class StagedFile(File):
+    """A staged upload handed to storage.save(); FileSystemStorage moves it instead of copying."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+_hashers = OrderedDict()
+_hashers_lock = threading.Lock()
+
+
+def staging_path(upload):
+    return Path(settings.GALLERY_UPLOAD_STAGING_ROOT) / str(upload.pk)
+
+
+def hasher_at(upload):
+    """A sha256 object fed with the first ``upload.received`` staged bytes."""
+    with _hashers_lock:
+        cached = _hashers.get(upload.pk)
+    if cached is not None and cached[0] == upload.received:
+        return cached[1].copy()
+
+    hasher = hashlib.sha256()
+    remaining = upload.received
+    if remaining:
+        with open(staging_path(upload), 'rb') as fh:
+            while remaining:
+                block = fh.read(min(READ_SIZE * 16, remaining))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+    _remember(upload.pk, upload.received, hasher)
+    return hasher.copy()
+
+
+def _remember(upload_id, offset, hasher):
+    with _hashers_lock:
+        _hashers[upload_id] = (offset, hasher)
+        _hashers.move_to_end(upload_id)
+        while len(_hashers) > HASHER_CACHE_SIZE:
+            _hashers.popitem(last=False)
+
+
+def _forget(upload_id):
+    with _hashers_lock:
+        _hashers.pop(upload_id, None)
+
+
+def parse_content_range(header, total_size):
+    """``(start, length)`` from ``bytes start-end/total``; ``end`` is inclusive as in HTTP."""
+    try:
+        unit, _, spec = header.partition(' ')
+        span, _, total = spec.partition('/')
+        start, _, end = span.partition('-')
+        start, end = int(start), int(end)
+        if unit != 'bytes' or start < 0 or end < start or (total != '*' and int(total) != total_size):
+            raise ValueError
+    except ValueError:
+        raise UploadRejected('Content-Range must be "bytes <start>-<end>/<total size>".')
+    return start, end - start + 1
+
+
+def write_chunk(upload, stream, start, length):
+    """
+    Stage ``length`` bytes read from ``stream`` at offset ``start``; returns the
+    new ``received``. Fewer bytes are kept if the client disconnects mid-chunk.
+    """
+    if upload.is_complete:
+        raise UploadRejected('Upload is already complete.', status.HTTP_409_CONFLICT, received=upload.received)
+    if start != upload.received:
+        raise UploadRejected(
+            f'Expected a chunk at offset {upload.received}.', status.HTTP_409_CONFLICT, received=upload.received
+        )
+    if length > settings.GALLERY_UPLOAD_CHUNK_BYTES:
+        raise UploadRejected(
+            f'Chunks can be at most {settings.GALLERY_UPLOAD_CHUNK_BYTES} bytes.',
+            status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        )
+    if start + length > upload.total_size:
+        raise UploadRejected('Chunk extends past the declared size.', status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    path = staging_path(upload)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part = path.with_name(f'{path.name}.{uuid.uuid4().hex}.part')
+    hasher = hasher_at(upload)
+    count = 0
+    try:
+        with open(part, 'wb') as fh:
+            while count < length:
+                try:
+                    block = stream.read(min(READ_SIZE, length - count))
+                except OSError:
+                    # client went away; keep what arrived so it can resume from there
+                    break
+                if not block:
+                    break
+                fh.write(block)
+                hasher.update(block)
+                count += len(block)
+        if not count:
+            raise UploadRejected('Empty chunk.')
+
+        with transaction.atomic():
+            # the UPDATE holds the row (the database on SQLite) until commit, so exactly
+            # one writer copies its bytes into each range
+            claimed = PhotoUpload.objects.filter(pk=upload.pk, received=start, photo__isnull=True).update(
+                received=start + count, updated_at=timezone.now()
+            )
+            if not claimed:
+                current = PhotoUpload.objects.filter(pk=upload.pk).values_list('received', flat=True).first()
+                raise UploadRejected(
+                    'Another chunk was written at this offset.', status.HTTP_409_CONFLICT, received=current
+                )
+            with open(path, 'r+b' if path.exists() else 'wb') as target, open(part, 'rb') as source:
+                target.seek(start)
+                while True:
+                    block = source.read(READ_SIZE * 16)
+                    if not block:
+                        break
+                    target.write(block)
+                # drop bytes left past the offset by an earlier, rolled back copy
+                target.truncate(start + count)
+    finally:
+        part.unlink(missing_ok=True)
+
+    upload.received = start + count
+    _remember(upload.pk, upload.received, hasher)
+    if upload.width is None:
+        check_header(upload)
+    return upload.received
+
+
+def check_header(upload, final=False):
+    """
+    Read the image header from the staged bytes and enforce the format and
+    dimension limits. Until the header has arrived this is a no-op, unless
+    ``final`` or enough bytes are staged that it should have. Returns the PIL
+    format name once known; rejected uploads are discarded.
+    """
+    try:
+        with Image.open(staging_path(upload)) as image:
+            image_format, (width, height) = image.format, image.size
+    except Image.DecompressionBombError:
+        discard(upload)
+        raise UploadRejected('Image dimensions are too large.', status.HTTP_422_UNPROCESSABLE_ENTITY)
+    except (OSError, SyntaxError, ValueError):
+        if final or upload.received >= min(upload.total_size, HEADER_PROBE_BYTES):
+            discard(upload)
+            raise UploadRejected('Not a supported image file.', status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+        return None
+
+    if image_format not in settings.GALLERY_UPLOAD_FORMATS:
+        discard(upload)
+        raise UploadRejected(
+            f"Image format must be one of: {', '.join(settings.GALLERY_UPLOAD_FORMATS)}.",
+            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+    limit = settings.GALLERY_UPLOAD_MAX_DIMENSION
+    if width > limit or height > limit or width * height > settings.GALLERY_UPLOAD_MAX_PIXELS:
+        discard(upload)
+        raise UploadRejected(
+            f'Image is {width}x{height}; the limit is {limit}px per side and '
+            f'{settings.GALLERY_UPLOAD_MAX_PIXELS} pixels.',
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    if upload.width is None:
+        upload.width, upload.height = width, height
+        PhotoUpload.objects.filter(pk=upload.pk).update(width=width, height=height)
+    return image_format
+
+
+def complete(upload):
+    """Move the staged file into storage and create the Photo; returns it (the same one on retries)."""
+    with use_primary():
+        # a retry returns the Photo the first call just created, which replicas may not have yet
+        upload.refresh_from_db()
+        if upload.is_complete:
+            return upload.photo
+    if upload.received != upload.total_size:
+        raise UploadRejected(
+            f'Received {upload.received} of {upload.total_size} bytes.',
+            status.HTTP_409_CONFLICT, received=upload.received,
+        )
+
+    # rejections discard the upload, so they are settled before the transaction
+    image_format = check_header(upload, final=True)
+    path = staging_path(upload)
+    try:
+        # walks the whole file (PNG chunk CRCs etc.) without decoding the pixels
+        with Image.open(path) as image:
+            image.verify()
+    except Exception:
+        discard(upload)
+        raise UploadRejected('The image file is corrupt.', status.HTTP_422_UNPROCESSABLE_ENTITY)
+    digest = hasher_at(upload).hexdigest()
+    if upload.expected_sha256 and digest != upload.expected_sha256.lower():
+        discard(upload)
+        raise UploadRejected('SHA-256 does not match the uploaded bytes.', status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    with transaction.atomic():
+        locked = PhotoUpload.objects.select_for_update().get(pk=upload.pk)
+        if locked.is_complete:
+            # a concurrent completion got here first
+            return locked.photo
+        stem = os.path.splitext(get_valid_filename(upload.filename) or 'photo')[0] or 'photo'
+        with StagedFile(open(path, 'rb'), name=f'{stem}.{EXTENSIONS[image_format]}') as staged:
+            # content-addressed storage takes the digest instead of reading the file again
+            staged.sha256 = digest
+            name = default_storage.save(f'gallery/{staged.name}', staged)
+        # left behind when the content was already stored
+        path.unlink(missing_ok=True)
+        photo = Photo.objects.create(
+            title=upload.title, description=upload.description, image=name, uploaded_by=upload.uploaded_by
+        )
+        locked.photo = photo
+        locked.sha256 = digest
+        locked.save(update_fields=['photo', 'sha256', 'updated_at'])
+    _forget(upload.pk)
+    return photo
+
+
+def discard(upload):
+    """Delete an unfinished upload and its staged bytes."""
+    _forget(upload.pk)
+    path = staging_path(upload)
+    path.unlink(missing_ok=True)
+    for part in path.parent.glob(f'{path.name}.*.part'):
+        part.unlink(missing_ok=True)
+    PhotoUpload.objects.filter(pk=upload.pk, photo__isnull=True).delete()
+
+
+def expire_uploads(older_than=None):
+    """Discard unfinished uploads untouched for GALLERY_UPLOAD_EXPIRY_HOURS; returns how many."""
+    if older_than is None:
+        older_than = timezone.now() - timedelta(hours=settings.GALLERY_UPLOAD_EXPIRY_HOURS)
+    stale = list(PhotoUpload.objects.filter(photo__isnull=True, updated_at__lt=older_than))
+    for upload in stale:
+        discard(upload)
+    return len(stale)
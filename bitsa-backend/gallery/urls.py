@@ -4,4 +4,7 @@ from . import views
 urlpatterns = [
     path('photos/', views.PhotoListCreateView.as_view(), name='photo-list-create'),
     path('photos/<int:pk>/', views.PhotoDetailView.as_view(), name='photo-detail'),
+    path('photos/uploads/', views.PhotoUploadCreateView.as_view(), name='photo-upload-create'),
+    path('photos/uploads/<uuid:pk>/', views.PhotoUploadDetailView.as_view(), name='photo-upload-detail'),
+    path('photos/uploads/<uuid:pk>/complete/', views.PhotoUploadCompleteView.as_view(), name='photo-upload-complete'),
 ]
@@ -1,15 +1,23 @@
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.contrib.auth.models import User
-from .models import Photo
-from .serializers import PhotoSerializer
+from bitsa_project.cache import CachedResponseMixin
+from bitsa_project.conditional import ConditionalGetMixin
+from bitsa_project.fastpath import FastListMixin
+from . import uploads
+from .models import Photo, PhotoUpload
+from .serializers import PhotoSerializer, PhotoUploadSerializer
 
-class PhotoListCreateView(generics.ListCreateAPIView):
-    queryset = Photo.objects.all()
+class PhotoListCreateView(ConditionalGetMixin, CachedResponseMixin, FastListMixin, generics.ListCreateAPIView):
+    # uploaded_by_name is read from the joined user row
+    queryset = Photo.objects.select_related('uploaded_by')
     serializer_class = PhotoSerializer
     permission_classes = [AllowAny]  # Allow anyone to view photos
+    ordering = '-uploaded_at'
+    cache_models = ('gallery.photo', 'auth.user')
     parser_classes = [MultiPartParser, FormParser]
 
     def get_permissions(self):
@@ -20,10 +28,11 @@ class PhotoListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(uploaded_by=self.request.user)
 
-class PhotoDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Photo.objects.all()
+class PhotoDetailView(ConditionalGetMixin, CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Photo.objects.select_related('uploaded_by')
     serializer_class = PhotoSerializer
     permission_classes = [AllowAny]
+    cache_models = ('gallery.photo', 'auth.user')
 
     def get_permissions(self):
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
@@ -42,3 +51,60 @@ class PhotoDetailView(generics.RetrieveUpdateDestroyAPIView):
         if not request.user.is_staff and instance.uploaded_by != request.user:
             return Response({'error': 'You can only delete your own photos'}, status=status.HTTP_403_FORBIDDEN)
         return super().destroy(request, *args, **kwargs)
+
+def upload_rejected(exc):
+    return Response({'error': str(exc), **exc.extra}, status=exc.status_code)
+
+class PhotoUploadCreateView(generics.CreateAPIView):
+    """Start a chunked upload (see gallery/uploads.py); the size is declared and checked up front."""
+    serializer_class = PhotoUploadSerializer
+    permission_classes = [IsAuthenticated]
+
+    def perform_create(self, serializer):
+        serializer.save(uploaded_by=self.request.user)
+
+class PhotoUploadDetailView(APIView):
+    """
+    GET: progress, to resume from ``received`` after a dropped connection.
+    PUT: one chunk as the raw request body, with ``Content-Range: bytes start-end/total``.
+    DELETE: abandon the upload.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        return generics.get_object_or_404(PhotoUpload, pk=self.kwargs['pk'], uploaded_by=self.request.user)
+
+    def get(self, request, pk):
+        return Response(PhotoUploadSerializer(self.get_object()).data)
+
+    def put(self, request, pk):
+        upload = self.get_object()
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+            start, declared = uploads.parse_content_range(request.META.get('HTTP_CONTENT_RANGE', ''), upload.total_size)
+            if declared != length:
+                raise uploads.UploadRejected('Content-Range and Content-Length disagree.')
+            # the body is read straight off the socket; request.data would buffer it first
+            uploads.write_chunk(upload, request.stream, start, length)
+        except uploads.UploadRejected as exc:
+            return upload_rejected(exc)
+        return Response(PhotoUploadSerializer(upload).data)
+
+    def delete(self, request, pk):
+        upload = self.get_object()
+        if upload.is_complete:
+            return Response({'error': 'Upload is already complete'}, status=status.HTTP_409_CONFLICT)
+        uploads.discard(upload)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class PhotoUploadCompleteView(APIView):
+    """Create the Photo from a fully received upload. Safe to retry."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        upload = generics.get_object_or_404(PhotoUpload, pk=pk, uploaded_by=request.user)
+        try:
+            photo = uploads.complete(upload)
+        except uploads.UploadRejected as exc:
+            return upload_rejected(exc)
+        return Response(PhotoSerializer(photo, context={'request': request}).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import MediaBlob
+
+
+@admin.register(MediaBlob)
+class MediaBlobAdmin(admin.ModelAdmin):
+    list_display = ('name', 'size', 'references', 'created_at', 'updated_at')
+    list_filter = ('references',)
+    search_fields = ('digest', 'name')
+    readonly_fields = ('digest', 'name', 'size', 'references', 'created_at', 'updated_at')
+    ordering = ('-created_at',)
+    list_per_page = 50
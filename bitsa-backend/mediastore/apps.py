@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class MediastoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'mediastore'
+    verbose_name = 'Media store'
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from pathlib import Path
+import glob
+import os
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from bitsa_project.cache import bump_generation
+from bitsa_project.renditions import RENDITION_SUFFIX, RENDITION_VERSION, has_renditions, rendition_flag
+from mediastore.models import MediaBlob
+from mediastore.references import TRACKED, prune, recount
+from mediastore.storage import ContentAddressedStorage, file_digest, is_blob_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Move media stored under upload names into content-addressed storage: every file is hashed, "
+        "copied to cas/ once per distinct content, and the rows and renditions pointing at it follow. "
+        "Blob reference counts are then recomputed, and --prune deletes blobs nothing references."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Hash and report without changing anything')
+        parser.add_argument('--prune', action='store_true', help='Delete unreferenced blobs and their renditions')
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=1,
+            help='Only prune blobs unreferenced for this many hours, so in-flight uploads survive (default: 1)'
+        )
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        if not isinstance(storage, ContentAddressedStorage):
+            raise CommandError('The default storage is not mediastore.storage.ContentAddressedStorage.')
+        dry_run = options['dry_run']
+        root = Path(storage.location)
+
+        files = sorted(
+            path for path in root.rglob('*')
+            if path.is_file() and not path.name.startswith('.')
+            and not is_blob_name(path.relative_to(root).as_posix())
+            and not RENDITION_SUFFIX.search(path.name)
+        )
+        seen = dict(MediaBlob.objects.values_list('digest', 'name'))
+        moved = duplicates = reclaimed = rows = 0
+        touched = set()
+        for path in files:
+            name = path.relative_to(root).as_posix()
+            with File(open(path, 'rb'), name) as content:
+                digest = file_digest(content)
+                if digest in seen:
+                    duplicates += 1
+                    reclaimed += content.size
+                moved += 1
+                if dry_run:
+                    seen.setdefault(digest, name)
+                    continue
+                blob = storage.save_blob(digest, path.suffix.lower(), content)
+            seen[digest] = blob
+
+            # the copy and its renditions are in place: point the rows at them, then drop the old file
+            self.move_renditions(storage, path, blob)
+            rendered = RENDITION_VERSION if has_renditions(blob, storage) else 0
+            with transaction.atomic():
+                for model, field in TRACKED:
+                    names = {f.name for f in model._meta.fields}
+                    changes = {field: blob}
+                    if 'updated_at' in names:
+                        changes['updated_at'] = timezone.now()
+                    if rendition_flag(field) in names:
+                        changes[rendition_flag(field)] = rendered
+                    updated = model._base_manager.filter(**{field: name}).update(**changes)
+                    if updated:
+                        rows += updated
+                        touched.add(model._meta.label_lower)
+            storage.delete(name)
+
+        if dry_run:
+            self.stdout.write(
+                f"Would move {moved} files into cas/ ({duplicates} duplicates, {reclaimed} bytes reclaimed)."
+            )
+        else:
+            if touched:
+                bump_generation(*sorted(touched))
+            self.stdout.write(self.style.SUCCESS(
+                f"Moved {moved} files into cas/ ({duplicates} duplicates, {reclaimed} bytes reclaimed); "
+                f"{rows} rows updated, {recount()} reference counts corrected."
+            ))
+
+        if options['prune']:
+            pruned = prune(timezone.now() - timedelta(hours=options['grace_hours']), storage, dry_run=dry_run)
+            verb = 'Would prune' if dry_run else 'Pruned'
+            self.stdout.write(f"{verb} {len(pruned)} unreferenced blobs ({sum(b.size for b in pruned)} bytes).")
+
+    def move_renditions(self, storage, path, blob):
+        """Rename the renditions next to ``path`` to the blob's stem; drop those it already has."""
+        blob_stem = os.path.splitext(storage.path(blob))[0]
+        for rendition in path.parent.glob(f'{glob.escape(path.stem)}.*w.*'):
+            match = RENDITION_SUFFIX.fullmatch(rendition.name[len(path.stem):])
+            if not match:
+                continue
+            # unversioned names predate RENDITION_VERSION, so they were written as version 1
+            target = f"{blob_stem}.{match['width']}w.v{match['version'] or 1}.{match['ext']}"
+            if os.path.exists(target):
+                rendition.unlink()
+            else:
+                os.replace(rendition, target)
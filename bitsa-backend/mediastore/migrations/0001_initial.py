@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('digest', models.CharField(help_text='SHA-256 of the content, hex', max_length=64, primary_key=True, serialize=False)),
+                ('name', models.CharField(help_text='Storage name, under cas/', max_length=255, unique=True)),
+                ('size', models.PositiveBigIntegerField()),
+                ('references', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(condition=models.Q(('references', 0)), fields=['updated_at'], name='mediablob_unreferenced_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import models
+
+
+class MediaBlob(models.Model):
+    """
+    One stored file in ContentAddressedStorage. ``references`` counts the model rows
+    whose file field holds ``name`` (see mediastore.references); a blob nobody
+    references is deleted by ``dedupe_media --prune``.
+    """
+    digest = models.CharField(max_length=64, primary_key=True, help_text="SHA-256 of the content, hex")
+    name = models.CharField(max_length=255, unique=True, help_text="Storage name, under cas/")
+    size = models.PositiveBigIntegerField()
+    references = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # the prune query: unreferenced blobs past the grace period
+            models.Index(
+                fields=['updated_at'], condition=models.Q(references=0), name='mediablob_unreferenced_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
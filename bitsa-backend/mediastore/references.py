@@ -0,0 +1,94 @@
+"""
+Reference counts for MediaBlob.
+
+``track_references(Model)`` keeps ``MediaBlob.references`` in step with saves and
+deletes of a model's file field. Queryset ``update()`` and ``bulk_create()`` skip
+those signals (the seeder, ``dedupe_media``), so they finish with ``recount()``,
+which recomputes every count from the tracked tables. ``prune()`` deletes the
+blobs that stayed unreferenced for a grace period, with their renditions.
+"""
+from collections import Counter
+
+from django.core.files.storage import default_storage
+from django.db.models import Count, F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from bitsa_project.renditions import stored_renditions
+from .models import MediaBlob
+from .storage import PREFIX, is_blob_name
+
+# (model, field name) pairs registered by track_references()
+TRACKED = []
+
+
+def adjust(name, delta):
+    if not is_blob_name(name):
+        return
+    blobs = MediaBlob.objects.filter(name=name)
+    if delta < 0:
+        blobs = blobs.filter(references__gte=-delta)
+    blobs.update(references=F('references') + delta, updated_at=timezone.now())
+
+
+def track_references(model, field='image'):
+    """Connect receivers that count ``model.<field>`` values as references to their blobs."""
+    TRACKED.append((model, field))
+    uid = f'mediastore:{model._meta.label_lower}.{field}'
+
+    def remember_stored_name(sender, instance, update_fields=None, **kwargs):
+        if instance.pk is None or (update_fields is not None and field not in update_fields):
+            return
+        stored = sender._base_manager.filter(pk=instance.pk).values_list(field, flat=True).first()
+        instance.__dict__[uid] = stored or ''
+
+    def count_change(sender, instance, created, update_fields=None, **kwargs):
+        if update_fields is not None and field not in update_fields:
+            return
+        previous = '' if created else instance.__dict__.pop(uid, '')
+        current = getattr(instance, field).name or ''
+        if current != previous:
+            adjust(current, 1)
+            adjust(previous, -1)
+
+    def count_delete(sender, instance, **kwargs):
+        adjust(getattr(instance, field).name or '', -1)
+
+    pre_save.connect(remember_stored_name, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(count_change, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(count_delete, sender=model, weak=False, dispatch_uid=uid)
+
+
+def recount():
+    """Recompute every blob's reference count; returns how many counts changed."""
+    counts = Counter()
+    for model, field in TRACKED:
+        rows = (
+            model._base_manager.filter(**{f'{field}__startswith': PREFIX})
+            .values_list(field).annotate(total=Count('pk')).order_by()
+        )
+        for name, total in rows:
+            counts[name] += total
+
+    changed = []
+    for blob in MediaBlob.objects.only('digest', 'name', 'references').iterator():
+        if blob.references != counts[blob.name]:
+            blob.references = counts[blob.name]
+            changed.append(blob)
+    MediaBlob.objects.bulk_update(changed, ['references'], batch_size=500)
+    return len(changed)
+
+
+def prune(older_than, storage=None, dry_run=False):
+    """Delete blobs unreferenced since before ``older_than``, with their renditions; returns them."""
+    storage = storage or default_storage
+    blobs = list(MediaBlob.objects.filter(references=0, updated_at__lt=older_than))
+    if dry_run:
+        return blobs
+    for blob in blobs:
+        # re-checked per row: a save may have picked the blob up since the query
+        if not MediaBlob.objects.filter(pk=blob.pk, references=0, updated_at__lt=older_than).delete()[0]:
+            continue
+        for name in [blob.name] + stored_renditions(blob.name, storage):
+            storage.delete(name)
+    return blobs
@@ -0,0 +1,93 @@
+"""
+Content-addressed file storage.
+
+Files are stored under the SHA-256 of their bytes, ``cas/ab/cd/abcd....jpg``,
+whatever name the caller (an ``upload_to``) asked for. The same image uploaded
+twice is stored once, and since a name can never be reused for other content,
+``/media/cas/`` URLs are served with a far-future immutable Cache-Control (see
+mediastore.views).
+
+Names already under ``cas/`` are derived from a blob (the renditions in
+bitsa_project/renditions.py, ``<digest>.320w.v1.webp``) and are stored as given;
+their content follows from the blob's, so they are shared along with it.
+Every blob has a MediaBlob row: it maps a digest to its stored name, so equal
+bytes under another extension still land on the same file, and it carries the
+reference count used for pruning.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.utils import timezone
+
+PREFIX = 'cas/'
+
+
+def is_blob_name(name):
+    return bool(name) and name.replace('\\', '/').startswith(PREFIX)
+
+
+def blob_name(digest, ext):
+    return f'{PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+
+def file_digest(content):
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if is_blob_name(name):
+            return super().save(name, content, max_length=max_length)
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        # callers that hashed the bytes already (chunked uploads) pass the digest along
+        digest = getattr(content, 'sha256', None) or file_digest(content)
+        return self.save_blob(digest, os.path.splitext(name)[1].lower(), content)
+
+    def save_blob(self, digest, ext, content):
+        """Store ``content`` as the blob for ``digest`` unless it exists; returns the blob's name."""
+        from .models import MediaBlob
+
+        blob = MediaBlob.objects.filter(digest=digest).first()
+        if blob is not None and self.exists(blob.name):
+            # keep it out of the next prune: a row is about to reference it
+            MediaBlob.objects.filter(pk=digest).update(updated_at=timezone.now())
+            return blob.name
+
+        name = blob.name if blob is not None else blob_name(digest, ext)
+        if not self.exists(name):
+            self._write_blob(name, content)
+        if blob is None:
+            MediaBlob.objects.get_or_create(digest=digest, defaults={'name': name, 'size': self.size(name)})
+        return name
+
+    def _write_blob(self, name, content):
+        # concurrent writers of one blob write the same bytes: each writes a temporary
+        # file and renames it into place, so readers never see a partial file
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        if hasattr(content, 'temporary_file_path'):
+            file_move_safe(content.temporary_file_path(), full_path, allow_overwrite=True)
+        else:
+            fd, temporary = tempfile.mkstemp(dir=directory, prefix='.incoming-')
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    for chunk in content.chunks():
+                        fh.write(chunk)
+                os.replace(temporary, full_path)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.unlink(temporary)
+                raise
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
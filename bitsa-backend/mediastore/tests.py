@@ -0,0 +1,189 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from PIL import Image
+
+from bitsa_project.renditions import generate_renditions, has_renditions, rendition_name
+from events.models import Event
+from gallery.models import Photo
+from tasks.models import Task
+from tasks.worker import run_pending
+from .models import MediaBlob
+from .references import recount
+from .views import IMMUTABLE_CACHE_CONTROL, serve_blob
+
+
+def png(color):
+    buffer = BytesIO()
+    Image.new('RGB', (40, 20), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class MediaStoreTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp(prefix='bitsa-cas-')
+        self.enterContext(self.settings(MEDIA_ROOT=self.media_root, IMAGE_RENDITION_WIDTHS=(16,)))
+        self.user = User.objects.create_user(username='uploader', password='pass')
+
+    def references(self, name):
+        return MediaBlob.objects.get(name=name).references
+
+
+class ContentAddressedStorageTests(MediaStoreTestCase):
+    def test_equal_content_is_stored_once(self):
+        first = default_storage.save('gallery/a.png', ContentFile(png((1, 2, 3))))
+        second = default_storage.save('events/b.PNG', ContentFile(png((1, 2, 3))))
+        other = default_storage.save('gallery/a.png', ContentFile(png((3, 2, 1))))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertRegex(first, r'^cas/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertEqual(MediaBlob.objects.count(), 2)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(default_storage.path(first)))), [os.path.basename(first)])
+
+    def test_references_follow_saves_and_deletes(self):
+        photo = Photo(title='A', uploaded_by=self.user)
+        photo.image.save('a.png', ContentFile(png((10, 10, 10))))
+        name = photo.image.name
+        copy = Photo(title='B', uploaded_by=self.user)
+        copy.image.save('b.png', ContentFile(png((10, 10, 10))))
+        self.assertEqual(copy.image.name, name)
+        self.assertEqual(self.references(name), 2)
+
+        photo.title = 'A2'
+        photo.save()  # the image is unchanged
+        self.assertEqual(self.references(name), 2)
+        copy.image.save('c.png', ContentFile(png((20, 20, 20))))
+        self.assertEqual(self.references(name), 1)
+        self.assertEqual(self.references(copy.image.name), 1)
+        photo.delete()
+        self.assertEqual(self.references(name), 0)
+
+        # rows written without signals are picked up by a recount
+        Event.objects.bulk_create([
+            Event(title='E', description='d', organizer=self.user, location='Hall',
+                  start_time=timezone.now(), image=name),
+        ])
+        self.assertEqual(recount(), 1)
+        self.assertEqual(self.references(name), 1)
+
+    def test_blobs_are_served_immutable(self):
+        name = default_storage.save('gallery/a.png', ContentFile(png((5, 5, 5))))
+        url = default_storage.url(name)
+        response = serve_blob(RequestFactory().get(url), name)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(b''.join(response.streaming_content), png((5, 5, 5)))
+        with self.assertRaises(Http404):
+            serve_blob(RequestFactory().get('/media/cas/00/00/missing.png'), 'cas/00/00/missing.png')
+        # the route is only mounted with DEBUG (tests run without); the web server serves blobs in production
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class DedupeMediaCommandTests(MediaStoreTestCase):
+    def legacy_file(self, name, content):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as fh:
+            fh.write(content)
+        return name
+
+    def test_moves_and_merges_legacy_media(self):
+        red, blue = png((255, 0, 0)), png((0, 0, 255))
+        self.legacy_file('gallery/red.png', red)
+        self.legacy_file('events/red copy.png', red)
+        self.legacy_file('events/blue.png', blue)
+        self.legacy_file('gallery/orphan.png', png((0, 255, 0)))
+        self.legacy_file('gallery/red.16w.jpg', b'rendition')
+        photo = Photo.objects.create(title='Red', image='gallery/red.png', uploaded_by=self.user)
+        events = [
+            Event.objects.create(
+                title=title, description='d', organizer=self.user, location='Hall',
+                start_time=timezone.now(), image=image,
+            )
+            for title, image in (('Red', 'events/red copy.png'), ('Blue', 'events/blue.png'))
+        ]
+
+        out = StringIO()
+        call_command('dedupe_media', dry_run=True, stdout=out)
+        self.assertIn('Would move 4 files into cas/ (1 duplicates', out.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, 'gallery/red.png')))
+        self.assertFalse(MediaBlob.objects.exists())
+
+        call_command('dedupe_media', stdout=StringIO())
+        photo.refresh_from_db()
+        for event in events:
+            event.refresh_from_db()
+        self.assertEqual(photo.image.name, events[0].image.name)
+        self.assertTrue(photo.image.name.startswith('cas/'))
+        self.assertTrue(events[1].image.name.startswith('cas/'))
+        self.assertEqual(self.references(photo.image.name), 2)
+        self.assertEqual(MediaBlob.objects.filter(references=0).count(), 1)  # the orphan
+        with photo.image.open('rb') as fh:
+            self.assertEqual(fh.read(), red)
+        # the old files are gone and the rendition went along with its original
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'gallery')), [])
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'events')), [])
+        self.assertTrue(has_renditions(photo.image.name))
+
+        # pruning waits out the grace period
+        out = StringIO()
+        call_command('dedupe_media', prune=True, stdout=out)
+        self.assertIn('Pruned 0 unreferenced blobs', out.getvalue())
+        MediaBlob.objects.update(updated_at=timezone.now() - timedelta(hours=2))
+        call_command('dedupe_media', prune=True, stdout=StringIO())
+        self.assertEqual(MediaBlob.objects.count(), 2)
+        self.assertEqual(MediaBlob.objects.filter(references=0).count(), 0)
+
+    def test_renditions_are_never_rewritten(self):
+        name = default_storage.save('gallery/a.png', ContentFile(png((9, 9, 9))))
+        self.assertEqual(generate_renditions(name), [rendition_name(name, 16, 'webp'), rendition_name(name, 16, 'jpeg')])
+        self.assertTrue(rendition_name(name, 16, 'webp').endswith('.16w.v1.webp'))
+        # their URLs are immutable: force only fills in missing files
+        self.assertEqual(generate_renditions(name, force=True), [])
+        default_storage.delete(rendition_name(name, 16, 'webp'))
+        self.assertEqual(generate_renditions(name, force=True), [rendition_name(name, 16, 'webp')])
+        # a new encoding gets new names
+        with mock.patch('bitsa_project.renditions.RENDITION_VERSION', 2):
+            self.assertFalse(has_renditions(name))
+            self.assertEqual(len(generate_renditions(name)), 2)
+        self.assertTrue(default_storage.exists(rendition_name(name, 16, 'jpeg', version=2)))
+        self.assertTrue(default_storage.exists(rendition_name(name, 16, 'jpeg')))
+
+    def test_prune_removes_renditions(self):
+        name = default_storage.save('gallery/a.png', ContentFile(png((9, 9, 9))))
+        generate_renditions(name)
+        with mock.patch('bitsa_project.renditions.RENDITION_VERSION', 2):
+            generate_renditions(name)
+        MediaBlob.objects.update(updated_at=timezone.now() - timedelta(hours=2))
+        call_command('dedupe_media', prune=True, stdout=StringIO())
+        self.assertEqual(os.listdir(os.path.dirname(default_storage.path(name))), [])
+        self.assertFalse(MediaBlob.objects.exists())
+
+    def test_reupload_after_prune_renders_again(self):
+        photo = Photo(title='A', uploaded_by=self.user)
+        photo.image.save('a.png', ContentFile(png((7, 7, 7))))
+        name = photo.image.name
+        self.assertEqual(run_pending(), 1)
+        self.assertTrue(has_renditions(name))
+        photo.delete()
+        MediaBlob.objects.update(updated_at=timezone.now() - timedelta(hours=2))
+        call_command('dedupe_media', prune=True, stdout=StringIO())
+        self.assertFalse(has_renditions(name))
+
+        # same bytes, same blob name, same task key: the finished task must not absorb the new one
+        again = Photo(title='A again', uploaded_by=self.user)
+        again.image.save('a.png', ContentFile(png((7, 7, 7))))
+        self.assertEqual(again.image.name, name)
+        self.assertEqual(Task.objects.filter(idempotency_key=f'renditions:{name}').count(), 2)
+        self.assertEqual(run_pending(), 1)
+        self.assertTrue(has_renditions(name))
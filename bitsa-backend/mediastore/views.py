@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.views.static import serve
+
+# a blob's name is its content hash, so whatever is cached under a URL stays valid
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def serve_blob(request, path):
+    """
+    Serve a file under MEDIA_ROOT/cas/ with the immutable Cache-Control. Like the
+    static() media route this is only mounted when DEBUG: django.views.static.serve
+    is not meant for production. There the web server or CDN serves /media/cas/
+    and sends the same header, e.g. with nginx:
+
+        location /media/cas/ {
+            alias /srv/bitsa/media/cas/;
+            add_header Cache-Control "public, max-age=31536000, immutable";
+        }
+    """
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
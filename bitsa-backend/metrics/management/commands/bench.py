@@ -0,0 +1,216 @@
+import json
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.test import APIClient
+
+from blogs.models import BlogPost
+from events.models import Event
+from gallery.models import Photo
+
+SEARCH_TERMS = ['hackathon', 'workshop', 'tech talk', 'meetup', 'venue 1', 'hack']
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the REST API against a throwaway test database: seed it, drive the list, "
+        "retrieve, search, RSVP and login endpoints concurrently and print latency "
+        "percentiles, throughput and query counts as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=200, help='Events to seed (default: 200)')
+        parser.add_argument('--users', type=int, default=20, help='Member accounts to seed (default: 20)')
+        parser.add_argument('--posts', type=int, default=100, help='Blog posts to seed (default: 100)')
+        parser.add_argument('--photos', type=int, default=100, help='Photos to seed (default: 100)')
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario (default: 200)')
+        parser.add_argument('--warmup', type=int, default=10, help='Unmeasured requests per scenario (default: 10)')
+        parser.add_argument('--concurrency', type=int, default=4, help='Client threads (default: 4)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for request parameters (default: 1)')
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            dest='scenarios',
+            help='Run only this scenario (repeatable); default: all'
+        )
+        parser.add_argument(
+            '--no-cache',
+            action='store_true',
+            help='Disable the response cache so every request reaches the database'
+        )
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        scenarios = self.scenarios()
+        selected = options['scenarios'] or list(scenarios)
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}. Choose from: {', '.join(scenarios)}")
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1; every scenario reports latency percentiles.')
+        if options['warmup'] < 0:
+            raise CommandError('--warmup cannot be negative.')
+
+        overrides = {
+            'MEDIA_ROOT': tempfile.mkdtemp(prefix='bitsa-bench-'),
+            'METRICS_SLOW_QUERY_MS': None,
+            # measure the endpoints, not the rate limits (the auth views set their own throttles)
+            'REST_FRAMEWORK': {
+                **settings.REST_FRAMEWORK,
+                'DEFAULT_THROTTLE_CLASSES': [],
+                'DEFAULT_THROTTLE_RATES': dict.fromkeys(settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']),
+            },
+        }
+        if options['no_cache']:
+            overrides['CACHES'] = {**settings.CACHES, 'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(**overrides):
+                call_command(
+                    'seed_events', events=options['events'], users=options['users'], posts=options['posts'],
+                    photos=options['photos'], seed=options['seed'], stdout=StringIO(),
+                )
+                context = self.context()
+                results = {
+                    name: self.run_scenario(scenarios[name], context, options)
+                    for name in selected
+                }
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'config': {
+                key: options[key]
+                for key in ('events', 'users', 'posts', 'photos', 'requests', 'warmup', 'concurrency', 'seed', 'no_cache')
+            },
+            'environment': {'database': connection.vendor, 'django': django.get_version()},
+            'scenarios': results,
+        }
+        text = json.dumps(report, indent=2, sort_keys=True) + '\n'
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(text)
+            self.stderr.write(f"Wrote {options['output']}")
+        else:
+            self.stdout.write(text, ending='')
+
+    def context(self):
+        return {
+            'event_ids': list(Event.objects.values_list('pk', flat=True)),
+            'post_ids': list(BlogPost.objects.filter(is_published=True).values_list('pk', flat=True)),
+            'photo_ids': list(Photo.objects.values_list('pk', flat=True)),
+            'members': list(User.objects.exclude(username__startswith='organizer')),
+        }
+
+    def scenarios(self):
+        """name -> (authenticated, callable(client, rng, context) issuing one request)."""
+        return {
+            'events-list': (False, lambda c, rng, ctx: c.get('/api/events/')),
+            'events-retrieve': (False, lambda c, rng, ctx: c.get(f"/api/events/{rng.choice(ctx['event_ids'])}/")),
+            'events-search': (False, lambda c, rng, ctx: c.get('/api/events/', {'search': rng.choice(SEARCH_TERMS)})),
+            'blogs-list': (False, lambda c, rng, ctx: c.get('/api/blogs/posts/')),
+            'blogs-retrieve': (False, lambda c, rng, ctx: c.get(f"/api/blogs/posts/{rng.choice(ctx['post_ids'])}/")),
+            'photos-list': (False, lambda c, rng, ctx: c.get('/api/gallery/photos/')),
+            'events-rsvp': (True, lambda c, rng, ctx: c.post(f"/api/events/{rng.choice(ctx['event_ids'])}/rsvp/")),
+            'login': (False, lambda c, rng, ctx: c.post('/api/auth/login/', {
+                'username': rng.choice(ctx['members']).username, 'password': 'password123',
+            }, format='json')),
+        }
+
+    def run_scenario(self, scenario, context, options):
+        authenticated, issue = scenario
+        rng_lock = threading.Lock()
+        rng = random.Random(options['seed'])
+        local = threading.local()
+        samples = []
+
+        def one(measured):
+            if not hasattr(local, 'client'):
+                local.client = APIClient()
+                local.rng = random.Random()
+            with rng_lock:
+                local.rng.seed(rng.random())
+            if authenticated:
+                local.client.force_authenticate(local.rng.choice(context['members']))
+            counter = QueryCounter()
+            start = time.perf_counter()
+            try:
+                with connection.execute_wrapper(counter):
+                    failed = issue(local.client, local.rng, context).status_code >= 400
+            except Exception:  # e.g. "database is locked" on SQLite under concurrent writes
+                failed = True
+            elapsed = time.perf_counter() - start
+            if measured:
+                samples.append((elapsed, counter.count, failed))
+
+        def worker(quota, measured):
+            try:
+                for _ in range(quota):
+                    one(measured)
+            finally:
+                # each thread has its own connection; close it before the test database is dropped
+                connections.close_all()
+
+        def run(count, measured):
+            threads = max(1, options['concurrency'])
+            quotas = [count // threads + (n < count % threads) for n in range(threads)]
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                for future in [pool.submit(worker, quota, measured) for quota in quotas if quota]:
+                    future.result()
+
+        run(options['warmup'], measured=False)
+        started = time.perf_counter()
+        run(options['requests'], measured=True)
+        wall = time.perf_counter() - started
+
+        latencies = sorted(sample[0] * 1000 for sample in samples)
+        queries = [sample[1] for sample in samples]
+        return {
+            'requests': len(samples),
+            'errors': sum(1 for sample in samples if sample[2]),
+            'throughput_rps': round(len(samples) / wall, 1) if wall else None,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 50), 2),
+                'p95': round(percentile(latencies, 95), 2),
+                'p99': round(percentile(latencies, 99), 2),
+                'max': round(latencies[-1], 2),
+            },
+            'queries': {
+                'mean': round(sum(queries) / len(queries), 2),
+                'max': max(queries),
+            },
+        }
@@ -0,0 +1,113 @@
+import io
+import json
+import statistics
+import tempfile
+import time
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from bitsa_project import renderers
+
+PAYLOADS = {
+    'events-list': '/api/events/',
+    'blogs-list': '/api/blogs/posts/',
+    # the post bodies are the bulk of a blog payload; list them too, as ?fields= allows
+    'blogs-list-content': '/api/blogs/posts/?fields=id,title,content,excerpt,author_name,created_at',
+}
+
+
+def timed(fn, iterations):
+    """Median and mean wall time of ``fn()`` in microseconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        'median_us': round(statistics.median(samples) * 1e6, 1),
+        'mean_us': round(statistics.fmean(samples) * 1e6, 1),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's stdlib JSONRenderer/JSONParser with the orjson-backed FastJSONRenderer/"
+        "FastJSONParser on event and blog list payloads from a throwaway seeded database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=500, help='Events to seed (default: 500)')
+        parser.add_argument('--posts', type=int, default=500, help='Blog posts to seed (default: 500)')
+        parser.add_argument('--page-size', type=int, default=100, help='Rows per payload (default: 100)')
+        parser.add_argument('--iterations', type=int, default=200, help='Timed calls per measurement (default: 200)')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the data (default: 1)')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False)
+        try:
+            with override_settings(
+                MEDIA_ROOT=tempfile.mkdtemp(prefix='bitsa-bench-'),
+                API_MAX_PAGE_SIZE=max(options['page_size'], settings.API_MAX_PAGE_SIZE),
+            ):
+                call_command(
+                    'seed_events', events=options['events'], posts=options['posts'],
+                    seed=options['seed'], stdout=StringIO(),
+                )
+                payloads = self.payloads(options['page_size'])
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        results = {name: self.compare(data, options['iterations']) for name, data in payloads.items()}
+        report = {
+            'config': {key: options[key] for key in ('events', 'posts', 'page_size', 'iterations', 'seed')},
+            'orjson': getattr(renderers.orjson, '__version__', None),
+            'payloads': results,
+        }
+        text = json.dumps(report, indent=2, sort_keys=True) + '\n'
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                fh.write(text)
+            self.stderr.write(f"Wrote {options['output']}")
+        else:
+            self.stdout.write(text, ending='')
+
+    def payloads(self, page_size):
+        """response.data of each list endpoint, i.e. exactly what the renderer is handed."""
+        client = APIClient()
+        payloads = {}
+        for name, url in PAYLOADS.items():
+            separator = '&' if '?' in url else '?'
+            response = client.get(f'{url}{separator}page_size={page_size}')
+            payloads[name] = response.data
+        return payloads
+
+    def compare(self, data, iterations):
+        stdlib_renderer, fast_renderer = JSONRenderer(), renderers.FastJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), renderers.FastJSONParser()
+        body = stdlib_renderer.render(data)
+        return {
+            'bytes': len(body),
+            'identical': fast_renderer.render(data) == body,
+            'render': {
+                'stdlib': timed(lambda: stdlib_renderer.render(data), iterations),
+                'fast': timed(lambda: fast_renderer.render(data), iterations),
+            },
+            'parse': {
+                'stdlib': timed(lambda: stdlib_parser.parse(io.BytesIO(body)), iterations),
+                'fast': timed(lambda: fast_parser.parse(io.BytesIO(body)), iterations),
+            },
+        }
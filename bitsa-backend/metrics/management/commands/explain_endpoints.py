@@ -0,0 +1,150 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+
+from blogs.models import BlogPost
+from events.models import Event
+from gallery.models import Photo
+
+
+def seq_scans_postgresql(plan):
+    """Relation names read by 'Seq Scan' nodes of an ``EXPLAIN (FORMAT JSON)`` plan."""
+    found = []
+    stack = [plan[0]['Plan']]
+    while stack:
+        node = stack.pop()
+        if node.get('Node Type') == 'Seq Scan':
+            found.append(node['Relation Name'])
+        stack.extend(node.get('Plans', ()))
+    return found
+
+
+def seq_scans_sqlite(rows):
+    """Tables in ``EXPLAIN QUERY PLAN`` rows scanned without an index ('SCAN t', not 'SCAN t USING INDEX i')."""
+    found = []
+    for row in rows:
+        detail = row[-1]
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            # "SCAN events_event" or, on older SQLite, "SCAN TABLE events_event AS U0"
+            words = detail.split()
+            found.append(words[2] if words[1] == 'TABLE' else words[1])
+    return found
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith('SELECT'):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Request each list/detail endpoint anonymously, EXPLAIN every SELECT it issues and "
+        "flag sequential scans on tables with at least --min-rows rows. Exits non-zero when "
+        "anything is flagged, so it can run in CI against a database with production-like volumes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=10000,
+            help='Only flag scans of tables with at least this many rows (default: 10000)'
+        )
+        parser.add_argument('--url', action='append', dest='urls', help='Check this path too (repeatable)')
+        parser.add_argument('--verbose-plans', action='store_true', help='Print the plan of every query')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f"EXPLAIN parsing is implemented for PostgreSQL and SQLite, not {connection.vendor}.")
+
+        table_rows = {}
+        flagged = 0
+        # bypass the response cache so every request reaches the database
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            CACHES={**settings.CACHES, 'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+        ):
+            for url in self.endpoints() + (options['urls'] or []):
+                recorder = QueryRecorder()
+                with connection.execute_wrapper(recorder):
+                    status = Client().get(url).status_code
+                self.stdout.write(f"{url} [{status}] {len(recorder.queries)} SELECT(s)")
+                for sql, params in recorder.queries:
+                    scans, plan = self.explain(sql, params)
+                    large = []
+                    for table in scans:
+                        if table not in table_rows:
+                            table_rows[table] = self.table_rows(table)
+                        if table_rows[table] >= options['min_rows']:
+                            large.append(table)
+                    if large:
+                        flagged += 1
+                        self.stdout.write(self.style.WARNING(
+                            f"  sequential scan on {', '.join(f'{t} (~{table_rows[t]} rows)' for t in large)}: {sql[:300]}"
+                        ))
+                    if options['verbose_plans']:
+                        self.stdout.write(f"    {plan}")
+
+        if flagged:
+            raise CommandError(f"{flagged} quer{'y' if flagged == 1 else 'ies'} scan large tables sequentially.")
+        self.stdout.write(self.style.SUCCESS(f"No sequential scans on tables with {options['min_rows']}+ rows."))
+
+    def endpoints(self):
+        event = Event.objects.order_by('pk').values_list('pk', 'organizer_id').first()
+        post = BlogPost.objects.filter(is_published=True).order_by('pk').values_list('pk', 'author_id').first()
+        photo = Photo.objects.order_by('pk').values_list('pk', flat=True).first()
+        user = User.objects.order_by('pk').values_list('pk', flat=True).first() or 1
+        urls = [
+            '/api/events/',
+            '/api/events/?upcoming=1',
+            f'/api/events/?organizer={event[1] if event else user}',
+            '/api/events/?search=hackathon',
+            '/api/events/?status=completed',
+            '/api/events/?category=workshop',
+            '/api/blogs/posts/',
+            f'/api/blogs/posts/?author={post[1] if post else user}',
+            '/api/blogs/posts/?category=work',
+            '/api/blogs/posts/?search=hackathon',
+            '/api/blogs/posts/?tag=python',
+            '/api/blogs/posts/facets/',
+            '/api/gallery/photos/',
+        ]
+        if event:
+            urls.append(f'/api/events/{event[0]}/')
+        if post:
+            urls.append(f'/api/blogs/posts/{post[0]}/')
+        if photo:
+            urls.append(f'/api/gallery/photos/{photo}/')
+        return urls
+
+    def explain(self, sql, params):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return seq_scans_postgresql(plan), json.dumps(plan[0]['Plan'])[:2000]
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            rows = cursor.fetchall()
+            return seq_scans_sqlite(rows), '; '.join(row[-1] for row in rows)
+
+    def table_rows(self, table):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # planner estimate: cheap, and what decides between scans anyway
+                cursor.execute('SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = %s', [table])
+                row = cursor.fetchone()
+                return row[0] if row else 0
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+            return cursor.fetchone()[0]
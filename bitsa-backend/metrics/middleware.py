@@ -0,0 +1,89 @@
+"""
+Per-request timing: wall time, database queries and time, render time and
+response size, labelled by the resolved URL name (``event-list``,
+``event-rsvp``, ``photo-detail`` ...) and HTTP method.
+
+Queries are timed with ``connection.execute_wrapper``, so nothing depends on
+DEBUG. Queries slower than METRICS_SLOW_QUERY_MS are logged to the
+``metrics.slow_query`` logger with the view that issued them.
+"""
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import registry
+
+slow_query_logger = logging.getLogger('metrics.slow_query')
+
+
+class QueryTimer:
+    """execute_wrapper accumulating query count and time for one request."""
+
+    def __init__(self, request, threshold):
+        self.request = request
+        self.threshold = threshold
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if self.threshold is not None and elapsed >= self.threshold:
+                slow_query_logger.warning(
+                    "Slow query %.1f ms in %s %s: %s",
+                    elapsed * 1000, self.request.method, self.request.path, sql[:2000],
+                )
+
+
+class RequestMetricsMiddleware:
+    """Place first in MIDDLEWARE so the wall time covers the whole stack."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'METRICS_ENABLED', True)
+        slow_ms = getattr(settings, 'METRICS_SLOW_QUERY_MS', 200)
+        self.slow_threshold = slow_ms / 1000 if slow_ms is not None else None
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        timer = QueryTimer(request, self.slow_threshold)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        labels = {'view': (match.view_name if match else None) or '<unresolved>', 'method': request.method}
+        registry.REQUESTS.inc({**labels, 'status': str(response.status_code)})
+        registry.REQUEST_DURATION.observe(labels, elapsed)
+        registry.DB_QUERIES.observe(labels, timer.count)
+        registry.DB_DURATION.observe(labels, timer.duration)
+        render_time = getattr(request, '_metrics_render_time', None)
+        if render_time is not None:
+            registry.RENDER_DURATION.observe(labels, render_time)
+        if not response.streaming:
+            registry.RESPONSE_SIZE.observe(labels, len(response.content))
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered (serialized to JSON) right after this hook
+        if self.enabled:
+            start = time.perf_counter()
+
+            def rendered(response):
+                request._metrics_render_time = time.perf_counter() - start
+
+            response.add_post_render_callback(rendered)
+        return response
@@ -0,0 +1,127 @@
+"""
+In-process metric storage rendered in the Prometheus text exposition format.
+
+Each worker process keeps its own counters and histograms; scrape every
+process (or run a single worker) to see the whole picture. Observations take
+one lock and a bisect, cheap enough to leave on in production.
+"""
+import threading
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def samples(self):
+        with self._lock:
+            snapshot = [(key, list(counts), total, value_sum) for key, (counts, total, value_sum) in self._series.items()]
+        for key, counts, total, value_sum in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket', key + (('le', _format_value(bound)),), cumulative
+            yield f'{self.name}_bucket', key + (('le', '+Inf'),), total
+            yield f'{self.name}_sum', key, value_sum
+            yield f'{self.name}_count', key, total
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    kind = 'counter'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            snapshot = sorted(self._series.items())
+        for key, value in snapshot:
+            yield self.name, key, value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+REQUESTS = Counter('bitsa_http_requests_total', 'Requests by view, method and status code.')
+REQUEST_DURATION = Histogram(
+    'bitsa_http_request_duration_seconds', 'Wall time spent handling the request.', LATENCY_BUCKETS
+)
+DB_QUERIES = Histogram('bitsa_db_queries_per_request', 'Database queries executed per request.', QUERY_COUNT_BUCKETS)
+DB_DURATION = Histogram('bitsa_db_duration_seconds', 'Time spent in database queries per request.', LATENCY_BUCKETS)
+RENDER_DURATION = Histogram(
+    'bitsa_render_duration_seconds', 'Time spent rendering (serializing) the response body.', LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram('bitsa_http_response_size_bytes', 'Size of non-streaming response bodies.', SIZE_BUCKETS)
+
+AUTH_LOOKUP_DURATION = Histogram(
+    'bitsa_auth_user_lookup_seconds', 'Time spent finding the user row during login.', LATENCY_BUCKETS
+)
+AUTH_HASH_DURATION = Histogram(
+    'bitsa_auth_password_hash_seconds', 'Time spent hashing/verifying the password during login.', LATENCY_BUCKETS
+)
+
+METRICS = (
+    REQUESTS, REQUEST_DURATION, DB_QUERIES, DB_DURATION, RENDER_DURATION, RESPONSE_SIZE,
+    AUTH_LOOKUP_DURATION, AUTH_HASH_DURATION,
+)
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render_prometheus(metrics=METRICS):
+    lines = []
+    for metric in metrics:
+        lines.append(f'# HELP {metric.name} {metric.help_text}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for name, labels, value in metric.samples():
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels)
+            lines.append(f'{name}{{{label_text}}} {_format_value(value)}' if label_text else f'{name} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    for metric in METRICS:
+        metric.clear()
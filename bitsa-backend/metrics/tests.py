@@ -0,0 +1,99 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from . import registry
+from .management.commands.bench import percentile
+from .management.commands.explain_endpoints import seq_scans_postgresql, seq_scans_sqlite
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.staff = User.objects.create_user(username='ops', password='pass', is_staff=True)
+
+    def scrape(self):
+        client = APIClient()
+        client.force_authenticate(self.staff)
+        response = client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        return response.content.decode()
+
+    def test_requests_are_recorded_per_view_and_method(self):
+        self.client.get('/api/events/')
+        self.client.get('/api/events/')
+        text = self.scrape()
+        self.assertIn('bitsa_http_requests_total{method="GET",status="200",view="event-list"} 2', text)
+        self.assertIn('bitsa_http_request_duration_seconds_count{method="GET",view="event-list"} 2', text)
+        self.assertIn('bitsa_db_queries_per_request_count{method="GET",view="event-list"} 2', text)
+        self.assertIn('bitsa_render_duration_seconds_count{method="GET",view="event-list"} 2', text)
+        self.assertIn('bitsa_http_response_size_bytes_bucket{method="GET",view="event-list",le="+Inf"} 2', text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = registry.Histogram('h', 'test', (1, 10))
+        for value in (0.5, 5, 50):
+            histogram.observe({}, value)
+        samples = {(name, labels): value for name, labels, value in histogram.samples()}
+        self.assertEqual(samples[('h_bucket', (('le', '1'),))], 1)
+        self.assertEqual(samples[('h_bucket', (('le', '10'),))], 2)
+        self.assertEqual(samples[('h_bucket', (('le', '+Inf'),))], 3)
+        self.assertEqual(samples[('h_sum', ())], 55.5)
+
+    def test_endpoint_is_staff_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_user(username='nosy', password='pass'))
+        self.assertEqual(client.get('/api/metrics/').status_code, 403)
+
+    @override_settings(METRICS_SLOW_QUERY_MS=0)
+    def test_slow_queries_are_logged(self):
+        with self.assertLogs('metrics.slow_query', level='WARNING') as logs:
+            self.client_class().get('/api/events/')
+        self.assertIn('GET /api/events/', logs.output[0])
+
+
+class BenchPercentileTests(TestCase):
+    def test_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_rejects_empty_runs(self):
+        with self.assertRaisesMessage(CommandError, '--requests must be at least 1'):
+            call_command('bench', requests=0, stdout=StringIO())
+
+
+# explain_endpoints is a metrics command, like bench: management/commands/explain_endpoints.py
+class ExplainEndpointsTests(TestCase):
+    def test_sqlite_plan_rows(self):
+        rows = [
+            (2, 0, 0, 'SCAN events_event'),
+            (3, 0, 0, 'SCAN blogs_blogpost USING INDEX blog_published_created_idx'),
+            (4, 0, 0, 'SEARCH auth_user USING INTEGER PRIMARY KEY (rowid=?)'),
+            (5, 0, 0, 'SCAN TABLE gallery_photo AS U0'),
+        ]
+        self.assertEqual(seq_scans_sqlite(rows), ['events_event', 'gallery_photo'])
+
+    def test_postgresql_plan_tree(self):
+        plan = [{'Plan': {'Node Type': 'Limit', 'Plans': [{'Node Type': 'Hash Join', 'Plans': [
+            {'Node Type': 'Seq Scan', 'Relation Name': 'events_event'},
+            {'Node Type': 'Index Scan', 'Relation Name': 'auth_user'},
+        ]}]}}]
+        self.assertEqual(seq_scans_postgresql(plan), ['events_event'])
+
+    def test_command_checks_every_endpoint(self):
+        out = StringIO()
+        call_command('explain_endpoints', min_rows=10 ** 9, url=['/api/events/?page_size=5'], stdout=out)
+        self.assertIn('/api/blogs/posts/?category=work [200]', out.getvalue())
+        self.assertIn('/api/events/?page_size=5 [200]', out.getvalue())
+        self.assertIn('No sequential scans', out.getvalue())
+
+    def test_command_fails_when_a_scan_is_flagged(self):
+        with self.assertRaises(CommandError):
+            call_command('explain_endpoints', min_rows=0, stdout=StringIO())
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import prometheus_metrics
+
+urlpatterns = [
+    path("", prometheus_metrics, name="metrics"),
+]
@@ -0,0 +1,14 @@
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+from .registry import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def prometheus_metrics(request):
+    """Staff only: this process's request metrics in the Prometheus text format."""
+    return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
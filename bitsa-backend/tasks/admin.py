@@ -0,0 +1,22 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'max_attempts', 'run_at', 'finished_at')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'idempotency_key', 'last_error')
+    readonly_fields = ('created_at', 'updated_at', 'finished_at', 'locked_at', 'locked_by', 'last_error')
+    ordering = ('-created_at',)
+    list_per_page = 50
+
+    actions = ['retry_tasks']
+
+    def retry_tasks(self, request, queryset):
+        updated = queryset.exclude(status=Task.STATUS_RUNNING).update(
+            status=Task.STATUS_PENDING, attempts=0, run_at=timezone.now(), last_error=''
+        )
+        self.message_user(request, f"{updated} task(s) queued for retry.")
+    retry_tasks.short_description = "Retry selected tasks"
@@ -0,0 +1 @@
+# management package marker
\ No newline at end of file
@@ -0,0 +1 @@
+# commands package marker
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import signal
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from tasks.worker import release_stale, run_pending
+
+# tasks a thread runs between checks for stale tasks, so a busy queue still gets them
+BATCH_SIZE = 50
+
+
+class Command(BaseCommand):
+    help = "Run background tasks from the database queue."
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release_lock = threading.Lock()
+        self.next_release = 0.0
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=2,
+            help='Number of worker threads (default: 2)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep when the queue is empty (default: 1.0)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Drain the tasks that are currently due, then exit'
+        )
+
+    def handle(self, *args, **options):
+        stop = threading.Event()
+        if not options['once']:
+            signal.signal(signal.SIGTERM, lambda *_: stop.set())
+            signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+        base_id = f"{socket.gethostname()}:{os.getpid()}"
+        # another worker may die mid-task while this one keeps running
+        release_interval = getattr(settings, 'TASKS_LOCK_TIMEOUT', 600) / 2
+        totals = []
+
+        def loop(n):
+            worker_id = f"{base_id}:{n}"
+            ran = 0
+            try:
+                while not stop.is_set():
+                    self.release_stale_if_due(release_interval)
+                    done = run_pending(worker_id, limit=BATCH_SIZE)
+                    ran += done
+                    # drop connections that died or outlived CONN_MAX_AGE while idle
+                    close_old_connections()
+                    if done < BATCH_SIZE:
+                        # the queue is drained
+                        if options['once']:
+                            break
+                        stop.wait(options['poll_interval'])
+            finally:
+                connection.close()
+                totals.append(ran)
+
+        threads = [threading.Thread(target=loop, args=(n,), daemon=True) for n in range(max(1, options['concurrency']))]
+        self.stdout.write(f"Worker {base_id} started with {len(threads)} thread(s).")
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=0.5)
+
+        self.stdout.write(self.style.SUCCESS(f"Worker stopped: {sum(totals)} task(s) run."))
+
+    def release_stale_if_due(self, interval):
+        """Call release_stale() at most once per ``interval`` seconds across the threads; returns its count."""
+        with self.release_lock:
+            now = time.monotonic()
+            if now < self.next_release:
+                return 0
+            self.next_release = now + interval
+        released = release_stale()
+        if released:
+            self.stdout.write(self.style.WARNING(f"Released {released} stale task(s) from dead workers."))
+        return released
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='task',
+            name='idempotency_key',
+            field=models.CharField(blank=True, help_text='At most one pending or running task per key', max_length=255, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('idempotency_key',), name='tasks_task_active_key_uniq'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200, help_text="Registered task name")
+    payload = models.JSONField(default=dict, blank=True, help_text="Keyword arguments for the task function")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    idempotency_key = models.CharField(
+        max_length=255, null=True, blank=True, help_text="At most one pending or running task per key"
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now, help_text="Not picked up before this time")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            # the worker's claim query: pending rows that are due, oldest first
+            models.Index(fields=['status', 'run_at'], name='tasks_task_due_idx'),
+        ]
+        constraints = [
+            # a key dedupes work that is still queued; once a task has finished, the
+            # same key can be enqueued again (e.g. renditions for re-uploaded media)
+            models.UniqueConstraint(
+                fields=['idempotency_key'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='tasks_task_active_key_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
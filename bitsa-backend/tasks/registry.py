@@ -0,0 +1,88 @@
+"""
+Task registration and enqueueing.
+
+    from tasks.registry import task
+
+    @task('gallery.notify')
+    def notify(photo_id):
+        ...
+
+    notify.enqueue(photo_id=1, idempotency_key='notify:1')
+
+Payloads are stored as JSON, so task arguments must be JSON-serializable.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+_registry = {}
+
+
+@dataclass
+class TaskSpec:
+    name: str
+    func: Callable
+    max_attempts: int
+    retry_backoff: int
+
+
+def task(name, max_attempts=5, retry_backoff=30):
+    """Register ``func`` under ``name``; retries wait retry_backoff * 2**(attempt-1) seconds."""
+
+    def decorator(func):
+        _registry[name] = TaskSpec(name, func, max_attempts, retry_backoff)
+        func.enqueue = lambda idempotency_key=None, delay=0, **payload: enqueue(
+            name, payload, idempotency_key=idempotency_key, delay=delay
+        )
+        return func
+
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"No task registered under {name!r}")
+
+
+def enqueue(name, payload=None, idempotency_key=None, delay=0):
+    """
+    Queue ``name`` for the worker and return the Task row.
+    With an idempotency key, enqueueing a key whose task is still pending or running
+    returns that row instead of creating a duplicate; after it has succeeded or
+    failed for good, the key queues a new task.
+    """
+    from .models import Task
+
+    spec = get_task(name)
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'max_attempts': spec.max_attempts,
+        'run_at': timezone.now() + timedelta(seconds=delay),
+    }
+    if idempotency_key is None:
+        queued = Task.objects.create(**fields)
+    else:
+        active = Task.objects.filter(idempotency_key=idempotency_key, status__in=Task.ACTIVE_STATUSES)
+        while True:
+            queued = active.first()
+            if queued is not None:
+                break
+            try:
+                with transaction.atomic():
+                    queued = Task.objects.create(idempotency_key=idempotency_key, **fields)
+                break
+            except IntegrityError:
+                # lost a race with a concurrent enqueue of the same key: return its row
+                continue
+
+    if getattr(settings, 'TASKS_EAGER', False):
+        from .worker import run_pending
+        transaction.on_commit(lambda: run_pending(names=[name]))
+    return queued
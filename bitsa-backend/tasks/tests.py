@@ -0,0 +1,108 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from .management.commands.run_worker import Command as RunWorkerCommand
+from .models import Task
+from .registry import enqueue, task
+from .worker import claim_next, release_stale, run_pending
+
+calls = []
+
+
+@task('tests.record', max_attempts=2, retry_backoff=60)
+def record(value):
+    calls.append(value)
+
+
+@task('tests.explode', max_attempts=2, retry_backoff=60)
+def explode():
+    raise RuntimeError("boom")
+
+
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        record.enqueue(value=1)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [1])
+        self.assertEqual(Task.objects.get().status, Task.STATUS_SUCCEEDED)
+
+    def test_idempotency_key_deduplicates(self):
+        first = record.enqueue(value=1, idempotency_key='once')
+        second = record.enqueue(value=2, idempotency_key='once')
+        self.assertEqual(first.pk, second.pk)
+        run_pending()
+        self.assertEqual(calls, [1])
+
+    def test_idempotency_key_is_reusable_once_finished(self):
+        first = explode.enqueue(idempotency_key='retry-me')
+        Task.objects.filter(pk=first.pk).update(max_attempts=1)
+        run_pending()
+        first.refresh_from_db()
+        self.assertEqual(first.status, Task.STATUS_FAILED)
+
+        second = record.enqueue(value=2, idempotency_key='retry-me')
+        self.assertNotEqual(second.pk, first.pk)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [2])
+        # and again after a success
+        third = record.enqueue(value=3, idempotency_key='retry-me')
+        self.assertNotIn(third.pk, (first.pk, second.pk))
+
+    def test_delayed_task_is_not_claimed_early(self):
+        record.enqueue(value=1, delay=60)
+        self.assertIsNone(claim_next('w1'))
+
+    def test_failure_retries_with_backoff_then_fails(self):
+        explode.enqueue()
+        run_pending()
+        queued = Task.objects.get()
+        self.assertEqual((queued.status, queued.attempts), (Task.STATUS_PENDING, 1))
+        self.assertIn('boom', queued.last_error)
+        self.assertGreater(queued.run_at, timezone.now() + timedelta(seconds=50))
+
+        Task.objects.update(run_at=timezone.now())
+        run_pending()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (Task.STATUS_FAILED, 2))
+
+    def test_unknown_task_fails(self):
+        Task.objects.create(name='tests.missing')
+        run_pending()
+        self.assertEqual(Task.objects.get().status, Task.STATUS_FAILED)
+
+    def test_enqueue_unknown_name_raises(self):
+        with self.assertRaises(LookupError):
+            enqueue('tests.missing')
+
+    def test_release_stale_requeues_abandoned_tasks(self):
+        record.enqueue(value=1)
+        claimed = claim_next('w1')
+        Task.objects.filter(pk=claimed.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(release_stale(timeout=60), 1)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [1])
+
+    def test_worker_keeps_releasing_stale_tasks(self):
+        command = RunWorkerCommand(stdout=StringIO())
+        record.enqueue(value=1)
+        claimed = claim_next('dead')
+        with mock.patch('time.monotonic', return_value=1000.0):
+            self.assertEqual(command.release_stale_if_due(300), 0)  # still within the lock timeout
+        Task.objects.filter(pk=claimed.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        with mock.patch('time.monotonic', return_value=1200.0):
+            self.assertEqual(command.release_stale_if_due(300), 0)  # checked 200s ago
+        with mock.patch('time.monotonic', return_value=1300.0):
+            self.assertEqual(command.release_stale_if_due(300), 1)
+        self.assertEqual(Task.objects.get().status, Task.STATUS_PENDING)
+
+    def test_eager_mode_runs_on_commit(self):
+        with self.settings(TASKS_EAGER=True), self.captureOnCommitCallbacks(execute=True):
+            record.enqueue(value=3)
+        self.assertEqual(calls, [3])
@@ -0,0 +1,99 @@
+"""
+Claiming and running queued tasks; used by ``manage.py run_worker``.
+
+A task is claimed with a conditional UPDATE from pending to running, so any
+number of worker threads or processes can poll the same table. On PostgreSQL
+the candidate row is first picked with SELECT ... FOR UPDATE SKIP LOCKED so
+workers don't contend on the same row.
+"""
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Task
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def claim_next(worker_id, names=None):
+    now = timezone.now()
+    with transaction.atomic():
+        candidates = Task.objects.filter(status=Task.STATUS_PENDING, run_at__lte=now)
+        if names:
+            candidates = candidates.filter(name__in=names)
+        task = candidates.select_for_update(skip_locked=True).order_by('run_at', 'id').first()
+        if task is None:
+            return None
+        claimed = Task.objects.filter(pk=task.pk, status=Task.STATUS_PENDING).update(
+            status=Task.STATUS_RUNNING,
+            attempts=task.attempts + 1,
+            locked_at=now,
+            locked_by=worker_id,
+        )
+    if not claimed:
+        return None
+    task.refresh_from_db()
+    return task
+
+
+def run_task(task):
+    """Execute a claimed task and record the outcome; returns True on success."""
+    try:
+        spec = get_task(task.name)
+    except LookupError:
+        Task.objects.filter(pk=task.pk).update(
+            status=Task.STATUS_FAILED, last_error=f"Unknown task {task.name!r}", finished_at=timezone.now()
+        )
+        return False
+
+    try:
+        spec.func(**task.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if task.attempts < task.max_attempts:
+            delay = min(spec.retry_backoff * 2 ** (task.attempts - 1), getattr(settings, 'TASKS_MAX_BACKOFF', 3600))
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.STATUS_PENDING,
+                run_at=timezone.now() + timedelta(seconds=delay),
+                last_error=error,
+                locked_at=None,
+                locked_by='',
+            )
+            logger.warning("Task %s #%s failed (attempt %s), retrying in %ss", task.name, task.pk, task.attempts, delay)
+        else:
+            Task.objects.filter(pk=task.pk).update(
+                status=Task.STATUS_FAILED, last_error=error, finished_at=timezone.now()
+            )
+            logger.error("Task %s #%s failed permanently after %s attempt(s)", task.name, task.pk, task.attempts)
+        return False
+
+    Task.objects.filter(pk=task.pk).update(
+        status=Task.STATUS_SUCCEEDED, finished_at=timezone.now(), last_error=''
+    )
+    return True
+
+
+def release_stale(timeout=None):
+    """Put back tasks whose worker died mid-run (locked longer than ``timeout`` seconds)."""
+    timeout = timeout or getattr(settings, 'TASKS_LOCK_TIMEOUT', 600)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Task.objects.filter(status=Task.STATUS_RUNNING, locked_at__lt=cutoff).update(
+        status=Task.STATUS_PENDING, locked_at=None, locked_by=''
+    )
+
+
+def run_pending(worker_id='inline', names=None, limit=None):
+    """Run due tasks in the current thread until none are left; returns how many ran."""
+    ran = 0
+    while limit is None or ran < limit:
+        task = claim_next(worker_id, names=names)
+        if task is None:
+            break
+        run_task(task)
+        ran += 1
+    return ran
@@ -5,6 +5,7 @@ import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
 import { BlogPostAPI } from "@/types";
+import { Paginated } from "@/lib/api";
 
 const Blog = () => {
   const navigate = useNavigate();
@@ -16,8 +17,8 @@ const Blog = () => {
       try {
         const response = await fetch('http://localhost:8000/api/blogs/posts/');
         if (response.ok) {
-          const data = await response.json();
-          setPosts(data);
+          const data: Paginated<BlogPostAPI> = await response.json();
+          setPosts(data.results);
         } else {
           console.error('Failed to fetch blog posts');
         }
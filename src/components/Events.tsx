@@ -4,6 +4,7 @@ import { Calendar, MapPin, Clock, ArrowRight } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { Card, CardContent, CardDescription, CardFooter, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
+import { Paginated } from "@/lib/api";
 
 interface Event {
   id: number;
@@ -19,21 +20,32 @@ interface Event {
   updated_at: string;
 }
 
+// each tab maps to the API's ?status= filter, so only the rendered slice is fetched
+const STATUS_TABS = [
+  { label: "Upcoming", status: "upcoming,ongoing" },
+  { label: "Past", status: "completed" },
+  { label: "All", status: "" },
+];
+
 const Events = () => {
   const navigate = useNavigate();
   const [events, setEvents] = useState<Event[]>([]);
+  const [nextPage, setNextPage] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [statusFilter, setStatusFilter] = useState(STATUS_TABS[0].status);
 
   useEffect(() => {
     fetchEvents();
-  }, []);
+  }, [statusFilter]);
 
-  const fetchEvents = async () => {
+  const fetchEvents = async (cursorUrl?: string) => {
+    const query = statusFilter ? `?status=${statusFilter}` : '';
     try {
-      const response = await fetch('http://localhost:8000/api/events/');
+      const response = await fetch(cursorUrl ?? `http://localhost:8000/api/events/${query}`);
       if (response.ok) {
-        const data = await response.json();
-        setEvents(data);
+        const data: Paginated<Event> = await response.json();
+        setEvents((prev) => (cursorUrl ? [...prev, ...data.results] : data.results));
+        setNextPage(data.next);
       } else {
         console.error('Failed to fetch events');
       }
@@ -83,6 +95,23 @@ const Events = () => {
           </p>
         </div>
 
+        <div className="flex justify-center gap-2 mb-8">
+          {STATUS_TABS.map((tab) => (
+            <Button
+              key={tab.label}
+              variant={statusFilter === tab.status ? "default" : "outline"}
+              size="sm"
+              onClick={() => setStatusFilter(tab.status)}
+            >
+              {tab.label}
+            </Button>
+          ))}
+        </div>
+
+        {events.length === 0 && (
+          <p className="text-center text-muted-foreground">No events to show.</p>
+        )}
+
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
           {events.map((event) => (
             <Card key={event.id} className="hover:shadow-xl transition-shadow border-border">
@@ -128,6 +157,14 @@ const Events = () => {
             </Card>
           ))}
         </div>
+
+        {nextPage && (
+          <div className="text-center mt-8">
+            <Button variant="outline" onClick={() => fetchEvents(nextPage)}>
+              Load more events
+            </Button>
+          </div>
+        )}
       </div>
     </section>
   );
@@ -1,11 +1,14 @@
 import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
+import { Paginated } from "@/lib/api";
+import { ImageSrcSet, toSrcSet } from "@/lib/utils";
 
 interface Photo {
   id: number;
   title: string;
   description: string;
   image_url: string;
+  image_srcset: ImageSrcSet | null;
   uploaded_by_name: string;
   uploaded_at: string;
 }
@@ -22,8 +25,8 @@ const Gallery = () => {
       try {
         const response = await fetch('http://localhost:8000/api/gallery/photos/');
         if (response.ok) {
-          const data = await response.json();
-          setPhotos(data);
+          const data: Paginated<Photo> = await response.json();
+          setPhotos(data.results);
         } else {
           setError('Failed to load photos');
         }
@@ -71,6 +74,8 @@ const Gallery = () => {
               >
                 <img
                   src={photo.image_url}
+                  srcSet={toSrcSet(photo.image_srcset)}
+                  sizes="(min-width: 1024px) 33vw, (min-width: 768px) 50vw, 100vw"
                   alt={photo.title}
                   className="w-full h-full object-cover"
                 />
@@ -0,0 +1,92 @@
+// Shape returned by the cursor-paginated list endpoints (events, blog posts, photos).
+export interface Paginated<T> {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+}
+
+// Follow `next` links until the listing is exhausted. Meant for admin screens
+// that manage every row; public pages should load one page at a time.
+export async function fetchAllPages<T>(url: string, init?: RequestInit): Promise<T[]> {
+  const rows: T[] = [];
+  let nextUrl: string | null = url;
+  while (nextUrl) {
+    const response = await fetch(nextUrl, init);
+    if (!response.ok) {
+      throw new Error(`Request failed with status ${response.status}`);
+    }
+    const page: Paginated<T> = await response.json();
+    rows.push(...page.results);
+    nextUrl = page.next;
+  }
+  return rows;
+}
+
+export class UploadError extends Error {}
+
+// Send a file through the chunked upload API: start an upload, PUT it in the
+// chunk size the server asks for (resuming from `received` after a 409 or a
+// dropped connection), then complete it. Resolves to the created photo.
+export async function uploadInChunks<T>(
+  baseUrl: string,
+  file: File,
+  fields: Record<string, string>,
+  headers: Record<string, string>,
+  maxRetries = 3,
+): Promise<T> {
+  const failed = async (response: Response, fallback: string) => {
+    const body = await response.json().catch(() => ({}));
+    return new UploadError(body.error || body.size?.[0] || fallback);
+  };
+
+  const started = await fetch(`${baseUrl}/gallery/photos/uploads/`, {
+    method: 'POST',
+    headers: { ...headers, 'Content-Type': 'application/json' },
+    body: JSON.stringify({ ...fields, filename: file.name, size: file.size }),
+  });
+  if (!started.ok) {
+    throw await failed(started, 'Failed to start upload');
+  }
+  const upload: { id: string; chunk_size: number } = await started.json();
+  const uploadUrl = `${baseUrl}/gallery/photos/uploads/${upload.id}/`;
+
+  let offset = 0;
+  let retries = 0;
+  while (offset < file.size) {
+    const end = Math.min(offset + upload.chunk_size, file.size);
+    let response: Response;
+    try {
+      response = await fetch(uploadUrl, {
+        method: 'PUT',
+        headers: {
+          ...headers,
+          'Content-Type': 'application/octet-stream',
+          'Content-Range': `bytes ${offset}-${end - 1}/${file.size}`,
+        },
+        body: file.slice(offset, end),
+      });
+    } catch (error) {
+      // network failure: ask the server how much it kept and carry on from there
+      if (++retries > maxRetries) throw error;
+      const status = await fetch(uploadUrl, { headers });
+      if (!status.ok) throw await failed(status, 'Upload was lost');
+      offset = (await status.json()).received;
+      continue;
+    }
+    if (response.status === 409 && retries++ < maxRetries) {
+      offset = (await response.json()).received;
+      continue;
+    }
+    if (!response.ok) {
+      throw await failed(response, 'Failed to upload photo');
+    }
+    offset = (await response.json()).received;
+    retries = 0;
+  }
+
+  const completed = await fetch(`${uploadUrl}complete/`, { method: 'POST', headers });
+  if (!completed.ok) {
+    throw await failed(completed, 'Failed to upload photo');
+  }
+  return completed.json();
+}
@@ -4,3 +4,15 @@ import { twMerge } from "tailwind-merge";
 export function cn(...inputs: ClassValue[]) {
   return twMerge(clsx(inputs));
 }
+
+// image_srcset as returned by the API: { webp: { "320": url, ... }, jpeg: { ... } }
+export type ImageSrcSet = Record<string, Record<string, string>>;
+
+// Build an <img srcSet> value from the API rendition map, preferring WebP.
+export function toSrcSet(srcset?: ImageSrcSet | null): string | undefined {
+  const variants = srcset?.webp ?? srcset?.jpeg;
+  if (!variants) return undefined;
+  return Object.entries(variants)
+    .map(([width, url]) => `${url} ${width}w`)
+    .join(", ");
+}
@@ -15,6 +15,7 @@ import { Textarea } from "@/components/ui/textarea";
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select";
 import { Users, FileText, Calendar, Image, BarChart3, Settings, UserPlus, Ban, CheckCircle, Trash2, Edit, Plus } from "lucide-react";
 import { toast } from "sonner";
+import { fetchAllPages, Paginated, uploadInChunks, UploadError } from "@/lib/api";
 
 interface User {
   id: number;
@@ -26,6 +27,15 @@ interface User {
   date_joined: string;
 }
 
+interface UserStats {
+  total: number;
+  active: number;
+  blocked: number;
+  admins: number;
+  students: number;
+  joined_last_30_days: number;
+}
+
 interface Photo {
   id: number;
   title: string;
@@ -39,11 +49,12 @@ interface Photo {
 interface BlogPost {
   id: number;
   title: string;
-  content: string;
+  // list responses omit the body and author email; fetch the post itself for them
+  content?: string;
   excerpt: string;
   author: number;
   author_name: string;
-  author_email: string;
+  author_email?: string;
   category: string;
   tags: string;
   read_time: number;
@@ -71,6 +82,9 @@ const AdminDashboard = () => {
   const { user, isAuthenticated } = useAuth();
   const [activeTab, setActiveTab] = useState("overview");
   const [users, setUsers] = useState<User[]>([]);
+  const [usersNext, setUsersNext] = useState<string | null>(null);
+  const [userFilters, setUserFilters] = useState({ search: '', role: 'all', active: 'all', sort: '-joined' });
+  const [userStats, setUserStats] = useState<UserStats | null>(null);
   const [galleryPhotos, setGalleryPhotos] = useState<Photo[]>([]);
   const [blogPosts, setBlogPosts] = useState<BlogPost[]>([]);
   const [loading, setLoading] = useState(false);
@@ -148,17 +162,23 @@ const AdminDashboard = () => {
   const API_BASE_URL = 'http://localhost:8000/api';
   const accessToken = localStorage.getItem('access_token');
 
-  const fetchUsers = async () => {
-    setLoading(true);
+  // the directory is paginated and filtered on the server; `url` is a `next` link when loading more
+  const fetchUsers = async (url?: string) => {
+    setLoading(!url);
+    const params = new URLSearchParams({ sort: userFilters.sort });
+    if (userFilters.search.trim()) params.set('search', userFilters.search.trim());
+    if (userFilters.role !== 'all') params.set('role', userFilters.role);
+    if (userFilters.active !== 'all') params.set('active', userFilters.active);
     try {
-      const response = await fetch(`${API_BASE_URL}/auth/users/`, {
+      const response = await fetch(url ?? `${API_BASE_URL}/auth/users/?${params}`, {
         headers: {
           'Authorization': `Bearer ${accessToken}`,
         },
       });
       if (response.ok) {
-        const data = await response.json();
-        setUsers(data);
+        const page: Paginated<User> = await response.json();
+        setUsers(url ? [...users, ...page.results] : page.results);
+        setUsersNext(page.next);
       } else {
         toast.error('Failed to fetch users');
       }
@@ -169,6 +189,21 @@ const AdminDashboard = () => {
     }
   };
 
+  const fetchUserStats = async () => {
+    try {
+      const response = await fetch(`${API_BASE_URL}/auth/users/stats/`, {
+        headers: {
+          'Authorization': `Bearer ${accessToken}`,
+        },
+      });
+      if (response.ok) {
+        setUserStats(await response.json());
+      }
+    } catch (error) {
+      // the card keeps its placeholder
+    }
+  };
+
   const addUser = async () => {
     if (!newUser.first_name || !newUser.email || !newUser.password || !newUser.password_confirm) {
       toast.error('Please fill in all required fields');
@@ -227,17 +262,12 @@ const AdminDashboard = () => {
   const fetchGalleryPhotos = async () => {
     setLoading(true);
     try {
-      const response = await fetch(`${API_BASE_URL}/gallery/photos/`, {
+      const data = await fetchAllPages<Photo>(`${API_BASE_URL}/gallery/photos/?page_size=100`, {
         headers: {
           'Authorization': `Bearer ${accessToken}`,
         },
       });
-      if (response.ok) {
-        const data = await response.json();
-        setGalleryPhotos(data);
-      } else {
-        toast.error('Failed to fetch gallery photos');
-      }
+      setGalleryPhotos(data);
     } catch (error) {
       toast.error('Error fetching gallery photos');
     } finally {
@@ -251,31 +281,19 @@ const AdminDashboard = () => {
       return;
     }
 
-    const formData = new FormData();
-    formData.append('title', newPhoto.title);
-    formData.append('description', newPhoto.description);
-    formData.append('image', newPhoto.image);
-
     try {
-      const response = await fetch(`${API_BASE_URL}/gallery/photos/`, {
-        method: 'POST',
-        headers: {
-          'Authorization': `Bearer ${accessToken}`,
-        },
-        body: formData,
-      });
-
-      if (response.ok) {
-        toast.success('Photo uploaded successfully');
-        setUploadDialogOpen(false);
-        setNewPhoto({ title: '', description: '', image: null });
-        fetchGalleryPhotos();
-      } else {
-        const error = await response.json();
-        toast.error(error.error || 'Failed to upload photo');
-      }
+      await uploadInChunks<Photo>(
+        API_BASE_URL,
+        newPhoto.image,
+        { title: newPhoto.title, description: newPhoto.description },
+        { 'Authorization': `Bearer ${accessToken}` },
+      );
+      toast.success('Photo uploaded successfully');
+      setUploadDialogOpen(false);
+      setNewPhoto({ title: '', description: '', image: null });
+      fetchGalleryPhotos();
     } catch (error) {
-      toast.error('Error uploading photo');
+      toast.error(error instanceof UploadError ? error.message : 'Error uploading photo');
     }
   };
 
@@ -349,17 +367,12 @@ const AdminDashboard = () => {
   const fetchBlogPosts = async () => {
     setLoading(true);
     try {
-      const response = await fetch(`${API_BASE_URL}/blogs/posts/`, {
+      const data = await fetchAllPages<BlogPost>(`${API_BASE_URL}/blogs/posts/?page_size=100`, {
         headers: {
           'Authorization': `Bearer ${accessToken}`,
         },
       });
-      if (response.ok) {
-        const data = await response.json();
-        setBlogPosts(data);
-      } else {
-        toast.error('Failed to fetch blog posts');
-      }
+      setBlogPosts(data);
     } catch (error) {
       toast.error('Error fetching blog posts');
     } finally {
@@ -475,11 +488,27 @@ const AdminDashboard = () => {
     }
   };
 
-  const openEditBlogDialog = (post: BlogPost) => {
+  const openEditBlogDialog = async (listedPost: BlogPost) => {
+    let post = listedPost;
+    try {
+      const response = await fetch(`${API_BASE_URL}/blogs/posts/${listedPost.id}/`, {
+        headers: {
+          'Authorization': `Bearer ${accessToken}`,
+        },
+      });
+      if (!response.ok) {
+        toast.error('Failed to load blog post');
+        return;
+      }
+      post = await response.json();
+    } catch (error) {
+      toast.error('Error loading blog post');
+      return;
+    }
     setSelectedBlogPost(post);
     setEditBlogPost({
       title: post.title,
-      content: post.content,
+      content: post.content ?? '',
       excerpt: post.excerpt,
       category: post.category,
       tags: post.tags,
@@ -531,17 +560,12 @@ const AdminDashboard = () => {
   const fetchEvents = async () => {
     setLoading(true);
     try {
-      const response = await fetch(`${API_BASE_URL}/events/`, {
+      const data = await fetchAllPages<Event>(`${API_BASE_URL}/events/?page_size=100`, {
         headers: {
           'Authorization': `Bearer ${accessToken}`,
         },
       });
-      if (response.ok) {
-        const data = await response.json();
-        setEvents(data);
-      } else {
-        toast.error('Failed to fetch events');
-      }
+      setEvents(data);
     } catch (error) {
       toast.error('Error fetching events');
     } finally {
@@ -671,24 +695,30 @@ const AdminDashboard = () => {
   };
 
   useEffect(() => {
-    if (activeTab === 'users') {
-      fetchUsers();
-    } else if (activeTab === 'content') {
+    if (activeTab === 'content') {
       fetchGalleryPhotos();
       fetchBlogPosts();
     } else if (activeTab === 'overview') {
       fetchBlogPosts();
+      fetchUserStats();
     } else if (activeTab === 'events') {
       fetchEvents();
     }
   }, [activeTab]);
 
+  useEffect(() => {
+    if (activeTab !== 'users') return;
+    // debounce typing in the search box
+    const timer = setTimeout(() => fetchUsers(), 300);
+    return () => clearTimeout(timer);
+  }, [activeTab, userFilters]);
+
   const stats = [
     {
       title: "Total Users",
-      value: "156",
+      value: userStats ? String(userStats.total) : "–",
       icon: Users,
-      change: "+12%",
+      change: userStats ? `+${userStats.joined_last_30_days} in 30 days, ${userStats.blocked} blocked` : "",
       changeType: "positive" as const,
     },
     {
@@ -908,6 +938,47 @@ const AdminDashboard = () => {
                   </Dialog>
                 </div>
 
+                <div className="flex flex-wrap gap-2 mb-4">
+                  <Input
+                    className="max-w-xs"
+                    placeholder="Search name, email or username"
+                    value={userFilters.search}
+                    onChange={(e) => setUserFilters({ ...userFilters, search: e.target.value })}
+                  />
+                  <Select value={userFilters.role} onValueChange={(value) => setUserFilters({ ...userFilters, role: value })}>
+                    <SelectTrigger className="w-36">
+                      <SelectValue placeholder="Role" />
+                    </SelectTrigger>
+                    <SelectContent>
+                      <SelectItem value="all">All roles</SelectItem>
+                      <SelectItem value="admin">Admins</SelectItem>
+                      <SelectItem value="student">Students</SelectItem>
+                    </SelectContent>
+                  </Select>
+                  <Select value={userFilters.active} onValueChange={(value) => setUserFilters({ ...userFilters, active: value })}>
+                    <SelectTrigger className="w-36">
+                      <SelectValue placeholder="Status" />
+                    </SelectTrigger>
+                    <SelectContent>
+                      <SelectItem value="all">Any status</SelectItem>
+                      <SelectItem value="true">Active</SelectItem>
+                      <SelectItem value="false">Blocked</SelectItem>
+                    </SelectContent>
+                  </Select>
+                  <Select value={userFilters.sort} onValueChange={(value) => setUserFilters({ ...userFilters, sort: value })}>
+                    <SelectTrigger className="w-40">
+                      <SelectValue placeholder="Sort" />
+                    </SelectTrigger>
+                    <SelectContent>
+                      <SelectItem value="-joined">Newest first</SelectItem>
+                      <SelectItem value="joined">Oldest first</SelectItem>
+                      <SelectItem value="first_name">First name</SelectItem>
+                      <SelectItem value="last_name">Last name</SelectItem>
+                      <SelectItem value="email">Email</SelectItem>
+                    </SelectContent>
+                  </Select>
+                </div>
+
                 {loading ? (
                   <p>Loading users...</p>
                 ) : (
@@ -963,6 +1034,13 @@ const AdminDashboard = () => {
                     </TableBody>
                   </Table>
                 )}
+                {!loading && usersNext && (
+                  <div className="flex justify-center mt-4">
+                    <Button variant="outline" onClick={() => fetchUsers(usersNext)}>
+                      Load more
+                    </Button>
+                  </div>
+                )}
               </CardContent>
             </Card>
           </TabsContent>